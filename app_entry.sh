@@ -4,5 +4,10 @@ set -e
 # Default to 8501 if PORT not provided by the platform
 PORT="${PORT:-8501}"
 
-# Run Streamlit
-exec streamlit run fire_app_eli.py --server.port="$PORT" --server.address=0.0.0.0
+# FIRE_WORKERS > 1: several Streamlit workers behind a sticky proxy on $PORT (fire_cluster.py)
+if [ "${FIRE_WORKERS:-1}" -gt 1 ]; then
+  exec python fire_cluster.py
+fi
+
+# Run Streamlit (FIRE_APP_VARIANT picks the layout: v1 (default, as deployed before), v3, v3_1, v3_2)
+exec streamlit run fire_app.py --server.port="$PORT" --server.address=0.0.0.0
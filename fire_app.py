@@ -0,0 +1,15 @@
+"""Single entry point for every app variant.
+
+Runs the layout registered in ``fire_engine.VARIANTS`` under the name given by
+the ``FIRE_APP_VARIANT`` environment variable. The default is ``v1``
+(``fire_engine.DEPLOY_VARIANT``), the layout the deploy served before; set
+``FIRE_APP_VARIANT=v3_2`` for goals, tax, Monte Carlo and the other
+analytics. All variants share one engine, so only its hot paths need optimising.
+"""
+import os
+import runpy
+
+from fire_engine import get_variant
+
+variant = get_variant(os.environ.get("FIRE_APP_VARIANT"))
+runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), variant.script), run_name="__main__")
@@ -1,13 +1,13 @@
 
-import math
-from dataclasses import dataclass
-from typing import List, Tuple, Dict
-
-import numpy as np
 import pandas as pd
 import streamlit as st
 import altair as alt
 
+from fire_engine import VARIANTS, coast_check, project_corpus, target_corpus, years_until_fi
+from fire_engine import rupee_indian as rupee
+
+VARIANT = VARIANTS["v1"]
+
 # -----------------------------
 # Brand Palette (Edelweiss Life)
 # -----------------------------
@@ -65,90 +65,28 @@ h1, h2, h3, h4, h5, h6 {{
 """
 
 # -----------------------------
-# Helpers
+# Engine (shared, see fire_engine.VARIANTS["v1"])
 # -----------------------------
 
-def rupee(x: float) -> str:
-    """Format number in Indian numbering style with ₹ symbol."""
-    if pd.isna(x):
-        return "₹0"
-    x_int = int(round(x))
-    s = str(x_int)
-    if len(s) <= 3:
-        out = s
-    else:
-        last3 = s[-3:]
-        other = s[:-3]
-        groups = []
-        while len(other) > 2:
-            groups.insert(0, other[-2:])
-            other = other[:-2]
-        if other:
-            groups.insert(0, other)
-        out = ",".join(groups + [last3])
-    return f"₹{out}"
-
-def fv(rate: float, nper: int, pmt: float, pv: float, when: str = "end") -> float:
-    """Future value with periodic compounding."""
-    when_val = 1 if when == "begin" else 0
-    if rate == 0:
-        return pv + pmt * nper
-    return pv * (1 + rate) ** nper + pmt * (1 + rate * when_val) * (((1 + rate) ** nper - 1) / rate)
-
-def years_until_fi(
-    current_age: int,
-    current_corpus: float,
-    start_monthly_sip: float,
-    pre_ret_annual_return: float,
-    income_growth: float,
-    sip_growth: float,
-    target_corpus_func,
-    inflation: float,
-    current_monthly_expense: float,
-    max_age: int = 80,
-) -> Tuple[int, float, pd.DataFrame]:
-    """Simulate until corpus >= target corpus."""
-    records = []
-    age = current_age
-    corpus = current_corpus
-    monthly_rate = (1 + pre_ret_annual_return) ** (1/12) - 1
-
-    months = 0
-    reached = None
-
-    while age <= max_age:
-        years_from_now = months / 12
-        future_monthly_expense = current_monthly_expense * ((1 + inflation) ** years_from_now)
-        future_annual_expense = future_monthly_expense * 12
-        required_corpus = target_corpus_func(years_from_now, future_annual_expense)
-
-        if corpus >= required_corpus:
-            reached = (current_age + int(months // 12), corpus)
-            records.append({
-                "Age": current_age + months/12,
-                "Invested Corpus": corpus,
-                "Required Corpus": required_corpus,
-            })
-            break
-
-        corpus = fv(monthly_rate, 1, start_monthly_sip, corpus, when="end")
-        months += 1
-        if months % 12 == 0:
-            age = current_age + months // 12
-            start_monthly_sip *= (1 + sip_growth)
-
-        if months % 6 == 0:
-            records.append({
-                "Age": current_age + months/12,
-                "Invested Corpus": corpus,
-                "Required Corpus": required_corpus,
-            })
-
-    if reached is None:
-        reached = (max_age, corpus)
-
-    df = pd.DataFrame(records)
-    return reached[0], reached[1], df
+@st.cache_data(show_spinner=False)
+def run_engine(current_age, current_corpus, monthly_sip, pre_ret_return, sip_growth, inflation,
+               monthly_expense, fire_type, swr, lean_mult, barista_cover, fat_mult):
+    """Earliest FI and Coast-FIRE; cached so the display toggles never rerun the loops."""
+    target_corpus_func = target_corpus(fire_type, swr, lean_mult, barista_cover, fat_mult)
+    fi = years_until_fi(
+        current_age=current_age,
+        current_corpus=current_corpus,
+        monthly_sip=monthly_sip,
+        pre_ret_annual_return=pre_ret_return,
+        sip_growth=sip_growth,
+        target_corpus_func=target_corpus_func,
+        inflation=inflation,
+        base_monthly_expense=monthly_expense,
+        max_age=80,
+        variant=VARIANT,
+    )
+    coast = coast_check(current_corpus, pre_ret_return, current_age, target_corpus_func, inflation, monthly_expense)
+    return fi, coast
 
 # -----------------------------
 # App
@@ -231,62 +169,12 @@ else:
 
 required_corpus = adjusted_annual_expense / swr
 
-monthly_rate = (1 + pre_ret_return) ** (1/12) - 1
 n_months = years_to_target * 12
+projected_corpus_at_target = project_corpus(current_corpus, pre_ret_return, n_months, monthly_sip, sip_growth)
 
-sip_schedule = np.full(n_months, monthly_sip, dtype=float)
-if n_months > 0:
-    for m in range(12, n_months, 12):
-        sip_schedule[m:] *= (1 + sip_growth)
-
-corpus = current_corpus
-for m in range(n_months):
-    corpus = fv(monthly_rate, 1, sip_schedule[m], corpus, when="end")
-projected_corpus_at_target = corpus
-
-def target_corpus_func(years_from_now: float, future_annual_exp: float) -> float:
-    if fire_type == "Lean FIRE":
-        expense = future_annual_exp * lean_mult
-    elif fire_type == "Barista FIRE":
-        expense = future_annual_exp * (1 - barista_cover)
-    else:
-        expense = future_annual_exp * fat_mult
-    return expense / swr
-
-age_reached, corpus_when_reached, traj_df = years_until_fi(
-    current_age=current_age,
-    current_corpus=current_corpus,
-    start_monthly_sip=monthly_sip,
-    pre_ret_annual_return=pre_ret_return,
-    income_growth=income_growth,
-    sip_growth=sip_growth,
-    target_corpus_func=target_corpus_func,
-    inflation=inflation,
-    current_monthly_expense=monthly_expense,
-    max_age=80
-)
-
-def coast_required(years_from_now: float, future_annual_exp: float) -> float:
-    return target_corpus_func(years_from_now, future_annual_exp)
-
-def coast_check(current_corpus, pre_ret_return, current_age):
-    corpus = current_corpus
-    months = 0
-    monthly_rate = (1 + pre_ret_return) ** (1/12) - 1
-    while current_age + months/12 <= 80:
-        years_from_now = months / 12
-        future_m_exp = monthly_expense * ((1 + inflation) ** years_from_now)
-        future_a_exp = future_m_exp * 12
-        req = coast_required(years_from_now, future_a_exp)
-        if corpus >= req:
-            return current_age + months/12, corpus
-        corpus = fv(monthly_rate, 1, 0.0, corpus, when="end")
-        months += 1
-    return None, corpus
-
-coast_age, coast_corpus = (None, None)
-if show_coast:
-    coast_age, coast_corpus = coast_check(current_corpus, pre_ret_return, current_age)
+(age_reached, corpus_when_reached, traj_df), (coast_age, coast_corpus) = run_engine(
+    current_age, current_corpus, monthly_sip, pre_ret_return, sip_growth, inflation,
+    monthly_expense, fire_type, swr, lean_mult, barista_cover, fat_mult)
 
 # -----------------------------
 # Layout
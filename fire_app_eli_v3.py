@@ -1,10 +1,14 @@
 
-import numpy as np
 import pandas as pd
 import streamlit as st
 import altair as alt
 from PIL import Image
 
+from fire_engine import (VARIANTS, best_unit, coast_check, project_corpus, rupee_indian, target_corpus,
+                         years_until_fi)
+
+VARIANT = VARIANTS["v3"]
+
 # -----------------------------
 # Brand Palette (Edelweiss Life)
 # -----------------------------
@@ -45,78 +49,6 @@ a {{ color: var(--primary); }}
 </style>
 """
 
-# -----------------------------
-# Helpers
-# -----------------------------
-def rupee_indian(x: float) -> str:
-    if pd.isna(x): return "₹0"
-    x_int = int(round(x))
-    s = str(x_int)
-    if len(s) <= 3:
-        out = s
-    else:
-        last3 = s[-3:]
-        other = s[:-3]
-        groups = []
-        while len(other) > 2:
-            groups.insert(0, other[-2:])
-            other = other[:-2]
-        if other:
-            groups.insert(0, other)
-        out = ",".join(groups + [last3])
-    return f"₹{out}"
-
-def fv(rate: float, nper: int, pmt: float, pv: float, when: str = "end") -> float:
-    when_val = 1 if when == "begin" else 0
-    if rate == 0: return pv + pmt * nper
-    return pv * (1 + rate) ** nper + pmt * (1 + rate * when_val) * (((1 + rate) ** nper - 1) / rate)
-
-def years_until_fi(
-    current_age: int,
-    current_corpus: float,
-    monthly_sip: float,
-    pre_ret_annual_return: float,
-    sip_growth: float,
-    target_corpus_func,
-    inflation: float,
-    base_monthly_expense: float,
-    max_age: int = 80,
-):
-    records = []
-    corpus = current_corpus
-    months = 0
-    monthly_rate = (1 + pre_ret_annual_return) ** (1/12) - 1
-
-    while current_age + months/12 <= max_age:
-        yrs = months/12
-        f_m_exp = base_monthly_expense * ((1 + inflation) ** yrs)
-        f_a_exp = f_m_exp * 12
-        req = target_corpus_func(yrs, f_a_exp)
-
-        if corpus >= req:
-            age_hit = current_age + months/12
-            records.append({"Age": age_hit, "Invested Corpus": corpus, "Required Corpus": req})
-            return age_hit, corpus, pd.DataFrame(records)
-
-        corpus = fv(monthly_rate, 1, monthly_sip, corpus, when="end")
-        months += 1
-        if months % 12 == 0 and monthly_sip > 0:
-            monthly_sip *= (1 + sip_growth)
-        if months % 6 == 0:
-            age_pt = current_age + months/12
-            records.append({"Age": age_pt, "Invested Corpus": corpus, "Required Corpus": req})
-
-    return max_age, corpus, pd.DataFrame(records)
-
-def best_unit(amounts: pd.Series):
-    maxv = float(np.nanmax(amounts)) if len(amounts) else 0.0
-    if maxv >= 1e7:     # >= 1 Crore
-        return "₹ Cr", 1e7
-    elif maxv >= 1e5:   # >= 1 Lakh
-        return "₹ L", 1e5
-    else:
-        return "₹", 1.0
-
 # -----------------------------
 # App
 # -----------------------------
@@ -222,28 +154,10 @@ else:
     adjusted_annual_expense = future_annual_expense * fat_mult
 required_corpus = adjusted_annual_expense / swr
 
-monthly_rate = (1 + pre_ret_return) ** (1/12) - 1
-n_months = max(0, years_to_target * 12)
-corpus = float(current_corpus)
-if monthly_sip > 0 and n_months > 0:
-    sip = monthly_sip
-    for m in range(n_months):
-        corpus = fv(monthly_rate, 1, sip, corpus, when="end")
-        if (m+1) % 12 == 0:
-            sip *= (1 + sip_growth)
-elif n_months > 0:
-    for m in range(n_months):
-        corpus = fv(monthly_rate, 1, 0.0, corpus, when="end")
-projected_corpus_at_target = corpus
+projected_corpus_at_target = project_corpus(current_corpus, pre_ret_return, years_to_target * 12,
+                                            max(0.0, monthly_sip), sip_growth)
 
-def target_corpus_func(years_from_now: float, future_annual_exp: float) -> float:
-    if fire_type == "Lean FIRE":
-        expense = future_annual_exp * lean_mult
-    elif fire_type == "Barista FIRE":
-        expense = future_annual_exp * (1 - barista_cover)
-    else:
-        expense = future_annual_exp * fat_mult
-    return expense / swr
+target_corpus_func = target_corpus(fire_type, swr, lean_mult, barista_cover, fat_mult)
 
 age_reached, corpus_when_reached, traj_df = years_until_fi(
     current_age=current_age,
@@ -254,21 +168,12 @@ age_reached, corpus_when_reached, traj_df = years_until_fi(
     target_corpus_func=target_corpus_func,
     inflation=inflation,
     base_monthly_expense=monthly_expense,
-    max_age=80
+    max_age=80,
+    variant=VARIANT,
 )
 
 # Coast-FIRE
-def coast_check(current_corpus, pre_ret_return, current_age):
-    corpus = current_corpus; months = 0
-    monthly_rate = (1 + pre_ret_return) ** (1/12) - 1
-    while current_age + months/12 <= 80:
-        yrs = months/12
-        f_m_exp = monthly_expense * ((1 + inflation) ** yrs); f_a_exp = f_m_exp * 12
-        req = target_corpus_func(yrs, f_a_exp)
-        if corpus >= req: return current_age + months/12, corpus
-        corpus = fv(monthly_rate, 1, 0.0, corpus, when="end"); months += 1
-    return None, corpus
-coast_age, _ = coast_check(current_corpus, pre_ret_return, current_age)
+coast_age, _ = coast_check(current_corpus, pre_ret_return, current_age, target_corpus_func, inflation, monthly_expense)
 
 # Layout
 left, right = st.columns([1,1])
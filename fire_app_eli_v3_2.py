@@ -1,9 +1,30 @@
 
+import logging
+import time
+
 import numpy as np
 import pandas as pd
 import streamlit as st
 import altair as alt
 from PIL import Image
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from fire_attribution import shapley
+from fire_cashflows import schedule_from_frame
+from fire_counters import counted
+from fire_debounce import Debouncer
+from fire_decimate import chart_width_px, decimate_for_chart, decimate_frame, max_points_for, payload_bytes
+from fire_engine import (VARIANTS, best_unit, coast_check, deflate, deflator, fi_search, project_corpus,
+                         rupee_indian, target_corpus)
+from fire_frontier import coast_frontier
+from fire_income import CareerBreak, IncomePath, sip_from_income, stepped_sip
+from fire_jobs import RUNNER
+from fire_montecarlo import fan_table
+from fire_report import REPORTS, PlanReport, money, render_pdf
+from fire_results import LEDGER, STORE, ProjectionResult, deep_sizeof, input_key
+from fire_share import DEFAULTS as SHARE_DEFAULTS, PARAM, decode, encode, prewarm, remember_result
+from fire_tax import RULES, DEFAULT_RULES_VERSION, WithdrawalMix, get_rules, withdrawal_table
+from fire_withdrawal import strategy_table
 
 # -----------------------------
 # Theme (Edelweiss)
@@ -37,85 +58,16 @@ BRAND_CSS = f"""
 </style>
 """
 
-# -----------------------------
-# Helpers
-# -----------------------------
-def rupee_indian(x: float) -> str:
-    """Format number with Indian grouping and ₹ symbol."""
-    if pd.isna(x): return "₹0"
-    x_int = int(round(x))
-    s = str(x_int)
-    if len(s) <= 3:
-        out = s
-    else:
-        last3 = s[-3:]
-        other = s[:-3]
-        groups = []
-        while len(other) > 2:
-            groups.insert(0, other[-2:])
-            other = other[:-2]
-        if other:
-            groups.insert(0, other)
-        out = ",".join(groups + [last3])
-    return f"₹{out}"
-
-def fv(rate: float, nper: int, pmt: float, pv: float, when: str = "end") -> float:
-    """Future value with periodic compounding."""
-    when_val = 1 if when == "begin" else 0
-    if rate == 0: return pv + pmt * nper
-    return pv * (1 + rate) ** nper + pmt * (1 + rate * when_val) * (((1 + rate) ** nper - 1) / rate)
-
-def years_until_fi(
-    current_age: int,
-    current_corpus: float,
-    monthly_sip: float,
-    pre_ret_annual_return: float,
-    sip_growth: float,
-    target_corpus_func,
-    inflation: float,
-    base_monthly_expense: float,
-    max_age: int = 80,
-):
-    """Simulate month-by-month until corpus >= target corpus. Returns (age_reached, corpus, df)."""
-    records = []
-    corpus = current_corpus
-    months = 0
-    monthly_rate = (1 + pre_ret_annual_return) ** (1/12) - 1
-
-    while current_age + months/12 <= max_age:
-        yrs = months/12
-        f_m_exp = base_monthly_expense * ((1 + inflation) ** yrs)
-        f_a_exp = f_m_exp * 12
-        req = target_corpus_func(yrs, f_a_exp)
-
-        if corpus >= req:
-            age_hit = current_age + months/12
-            records.append({"Age": age_hit, "Invested Corpus": corpus, "Required Corpus": req})
-            return age_hit, corpus, pd.DataFrame(records)
-
-        corpus = fv(monthly_rate, 1, monthly_sip, corpus, when="end")
-        months += 1
-        if months % 12 == 0 and monthly_sip > 0:
-            monthly_sip *= (1 + sip_growth)
-        if months % 6 == 0:
-            age_pt = current_age + months/12
-            records.append({"Age": age_pt, "Invested Corpus": corpus, "Required Corpus": req})
-
-    return max_age, corpus, pd.DataFrame(records)
-
-def best_unit(amounts: pd.Series):
-    """Choose axis unit (₹ L or ₹ Cr) and the scale divisor."""
-    maxv = float(np.nanmax(amounts)) if len(amounts) else 0.0
-    if maxv >= 1e7:     # >= 1 Crore
-        return "₹ Cr", 1e7
-    elif maxv >= 1e5:   # >= 1 Lakh
-        return "₹ L", 1e5
-    else:
-        return "₹", 1.0
+log = logging.getLogger("fire.app")
+VARIANT = VARIANTS["v3_2"]
 
 # -----------------------------
 # App
 # -----------------------------
+t_start = time.perf_counter()
+ctx = get_script_run_ctx()
+session_id = ctx.session_id if ctx is not None else "local"
+
 st.set_page_config(page_title="FIRE Calculator — Edelweiss", page_icon=None, layout="wide")
 st.markdown(BRAND_CSS, unsafe_allow_html=True)
 
@@ -129,6 +81,68 @@ with c1:
 with c2:
     st.markdown('<div class="header-title"><h1>FIRE Calculator — Financial Independence, Retire Early</h1><div class="smallnote">Edelweiss palette • Simple inputs • Lean/Barista/Fat • SWR • Coast-FIRE</div></div>', unsafe_allow_html=True)
 
+# Shared link (?s=...): its inputs become this session's widget defaults and its stored result is prewarmed
+if "shared" not in st.session_state:
+    shared, code = {}, st.query_params.get(PARAM)
+    if code:
+        try:
+            shared = decode(code)
+            prewarm(code)
+        except ValueError as e:
+            st.warning(f"This link could not be read ({e}); showing the default inputs.")
+    st.session_state["shared"] = {**SHARE_DEFAULTS, **shared}
+D = st.session_state["shared"]
+
+# -----------------------------
+# Advanced inputs (debounced)
+# -----------------------------
+@st.fragment
+def advanced_inputs(sip_mode: str, monthly_sip: float) -> None:
+    """Advanced sliders; a burst of changes reruns only this fragment, then the app once."""
+    with st.expander("Advanced (optional)", expanded=False):
+        st.caption("Tweak assumptions if you want finer control.")
+        values = {
+            "inflation": st.slider("Inflation on expenses (annual, %)", 0.0, 10.0, D["inflation"], 0.25),
+            "income_growth": st.slider("Yearly salary hike (%)", 0.0, 20.0, D["income_growth"], 0.25),
+            "pre_ret_return": st.slider("Expected return before FI (annual, %)", 0.0, 20.0, D["pre_ret_return"], 0.25),
+            "post_ret_return": st.slider("Expected return after FI (annual, %)", 0.0, 12.0, D["post_ret_return"], 0.25),
+            "swr": st.slider("Safe Withdrawal Rate (%, lower = safer)", 2.5, 5.0, D["swr"], 0.1),
+            "sip_step": None, "sip_custom": None,
+        }
+
+        if sip_mode == "% of income":
+            st.caption("SIP follows your income path (hikes, breaks, spouse income).")
+        elif monthly_sip > 0:
+            values["sip_step"] = st.radio("SIP step-up each year", ["Track salary hike", "Custom rate"],
+                                          index=int(D["sip_step"] == "Custom rate"), horizontal=True)
+            if values["sip_step"] == "Custom rate":
+                values["sip_custom"] = st.slider("SIP growth (annual, %)", 0.0, 30.0, D["sip_custom"], 0.25)
+        else:
+            st.caption("SIP growth disabled (no monthly SIP).")
+
+        values["tax_aware"] = st.toggle("Account for tax on withdrawals in FI", value=D["tax_aware"],
+                                        help="Grosses up the required corpus for equity LTCG and slab tax on debt gains.")
+        if values["tax_aware"]:
+            values["tax_version"] = st.selectbox("Tax rules", list(RULES), index=list(RULES).index(
+                D["tax_version"] if D["tax_version"] in RULES else DEFAULT_RULES_VERSION))
+            values["equity_pct"] = st.slider("Equity share of withdrawals (%)", 0, 100, D["equity_pct"], 5)
+            values["epf_ppf_pct"] = st.slider("EPF/PPF share of withdrawals (%)", 0, 100 - values["equity_pct"],
+                                              min(D["epf_ppf_pct"], 100 - values["equity_pct"]), 5)
+            values["gain_pct"] = st.slider("Gains as % of each withdrawal", 0, 100, D["gain_pct"], 5,
+                                           help="The rest is your original investment coming back, which is not taxed.")
+        status = st.empty()
+
+    debounce = st.session_state.setdefault("advanced", Debouncer())
+    run_ctx = get_script_run_ctx()
+    if debounce.applied is None or not (run_ctx and run_ctx.fragment_ids_this_run):
+        # First run, or a full-app run (e.g. SIP mode changed which widgets exist): apply directly.
+        if debounce.applied != values:
+            debounce.apply(values)
+        return
+    if debounce.settle(values, lambda: status.caption("Updating…")):
+        debounce.apply(values)
+        st.rerun()
+
 # -----------------------------
 # Sidebar — simplified inputs
 # -----------------------------
@@ -136,151 +150,234 @@ with st.sidebar:
     st.header("Quick Start")
     a1, a2 = st.columns(2)
     with a1:
-        current_age = st.number_input("Current age", min_value=18, max_value=70, value=30, step=1)
+        current_age = st.number_input("Current age", min_value=18, max_value=70, value=min(D["current_age"], 70), step=1)
     with a2:
-        target_age = st.number_input("Target FI age", min_value=current_age+1, max_value=80, value=45, step=1)
+        target_age = st.number_input("Target FI age", min_value=current_age+1, max_value=80,
+                                     value=max(D["target_age"], current_age + 1), step=1)
 
-    monthly_income = st.number_input("Monthly income (₹)", min_value=0.0, value=150000.0, step=5000.0, format="%.0f",
+    monthly_income = st.number_input("Monthly income (₹)", min_value=0.0, value=D["monthly_income"], step=5000.0, format="%.0f",
                                      help="Your take-home per month.")
-    monthly_expense = st.number_input("Monthly expenses (₹, today)", min_value=0.0, value=80000.0, step=5000.0, format="%.0f",
+    monthly_expense = st.number_input("Monthly expenses (₹, today)", min_value=0.0, value=D["monthly_expense"], step=5000.0, format="%.0f",
                                       help="Usual living costs per month in today's value.")
-    current_corpus = st.number_input("Current invested corpus (₹)", min_value=0.0, value=1000000.0, step=50000.0, format="%.0f")
+    current_corpus = st.number_input("Current invested corpus (₹)", min_value=0.0, value=D["current_corpus"], step=50000.0, format="%.0f")
 
     st.markdown("---")
     st.subheader("Investing each month")
-    sip_mode = st.radio("How do you want to input SIP?", ["Fixed amount", "% of income"], index=0, horizontal=True)
+    sip_mode = st.radio("How do you want to input SIP?", ["Fixed amount", "% of income"],
+                        index=int(D["sip_mode"] == "% of income"), horizontal=True)
     if sip_mode == "% of income":
-        sip_pct = st.slider("SIP as % of income", min_value=0, max_value=80, value=30, step=1,
+        sip_pct = st.slider("SIP as % of income", min_value=0, max_value=80, value=D["sip_pct"], step=1,
                             help="Set 0% if you're not investing monthly.")
         monthly_sip = monthly_income * sip_pct/100.0
     else:
-        monthly_sip = st.number_input("Monthly SIP (₹)", min_value=0.0, value=30000.0, step=5000.0, format="%.0f",
+        monthly_sip = st.number_input("Monthly SIP (₹)", min_value=0.0, value=D["monthly_sip"], step=5000.0, format="%.0f",
                                       help="Enter 0 if you don't currently invest monthly.")
 
-    compact = st.toggle("Compact layout (mobile)", value=True)
-
     st.markdown("---")
-    with st.expander("Advanced (optional)", expanded=False):
-        st.caption("Tweak assumptions if you want finer control.")
-        inflation = st.slider("Inflation on expenses (annual, %)", 0.0, 10.0, 6.0, 0.25) / 100.0
-        income_growth = st.slider("Yearly salary hike (%, for info)", 0.0, 20.0, 8.0, 0.25) / 100.0
-        pre_ret_return = st.slider("Expected return before FI (annual, %)", 0.0, 20.0, 11.0, 0.25) / 100.0
-        post_ret_return = st.slider("Expected return after FI (annual, %)", 0.0, 12.0, 7.0, 0.25) / 100.0
-        swr = st.slider("Safe Withdrawal Rate (%, lower = safer)", 2.5, 5.0, 4.0, 0.1) / 100.0
-
-        if monthly_sip > 0:
-            sip_growth_choice = st.radio("SIP step-up each year", ["Track salary hike", "Custom rate"], index=0, horizontal=True)
-            if sip_growth_choice == "Track salary hike":
-                sip_growth = income_growth
-            else:
-                sip_growth = st.slider("SIP growth (annual, %)", 0.0, 30.0, 8.0, 0.25) / 100.0
-        else:
-            sip_growth = 0.0
-            st.caption("SIP growth disabled (no monthly SIP).")
+    advanced_inputs(sip_mode, monthly_sip)
 
     st.markdown("---")
     st.subheader("FIRE style")
-    fire_type = st.selectbox("Choose mode", ["Lean FIRE", "Barista FIRE", "Fat FIRE"], index=1)
+    fire_type = st.selectbox("Choose mode", ["Lean FIRE", "Barista FIRE", "Fat FIRE"],
+                             index=["Lean FIRE", "Barista FIRE", "Fat FIRE"].index(D["fire_type"]))
     if fire_type == "Lean FIRE":
-        lean_mult = st.slider("Lean lifestyle (x of baseline)", 0.5, 1.0, 0.8, 0.05)
+        lean_mult = st.slider("Lean lifestyle (x of baseline)", 0.5, 1.0, D["lean_mult"], 0.05)
         barista_cover = 0.0
         fat_mult = 1.0
     elif fire_type == "Barista FIRE":
-        barista_cover = st.slider("Part-time income covers (%) of expenses", 10, 80, 40, 5) / 100.0
+        barista_cover = st.slider("Part-time income covers (%) of expenses", 10, 80, D["barista_pct"], 5) / 100.0
         lean_mult = 1.0
         fat_mult = 1.0
     else:
-        fat_mult = st.slider("Fat lifestyle (x of baseline)", 1.0, 2.5, 1.5, 0.1)
+        fat_mult = st.slider("Fat lifestyle (x of baseline)", 1.0, 2.5, D["fat_mult"], 0.1)
         barista_cover = 0.0
         lean_mult = 1.0
 
-# Defaults if Advanced untouched
-if "inflation" not in locals():
-    inflation = 0.06; income_growth = 0.08; pre_ret_return = 0.11; post_ret_return = 0.07; swr = 0.04
-    sip_growth = 0.0 if monthly_sip <= 0 else 0.08
+    st.markdown("---")
+    with st.expander("Income path (optional)", expanded=False):
+        st.caption("Career breaks pause your salary (and hikes); spouse income counts until they retire.")
+        career_break = st.toggle("Plan a career break / sabbatical", value=D["career_break"])
+        breaks = ()
+        if career_break:
+            b1, b2 = st.columns(2)
+            with b1:
+                break_age = st.number_input("Break starts at age", min_value=current_age, max_value=79,
+                                            value=min(max(D["break_age"] or current_age + 5, current_age), 79), step=1)
+            with b2:
+                break_years = st.number_input("Length (years)", min_value=0.5, max_value=10.0, value=D["break_years"], step=0.5)
+            break_pay = st.slider("Income during break (% of salary)", 0, 100, D["break_pay"], 10)
+            breaks = (CareerBreak(start_age=break_age, years=break_years, income_share=break_pay / 100.0),)
+        spouse_income = st.number_input("Spouse monthly income (₹)", min_value=0.0, value=D["spouse_income"], step=5000.0, format="%.0f")
+        if spouse_income > 0:
+            spouse_hike = st.slider("Spouse yearly hike (%)", 0.0, 20.0, D["spouse_hike"], 0.25) / 100.0
+            spouse_retire_age = st.number_input("Spouse retires when you are", min_value=current_age + 1, max_value=80,
+                                                value=min(max(D["spouse_retire_age"] or target_age, current_age + 1), 80), step=1)
+        else:
+            spouse_hike, spouse_retire_age = 0.0, None
+
+    st.markdown("---")
+    with st.expander("Goals & lump sums (optional)", expanded=False):
+        st.caption("Education, home, wedding… in today's ₹. Each goal grows at its own inflation.")
+        shared_goals = list(zip(*D["goals"])) or [()] * 5
+        goals_df = st.data_editor(
+            pd.DataFrame({"Goal": pd.Series(shared_goals[0], dtype=str), "Age": pd.Series(shared_goals[1], dtype=float),
+                          "Amount": pd.Series(shared_goals[2], dtype=float),
+                          "Inflation %": pd.Series(shared_goals[3], dtype=float),
+                          "Type": pd.Series(shared_goals[4], dtype=str)}),
+            num_rows="dynamic", use_container_width=True, key="goals",
+            column_config={
+                "Age": st.column_config.NumberColumn(min_value=18, max_value=80, step=1),
+                "Amount": st.column_config.NumberColumn("Amount (₹, today)", min_value=0.0, format="%.0f"),
+                "Inflation %": st.column_config.NumberColumn(min_value=0.0, max_value=15.0, default=6.0),
+                "Type": st.column_config.SelectboxColumn(options=["Outflow", "Inflow"], default="Outflow"),
+            },
+        )
+
+# Engine inputs come from the last applied Advanced values, not the live sliders
+adv = st.session_state["advanced"].applied
+inflation = adv["inflation"] / 100.0
+income_growth = adv["income_growth"] / 100.0
+pre_ret_return = adv["pre_ret_return"] / 100.0
+post_ret_return = adv["post_ret_return"] / 100.0
+swr = adv["swr"] / 100.0
+if sip_mode == "% of income":
+    sip_growth = income_growth
+elif monthly_sip > 0:
+    sip_growth = income_growth if adv["sip_step"] == "Track salary hike" else adv["sip_custom"] / 100.0
+else:
+    sip_growth = 0.0
+tax_aware = adv["tax_aware"]
+if tax_aware:
+    tax_version, equity_pct, epf_ppf_pct, gain_pct = (adv["tax_version"], adv["equity_pct"],
+                                                      adv["epf_ppf_pct"], adv["gain_pct"])
+
+tax_table = None
+if tax_aware:
+    mix = WithdrawalMix(equity=equity_pct / 100.0, debt=(100 - equity_pct - epf_ppf_pct) / 100.0,
+                        epf_ppf=epf_ppf_pct / 100.0, gain_fraction=gain_pct / 100.0)
+    tax_table = withdrawal_table(get_rules(tax_version), mix, inflation)
+
+def gross_withdrawal(annual_expense: float) -> float:
+    """Annual withdrawal needed so that the post-tax amount covers ``annual_expense``."""
+    if tax_table is None:
+        return annual_expense
+    return float(tax_table.gross_up(annual_expense))
 
 # -----------------------------
 # Core calculations
 # -----------------------------
 years_to_target = target_age - current_age
-future_monthly_expense = monthly_expense * ((1 + inflation) ** years_to_target)
-future_annual_expense = future_monthly_expense * 12
-
-if fire_type == "Lean FIRE":
-    adjusted_annual_expense = future_annual_expense * lean_mult
-elif fire_type == "Barista FIRE":
-    adjusted_annual_expense = future_annual_expense * (1 - barista_cover)
-else:
-    adjusted_annual_expense = future_annual_expense * fat_mult
-
-required_corpus = adjusted_annual_expense / swr
-
-# Project corpus at target age
-monthly_rate = (1 + pre_ret_return) ** (1/12) - 1
-n_months = max(0, years_to_target * 12)
-corpus = float(current_corpus)
+horizon_months = (80 - current_age) * 12 + 1
 
-if monthly_sip > 0 and n_months > 0:
-    sip = monthly_sip
-    for m in range(n_months):
-        corpus = fv(monthly_rate, 1, sip, corpus, when="end")
-        if (m+1) % 12 == 0:
-            sip *= (1 + sip_growth)
-elif n_months > 0:
-    for _ in range(n_months):
-        corpus = fv(monthly_rate, 1, 0.0, corpus, when="end")
-
-projected_corpus_at_target = corpus
+# Income path / SIP: one array per input change, shared by projection and FI search
+@st.cache_data(show_spinner=False)
+@counted("build_sip_schedule")
+def build_sip_schedule(income_path: IncomePath, current_age: int, n_months: int,
+                       sip_mode: str, sip_pct: float, monthly_sip: float, sip_growth: float) -> np.ndarray:
+    if sip_mode == "% of income":
+        return sip_from_income(income_path.monthly_array(current_age, n_months), sip_pct)
+    growth = sip_growth if monthly_sip > 0 else 0.0
+    return stepped_sip(max(0.0, monthly_sip), growth, n_months, income_path.break_share(current_age, n_months))
+
+income_path = IncomePath(monthly_income=monthly_income, yearly_hike=income_growth, breaks=breaks,
+                         spouse_monthly_income=spouse_income, spouse_yearly_hike=spouse_hike,
+                         spouse_retire_age=spouse_retire_age)
+sip_pct_used = sip_pct if sip_mode == "% of income" else 0.0
+sip_schedule = build_sip_schedule(income_path, current_age, horizon_months, sip_mode,
+                                  sip_pct_used, monthly_sip, sip_growth)
+
+# Goals: scatter dated lump sums onto the month axis once, reuse in every loop below
+schedule = schedule_from_frame(goals_df, current_age)
+flows = schedule.to_month_array(horizon_months) if len(schedule) else None
+reserve = schedule.reserve_array(horizon_months, post_ret_return) if len(schedule) else None
+
+target_corpus_func = target_corpus(fire_type, swr, lean_mult, barista_cover, fat_mult, gross_withdrawal)
+
+def required_curve(n_months: int) -> np.ndarray:
+    """``target_corpus_func`` (plus goal reserve) for months 0..n_months-1 as one array."""
+    mult = lean_mult if fire_type == "Lean FIRE" else (1 - barista_cover) if fire_type == "Barista FIRE" else fat_mult
+    annual = monthly_expense * ((1 + inflation) ** (np.arange(n_months) / 12)) * 12 * mult
+    req = (annual if tax_table is None else tax_table.gross_up(annual)) / swr
+    return req if reserve is None else req + reserve[:n_months]
+
+@counted("run_projection")
+def run_projection(key: str) -> ProjectionResult:
+    """Required corpus, projection at target, earliest FI and coast age for the current inputs."""
+    future_monthly_expense = monthly_expense * ((1 + inflation) ** years_to_target)
+    future_annual_expense = future_monthly_expense * 12
 
-def target_corpus_func(years_from_now: float, future_annual_exp: float) -> float:
     if fire_type == "Lean FIRE":
-        expense = future_annual_exp * lean_mult
+        adjusted_annual_expense = future_annual_expense * lean_mult
     elif fire_type == "Barista FIRE":
-        expense = future_annual_exp * (1 - barista_cover)
+        adjusted_annual_expense = future_annual_expense * (1 - barista_cover)
     else:
-        expense = future_annual_exp * fat_mult
-    return expense / swr
-
-age_reached, corpus_when_reached, traj_df = years_until_fi(
-    current_age=current_age,
-    current_corpus=current_corpus,
-    monthly_sip=max(0.0, monthly_sip),
-    pre_ret_annual_return=pre_ret_return,
-    sip_growth=sip_growth if monthly_sip > 0 else 0.0,
-    target_corpus_func=target_corpus_func,
-    inflation=inflation,
-    base_monthly_expense=monthly_expense,
-    max_age=80
+        adjusted_annual_expense = future_annual_expense * fat_mult
+
+    required_corpus = gross_withdrawal(adjusted_annual_expense) / swr
+    if reserve is not None:
+        required_corpus += reserve[years_to_target * 12]
+
+    # Project corpus at target age
+    corpus = project_corpus(current_corpus, pre_ret_return, years_to_target * 12,
+                            sip_schedule=sip_schedule, flows=flows)
+
+    found = fi_search(
+        current_age=current_age,
+        current_corpus=current_corpus,
+        monthly_sip=max(0.0, monthly_sip),
+        pre_ret_annual_return=pre_ret_return,
+        sip_growth=sip_growth if monthly_sip > 0 else 0.0,
+        target_corpus_func=target_corpus_func,
+        inflation=inflation,
+        base_monthly_expense=monthly_expense,
+        max_age=80,
+        flows=flows,
+        reserve=reserve,
+        sip_schedule=sip_schedule,
+        variant=VARIANT,
+    )
+    coast_age, _ = coast_check(current_corpus, pre_ret_return, current_age, target_corpus_func,
+                               inflation, monthly_expense, 80, flows, reserve)
+    return ProjectionResult(key, required_corpus, corpus, found.age, found.corpus, coast_age, found.traj_df,
+                            reached=found.reached)
+
+# Results are shared across sessions by input hash; the session only keeps the key
+result_key = input_key(
+    current_age=current_age, target_age=target_age, monthly_income=monthly_income,
+    monthly_expense=monthly_expense, current_corpus=current_corpus, sip_mode=sip_mode,
+    sip_pct=sip_pct_used, monthly_sip=monthly_sip, inflation=inflation, income_growth=income_growth,
+    pre_ret_return=pre_ret_return, post_ret_return=post_ret_return, swr=swr, sip_growth=sip_growth,
+    fire_type=fire_type, lean_mult=lean_mult, barista_cover=barista_cover, fat_mult=fat_mult,
+    tax=(tax_version, equity_pct, epf_ppf_pct, gain_pct) if tax_aware else None,
+    income_path=income_path, goals=goals_df,
 )
-
-# Coast-FIRE (no contributions from now)
-def coast_check(current_corpus, pre_ret_return, current_age):
-    corpus = current_corpus
-    months = 0
-    monthly_rate = (1 + pre_ret_return) ** (1/12) - 1
-    while current_age + months/12 <= 80:
-        yrs = months/12
-        f_m_exp = monthly_expense * ((1 + inflation) ** yrs)
-        f_a_exp = f_m_exp * 12
-        req = target_corpus_func(yrs, f_a_exp)
-        if corpus >= req:
-            return current_age + months/12, corpus
-        corpus = fv(monthly_rate, 1, 0.0, corpus, when="end")
-        months += 1
-    return None, corpus
-
-coast_age, _ = coast_check(current_corpus, pre_ret_return, current_age)
+res_now = STORE.get_or_compute(result_key, lambda: run_projection(result_key))
+st.session_state["result_key"] = result_key
+required_corpus = res_now.required_corpus
+projected_corpus_at_target = res_now.projected_corpus
+age_reached, corpus_when_reached, coast_age = res_now.age_reached, res_now.corpus_when_reached, res_now.coast_age
+reached = res_now.reached
+traj_df = res_now.frame()
+# Coast frontier for every month from the discounted trajectory (no per-month coast loops)
+frontier = coast_frontier(current_corpus, pre_ret_return, current_age, target_age, sip_schedule,
+                          required_curve(horizon_months), flows)
 
 # -----------------------------
 # Output — intuitive view
 # -----------------------------
+# Real terms: one deflator array per rerun, applied to the nominal results only for display
+real_terms = st.toggle("Show in today's ₹ (inflation-adjusted)", value=False, key="real_terms")
+deflators = deflator(inflation if real_terms else 0.0, horizon_months)
+in_today = " (today's ₹)" if real_terms else ""
+at_target = deflators[min(years_to_target * 12, horizon_months - 1)]
+
 g1, g2, g3 = st.columns([1,1,1])
 with g1:
-    st.markdown(f'<div class="card"><h3>Required corpus</h3><div class="value">{rupee_indian(required_corpus)}</div></div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="card"><h3>Required corpus{in_today}</h3><div class="value">{rupee_indian(required_corpus * at_target)}</div></div>', unsafe_allow_html=True)
 with g2:
-    st.markdown(f'<div class="card"><h3>Projected @ target age</h3><div class="value">{rupee_indian(projected_corpus_at_target)}</div></div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="card"><h3>Projected @ target age{in_today}</h3><div class="value">{rupee_indian(projected_corpus_at_target * at_target)}</div></div>', unsafe_allow_html=True)
 with g3:
-    val = f"{age_reached:.1f} yrs" if age_reached <= 80 else "Not by 80"
+    val = f"{age_reached:.1f} yrs" if reached else "Not by 80"
     st.markdown(f'<div class="card"><h3>Earliest FI age</h3><div class="value">{val}</div></div>', unsafe_allow_html=True)
 
 ratio = 0 if required_corpus <= 0 else projected_corpus_at_target / required_corpus
@@ -294,40 +391,280 @@ with cA:
     else:
         gap = required_corpus - projected_corpus_at_target
         st.markdown(f"**Status @ {target_age}:** <span class='status-pill status-warn'>Shortfall</span>", unsafe_allow_html=True)
-        st.write(f"Gap at {target_age}: **{rupee_indian(gap)}**")
+        st.write(f"Gap at {target_age}{in_today}: **{rupee_indian(gap * at_target)}**")
 with cB:
     if coast_age is not None:
         st.write(f"**Coast-FIRE:** with no more investing, FI at **age {coast_age:.1f}**.")
     else:
         st.write("**Coast-FIRE:** not achievable by 80 with current corpus.")
 
+log.info("cards rendered in %.1f ms", (time.perf_counter() - t_start) * 1000)
+
+# Heavy analytics run on the job pool; fragments poll until the result is ready
+def streamed(future, render, waiting_text: str) -> None:
+    """Render ``future``'s result in a fragment that polls while the job is running."""
+    polling = future is not None and not future.done()
+
+    @st.fragment(run_every=0.4 if polling else None)
+    def view():
+        if future is not None and future.done():
+            if polling:
+                st.rerun()   # ready: one full rerun re-registers this view without the poll timer
+            render(None if future.cancelled() else future.result())
+        else:
+            render(None)
+            if future is not None:
+                st.caption(waiting_text)
+    view()
+
 # Trajectory chart and table
 st.subheader("Trajectory")
-if not traj_df.empty:
-    unit, div = best_unit(pd.concat([traj_df["Invested Corpus"], traj_df["Required Corpus"]], ignore_index=True))
-    chart_df = traj_df.melt(id_vars="Age", value_vars=["Invested Corpus", "Required Corpus"],
-                            var_name="Series", value_name="Amount")
+f1, f2, f3 = st.columns([2, 1, 1])
+with f1:
+    show_fan = st.toggle("Show market ups & downs (Monte Carlo)", value=False, key="mc_fan")
+if show_fan:
+    with f2:
+        fan_vol = st.slider("Volatility (%)", 0.0, 30.0, 15.0, 1.0, key="fan_vol") / 100.0
+    with f3:
+        fan_paths = st.select_slider("Paths", options=[1000, 2000, 5000, 10000], value=2000, key="fan_paths")
+fan_future = None
+if show_fan and not traj_df.empty:
+    # Monte Carlo fan: percentiles streamed chunk by chunk, never the full (paths, months) matrix
+    fan_months = min(horizon_months, int(round((max(float(traj_df["Age"].max()), target_age) - current_age) * 12)) + 1)
+    # Monthly percentile rows; the chart decimates them to its point budget
+    fan_future = RUNNER.submit(session_id, "fan", f"fan:{result_key}:{fan_paths}:{fan_vol}:{fan_months}:1", fan_table,
+                               current_age, current_corpus, sip_schedule, fan_months, pre_ret_return, fan_vol,
+                               fan_paths, required=required_curve(fan_months), flows=flows, every=1)
+
+def render_trajectory(fan_df) -> None:
+    # Runs inside the trajectory fragment: its display toggles rerun only this view and
+    # read the engine result from the shared store instead of recomputing it.
+    res = STORE.get(st.session_state["result_key"]) or res_now
+    traj_df = deflate(res.frame(), deflators, current_age, ["Invested Corpus", "Required Corpus"])
+    if fan_df is not None:
+        fan_df = deflate(fan_df, deflators, current_age, ["P10", "P50", "P90"])
+    t1, t2, t3 = st.columns(3)
+    compact = t1.toggle("Compact chart (mobile)", value=True, key="compact")
+    show_coast = t2.toggle("Show coast frontier", value=True, key="show_coast")
+    show_table = t3.toggle("Show snapshots table", value=False, key="show_table")
+    if traj_df.empty:
+        st.info("Adjust inputs on the left to see a trajectory and earliest FI age.")
+        return
+    coast_df = deflate(frontier.frame(every=1), deflators, current_age, ["Coast Number"])
+    coast_df = coast_df[coast_df["Age"] <= traj_df["Age"].max()] if show_coast else coast_df.iloc[:0]
+    unit_src = ([traj_df["Invested Corpus"], traj_df["Required Corpus"], coast_df["Coast Number"]]
+                + ([fan_df["P90"]] if fan_df is not None else []))
+    unit, div = best_unit(pd.concat(unit_src, ignore_index=True))
+    # Level-of-detail: cap points per series at the chart width's budget (crossings and the
+    # coast stop age kept exact) before inlining the trajectory, band and frontier into the spec
+    budget = max_points_for(compact, chart_width_px(compact))
+    chart_df = decimate_for_chart(traj_df, budget)
+    full_df = traj_df.melt(id_vars="Age", value_vars=["Invested Corpus", "Required Corpus"],
+                           var_name="Series", value_name="Amount")
+    full_points, sent_points = len(full_df), len(chart_df)
+    saved_bytes = payload_bytes(full_df) - payload_bytes(chart_df) if len(chart_df) < len(full_df) else 0
+    stop_age = frontier.stop_age
+    stop_row = [] if stop_age is None or coast_df.empty else [int(np.abs(coast_df["Age"].to_numpy() - stop_age).argmin())]
+    frames = [(coast_df, ["Coast Number"], stop_row)]
+    if fan_df is not None:
+        frames.append((fan_df, ["P10", "P50", "P90"], []))
+    for i, (frame, cols, keep) in enumerate(frames):
+        small = decimate_frame(frame, budget, cols, keep=keep)
+        full_points, sent_points = full_points + len(frame) * len(cols), sent_points + len(small) * len(cols)
+        saved_bytes += payload_bytes(frame) - payload_bytes(small)
+        frames[i] = small
+    coast_df = frames[0]
+    band_src = frames[1] if fan_df is not None else None
     chart_df["AmountScaled"] = chart_df["Amount"] / div
-    color_scale = alt.Scale(domain=["Invested Corpus", "Required Corpus"],
-                            range=[PRIMARY_BLUE, ACCENT_ORANGE])
+    color_scale = alt.Scale(domain=["Invested Corpus", "Required Corpus", "Coast Number"],
+                            range=[PRIMARY_BLUE, ACCENT_ORANGE, "#10B981"])
     height = 320 if compact else 360
     line = alt.Chart(chart_df).mark_line().encode(
         x=alt.X("Age:Q", title="Age (years)"),
-        y=alt.Y("AmountScaled:Q", title=f"Amount ({unit})", axis=alt.Axis(format="~s")),
+        y=alt.Y("AmountScaled:Q", title=f"Amount ({unit}{', today' if real_terms else ''})", axis=alt.Axis(format="~s")),
         color=alt.Color("Series:N", scale=color_scale, legend=alt.Legend(title="")),
         tooltip=[alt.Tooltip("Age:Q", format=".1f"), "Series",
                  alt.Tooltip("Amount:Q", title="Amount (₹)", format=",.0f")]
     ).properties(height=height)
+    if not coast_df.empty:
+        coast = alt.Chart(coast_df.assign(Series="Coast Number", AmountScaled=coast_df["Coast Number"] / div)).mark_line(
+            strokeDash=[6, 4]).encode(
+            x="Age:Q", y="AmountScaled:Q", color=alt.Color("Series:N", scale=color_scale, legend=alt.Legend(title="")),
+            tooltip=[alt.Tooltip("Age:Q", format=".1f"),
+                     alt.Tooltip("Coast Number:Q", title="Needed to stop investing (₹)", format=",.0f"),
+                     alt.Tooltip("Coast FI Age:Q", title="FI age if you stop here", format=".1f")])
+        line = line + coast
+    if fan_df is not None:
+        band_df = band_src.assign(Lo=band_src["P10"] / div, Mid=band_src["P50"] / div, Hi=band_src["P90"] / div)
+        band = alt.Chart(band_df).mark_area(opacity=0.18, color=PRIMARY_BLUE).encode(
+            x="Age:Q", y="Lo:Q", y2="Hi:Q",
+            tooltip=[alt.Tooltip("Age:Q", format=".1f"), alt.Tooltip("P10:Q", title="10th pct (₹)", format=",.0f"),
+                     alt.Tooltip("P90:Q", title="90th pct (₹)", format=",.0f")])
+        median = alt.Chart(band_df).mark_line(strokeDash=[4, 3], color=PRIMARY_BLUE).encode(x="Age:Q", y="Mid:Q")
+        line = band + median + line
     st.altair_chart(line, use_container_width=True)
-    with st.expander("Snapshots (every ~6 months)"):
+    if fan_df is not None:
+        at_target = fan_df.loc[fan_df["Age"] <= target_age, "Chance"]
+        chance = float(at_target.iloc[-1]) if len(at_target) else 0.0
+        st.caption(f"Shaded band: 10th–90th percentile of {fan_paths:,} simulated markets; dashed line: median. "
+                   f"Chance of reaching FI by {target_age}: **{chance:.0%}**.")
+    if not coast_df.empty:
+        st.caption("Dashed green: corpus needed at each age to stop investing and still reach FI by "
+                   f"{target_age}. " + (f"You can stop investing from age **{stop_age:.1f}**." if stop_age is not None
+                                        else "Your corpus stays below it, so keep investing."))
+    if saved_bytes > 0:
+        st.caption(f"Chart simplified to {sent_points:,} of {full_points:,} points "
+                   f"({saved_bytes / 1024:.1f} KB less data sent).")
+    if show_table:
+        st.caption("Snapshots (every ~6 months)")
         st.dataframe(traj_df.round(2), use_container_width=True)
-else:
-    st.info("Adjust inputs on the left to see a trajectory and earliest FI age.")
+
+streamed(fan_future, render_trajectory, "Simulating markets… the range appears when ready.")
+
+# Withdrawal strategies — all strategies share one cached set of simulated return paths
+with st.expander("Withdrawal strategies after FI (Monte Carlo)"):
+    w1, w2, w3 = st.columns(3)
+    with w1:
+        plan_until = st.number_input("Plan until age", min_value=int(min(age_reached, 80)) + 5, max_value=105,
+                                     value=max(90, int(min(age_reached, 80)) + 5), step=1)
+    with w2:
+        vol = st.slider("Yearly volatility (%)", 0.0, 30.0, 12.0, 1.0) / 100.0
+    with w3:
+        n_paths = st.select_slider("Simulated paths", options=[500, 1000, 2000, 5000], value=1000)
+    if st.toggle("Compare strategies", value=False, key="run_strategies"):
+        # Not reached by 80: show what the strategies would do from 80 with the required corpus
+        fi_age = age_reached if reached else 80
+        start_corpus = corpus_when_reached if reached else required_corpus
+        n_plan_months = int(round((plan_until - fi_age) * 12))
+        strategies_future = RUNNER.submit(
+            session_id, "strategies", f"strategies:{result_key}:{plan_until}:{vol}:{n_paths}", strategy_table,
+            swr, post_ret_return, start_corpus, n_paths, n_plan_months, vol, inflation)
+
+        def render_strategies(table) -> None:
+            if table is None:
+                return
+            st.dataframe(table.style.format({
+                "Success rate": "{:.0%}", "Typical worst yearly cut": "{:.0%}",
+                "Median yearly income (today's ₹ at FI)": rupee_indian,
+                "Bad-case (p10) yearly income": rupee_indian, "Median corpus left": rupee_indian,
+            }), use_container_width=True, hide_index=True)
+            st.caption(f"Starting at age {fi_age:.1f} with {rupee_indian(start_corpus)}; year-one withdrawal = SWR × corpus. "
+                       "Success = corpus not exhausted by the end of the plan.")
+
+        streamed(strategies_future, render_strategies, "Running strategies on simulated markets…")
+
+# What changed my FI age — Shapley split of the change since a remembered set of inputs
+core_inputs = dict(variant=VARIANT.name, current_age=current_age, target_age=target_age,
+                   monthly_expense=monthly_expense, current_corpus=current_corpus, monthly_sip=max(0.0, monthly_sip),
+                   inflation=inflation, sip_growth=sip_growth if monthly_sip > 0 else 0.0,
+                   pre_ret_return=pre_ret_return, swr=swr, fire_type=fire_type, lean_mult=lean_mult,
+                   barista_cover=barista_cover, fat_mult=fat_mult)
+# Inputs the attribution engine (fire_kernel.batch) does not model
+unmodelled_key = input_key(income_path=income_path, goals=goals_df,
+                           tax=(tax_version, equity_pct, epf_ppf_pct, gain_pct) if tax_aware else None)
+with st.expander("What changed my FI age?"):
+    baseline = st.session_state.get("fi_baseline")
+    if st.button("Remember these inputs to compare later"):
+        baseline = st.session_state["fi_baseline"] = {"inputs": core_inputs, "unmodelled": unmodelled_key,
+                                                      "age": age_reached}
+    if baseline is None:
+        st.caption("Remember your current inputs, change anything, and come back here to see what moved your FI age.")
+    elif baseline["inputs"] == core_inputs and baseline["unmodelled"] == unmodelled_key:
+        st.caption(f"Nothing has changed since you remembered your inputs (FI age {baseline['age']:.1f}).")
+    else:
+        attribution = shapley(baseline["inputs"], core_inputs)
+        rows = dict(attribution.contributions)
+        # The batch engine leaves out the income path, goals and tax, so its shares need not add
+        # up to the app's change; the rest is shown as such, not credited to any input
+        other = (age_reached - baseline["age"]) - attribution.total
+        if abs(other) > 1e-9:
+            rows["Not modelled by the attribution engine"] = other
+        attr_df = pd.DataFrame({"Input": list(rows), "Years": list(rows.values())})
+        st.markdown(f"Earliest FI age: **{baseline['age']:.1f} → {age_reached:.1f}** "
+                    f"({age_reached - baseline['age']:+.1f} years)")
+        st.altair_chart(alt.Chart(attr_df).mark_bar().encode(
+            x=alt.X("Years:Q", title="Change in FI age (years)"),
+            y=alt.Y("Input:N", sort=None, title=""),
+            color=alt.condition("datum.Years > 0", alt.value(ACCENT_ORANGE), alt.value(PRIMARY_BLUE)),
+            tooltip=["Input", alt.Tooltip("Years:Q", format="+.2f")]).properties(height=32 * len(attr_df) + 30),
+            use_container_width=True)
+        st.caption("Each input's share is averaged over every order the changes could have been made in. "
+                   "Shares are worked out without the income path, goals and tax; whatever they leave of the "
+                   "change is shown as not modelled. Orange delays FI, blue brings it closer.")
+        if baseline["unmodelled"] != unmodelled_key:
+            st.caption("You also changed the income path, goals or tax settings; their effect is in the "
+                       "not-modelled bar.")
+
+# Shareable link: the inputs packed into ?s=..., with this result stored so the link opens instantly
+with st.expander("Share these inputs"):
+    if st.button("Create a link"):
+        complete = goals_df.dropna(subset=["Age", "Amount"])
+        share_code = encode(dict(
+            current_age=current_age, target_age=target_age, monthly_income=monthly_income,
+            monthly_expense=monthly_expense, current_corpus=current_corpus, sip_mode=sip_mode,
+            sip_pct=sip_pct if sip_mode == "% of income" else D["sip_pct"],
+            monthly_sip=monthly_sip if sip_mode == "Fixed amount" else D["monthly_sip"],
+            **{k: adv[k] for k in ("inflation", "income_growth", "pre_ret_return", "post_ret_return", "swr",
+                                   "sip_step", "tax_aware")},
+            sip_custom=D["sip_custom"] if adv["sip_custom"] is None else adv["sip_custom"],
+            **({k: adv[k] for k in ("tax_version", "equity_pct", "epf_ppf_pct", "gain_pct")} if tax_aware else {}),
+            fire_type=fire_type, lean_mult=lean_mult if fire_type == "Lean FIRE" else D["lean_mult"],
+            barista_pct=round(barista_cover * 100) if fire_type == "Barista FIRE" else D["barista_pct"],
+            fat_mult=fat_mult if fire_type == "Fat FIRE" else D["fat_mult"],
+            career_break=career_break,
+            **(dict(break_age=break_age, break_years=break_years, break_pay=break_pay) if career_break else {}),
+            spouse_income=spouse_income,
+            **(dict(spouse_hike=spouse_hike * 100, spouse_retire_age=spouse_retire_age) if spouse_income > 0 else {}),
+            goals=tuple((str(g["Goal"]) if pd.notna(g["Goal"]) else "", int(g["Age"]), float(g["Amount"]),
+                         float(g["Inflation %"]) if pd.notna(g["Inflation %"]) else 6.0,
+                         g["Type"] if g["Type"] in ("Outflow", "Inflow") else "Outflow")
+                        for _, g in complete.iterrows()),
+        ))
+        remember_result(share_code, res_now)
+        st.query_params[PARAM] = share_code
+        base_url = getattr(st.context, "url", "") or ""
+        st.code(f"{base_url.split('?')[0]}?{PARAM}={share_code}", language=None)
+        st.caption("The address bar now holds this link too. Anyone opening it sees these inputs.")
+
+# Printable plan: the PDF is drawn on the report pool and cached by input hash
+with st.expander("Download a PDF report"):
+    if st.toggle("Prepare a PDF report", value=False, key="want_report"):
+        plan = PlanReport(
+            cards=[("Required corpus", money(required_corpus)),
+                   (f"Projected @ {target_age}", money(projected_corpus_at_target)),
+                   ("Earliest FI age", f"{age_reached:.1f} yrs" if reached else "Not by 80")],
+            inputs=[("Current age", str(current_age)), ("Target FI age", str(target_age)),
+                    ("Monthly income", money(monthly_income)), ("Monthly expenses", money(monthly_expense)),
+                    ("Current corpus", money(current_corpus)), ("Monthly SIP", money(max(0.0, monthly_sip))),
+                    ("Return before FI", f"{pre_ret_return:.1%}"), ("Return after FI", f"{post_ret_return:.1%}"),
+                    ("Inflation", f"{inflation:.1%}"), ("SWR", f"{swr:.1%}"), ("FIRE style", fire_type)],
+            ages=traj_df["Age"].to_numpy(), invested=traj_df["Invested Corpus"].to_numpy(),
+            required=traj_df["Required Corpus"].to_numpy(), target_age=target_age,
+            notes=[f"Coast-FIRE: with no more investing, FI at age {coast_age:.1f}." if coast_age is not None
+                   else "Coast-FIRE: not achievable by 80 with current corpus.",
+                   "Educational tool, not investment advice."])
+        report_future = REPORTS.submit(session_id, "report", f"report:{result_key}", render_pdf, plan)
+
+        def render_report(pdf) -> None:
+            if pdf is None:
+                return
+            st.download_button("Download PDF", data=pdf.tobytes(), file_name="fire_plan.pdf",
+                               mime="application/pdf", key="report_pdf")
+            st.caption(f"{len(pdf) / 1024:.0f} KB · cards, inputs, trajectory chart and 6-monthly snapshots.")
+
+        streamed(report_future, render_report, "Preparing your report…")
 
 with st.expander("What do these mean?"):
     st.markdown("""
-- **Yearly salary hike**: your typical pay raise each year (used to optionally step-up SIP).
+- **Yearly salary hike**: your typical pay raise each year. With SIP as % of income, your SIP follows your income path (hikes, career breaks, spouse income); otherwise it can optionally step-up the SIP.
 - **SIP step-up**: how much your monthly investing increases every year.
 - **SWR (Safe Withdrawal Rate)**: how much of your corpus you plan to withdraw per year in FI. Lower is safer.
 - **Lean / Barista / Fat FIRE**: minimal lifestyle vs part-time work vs abundant lifestyle targets.
+- **Goals**: lump sums at a given age. Outflows reduce the corpus when they happen, and until then the money for them is added to the required corpus (discounted at the after-FI return).
+- **Withdrawal strategies**: *Fixed SWR* raises the first-year amount with inflation; *Constant percentage* takes the SWR of the current corpus; *VPW* spreads the corpus over the remaining years; *Guyton-Klinger* adds guardrails that cut or raise spending when the withdrawal rate drifts 20% from the start.
+- **Tax on withdrawals**: equity gains above the LTCG exemption and debt gains at your slab; EPF/PPF is tax-free. Slabs are not inflation-indexed, so tax grows as expenses inflate.
     """)
+
+# Per-session memory accounting (shown on the "Session memory" page)
+if ctx is not None:
+    LEDGER.record(session_id, deep_sizeof(st.session_state.to_dict()), result_key)
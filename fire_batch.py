@@ -0,0 +1,250 @@
+"""Command-line batch runner: FI projections for a file of scenarios, without Streamlit.
+
+Scenarios are rows with any of the ``fire_golden.INPUTS`` columns (rates as
+fractions, like the app uses); missing columns take the app defaults
+(``fire_engine.SCENARIO_DEFAULTS``) and any other column (a client id, say) is
+passed through to the output. The header is checked before any work starts: a
+file with no input column at all, or a column that looks like a misspelt
+input (``inflaton``), stops the run with a clear error. Input is
+read in chunks and each chunk is written as soon as it is done, so memory
+stays flat however large the file is::
+
+    python fire_batch.py clients.csv results.csv --workers 4
+    python fire_batch.py clients.parquet results.jsonl --chunk 5000
+    python fire_batch.py clients.csv results.csv --resume      # after a crash
+
+After every chunk the runner writes ``<output>.ckpt`` with the number of
+chunks done and the output size at that point. ``--resume`` truncates the
+output back to that size and skips the chunks already done. Parquet files
+need ``pyarrow``; a Parquet output is a directory of part files.
+"""
+import argparse
+import difflib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fire_engine import SCENARIO_DEFAULTS as DEFAULTS
+from fire_golden import INPUTS, OUTPUTS, load_engine
+
+INT_INPUTS = ("current_age", "target_age")
+STR_INPUTS = ("variant", "fire_type")
+
+# -----------------------------
+# Input
+# -----------------------------
+
+def _format(path: str) -> str:
+    ext = os.path.splitext(path.rstrip("/"))[1].lower()
+    formats = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet", ".pq": "parquet"}
+    if ext not in formats:
+        raise SystemExit(f"{path}: unsupported format {ext!r} (use .csv, .jsonl or .parquet)")
+    return formats[ext]
+
+def read_chunks(path: str, chunk: int) -> Iterator[pd.DataFrame]:
+    fmt = _format(path)
+    if fmt == "csv":
+        yield from pd.read_csv(path, chunksize=chunk)
+    elif fmt == "jsonl":
+        yield from pd.read_json(path, lines=True, chunksize=chunk)
+    else:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet input needs pyarrow: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk):
+            yield batch.to_pandas()
+
+def read_columns(path: str) -> List[str]:
+    """Column names of the input file, without reading its rows."""
+    fmt = _format(path)
+    if fmt == "csv":
+        return list(pd.read_csv(path, nrows=0).columns)
+    if fmt == "jsonl":
+        with open(path) as f:
+            first = f.readline()
+        return list(json.loads(first)) if first.strip() else []
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet input needs pyarrow: pip install pyarrow")
+    return list(pq.ParquetFile(path).schema_arrow.names)
+
+def check_columns(columns: List[str], path: str = "input") -> List[str]:
+    """Fail on headers that cannot be what the user meant; returns the inputs that take defaults."""
+    for c in columns:
+        close = difflib.get_close_matches(str(c), INPUTS, n=1, cutoff=0.8)
+        if c not in INPUTS and close and close[0] not in columns:
+            raise SystemExit(f"{path}: unknown column {c!r} (did you mean {close[0]!r}?)")
+    if columns and not any(c in INPUTS for c in columns):
+        raise SystemExit(f"{path}: none of the columns {columns} is an input; expected some of {', '.join(INPUTS)}")
+    return [k for k in INPUTS if k not in columns]
+
+def to_cases(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Engine input arrays for a chunk, defaults filled in."""
+    cases = {}
+    for k in INPUTS:
+        col = df[k] if k in df else pd.Series(DEFAULTS[k], index=df.index)
+        col = col.fillna(DEFAULTS[k])
+        if k in INT_INPUTS:
+            cases[k] = col.to_numpy(dtype=np.int64)
+        elif k in STR_INPUTS:
+            cases[k] = col.astype(str).to_numpy()
+        else:
+            cases[k] = col.to_numpy(dtype=float)
+    return cases
+
+
+# -----------------------------
+# Engine (runs in worker processes)
+# -----------------------------
+
+def run_chunk(spec: str, df: pd.DataFrame):
+    t0 = time.perf_counter()
+    out = load_engine(spec)(to_cases(df))
+    result = df.reset_index(drop=True).copy()
+    for k in OUTPUTS:
+        result[k] = np.asarray(out[k])
+    return result, time.perf_counter() - t0
+
+
+# -----------------------------
+# Output + checkpoints
+# -----------------------------
+
+class Writer:
+    """Appends result chunks to CSV/JSONL, or part files for Parquet; ``size`` is the resume point."""
+
+    def __init__(self, path: str, resume_size: Optional[int] = None):
+        self.path, self.fmt = path, _format(path)
+        if self.fmt == "parquet":
+            os.makedirs(path, exist_ok=True)
+            if resume_size is None:
+                for name in os.listdir(path):
+                    if name.startswith("part-"):
+                        os.remove(os.path.join(path, name))
+            else:
+                for name in os.listdir(path):
+                    if name.startswith("part-") and int(name[5:10]) >= resume_size:
+                        os.remove(os.path.join(path, name))      # written after the last checkpoint
+            self.size = resume_size or 0
+            return
+        if resume_size is None:
+            open(path, "w").close()
+        else:
+            with open(path, "r+b") as f:
+                f.truncate(resume_size)                            # drop a half-written chunk
+        self.size = resume_size or 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.fmt == "parquet":
+            df.to_parquet(os.path.join(self.path, f"part-{self.size:05d}.parquet"), index=False)
+            self.size += 1
+            return
+        with open(self.path, "a", newline="") as f:
+            if self.fmt == "csv":
+                df.to_csv(f, index=False, header=self.size == 0)
+            else:
+                df.to_json(f, orient="records", lines=True)
+            f.flush()
+            os.fsync(f.fileno())
+            self.size = f.tell()
+
+def save_checkpoint(path: str, state: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+
+def run(src: str, out: str, engine: str = "fire_golden:reference_batch", workers: int = 1,
+        chunk: int = 2000, resume: bool = False, log=sys.stderr) -> dict:
+    defaulted = check_columns(read_columns(src), src)
+    if defaulted:
+        print(f"using defaults for {', '.join(defaulted)}", file=log)
+    ckpt_path = out.rstrip("/") + ".ckpt"
+    state = {"input": os.path.abspath(src), "engine": engine, "chunk": chunk, "chunks_done": 0, "rows_done": 0}
+    if resume and os.path.exists(ckpt_path):
+        with open(ckpt_path) as f:
+            saved = json.load(f)
+        for k in ("input", "engine", "chunk"):
+            if saved[k] != state[k]:
+                raise SystemExit(f"checkpoint was written with {k}={saved[k]!r}, not {state[k]!r}")
+        state = saved
+        writer = Writer(out, resume_size=state["out_size"])
+        print(f"resuming after {state['rows_done']:,} rows ({state['chunks_done']} chunks)", file=log)
+    elif os.path.exists(ckpt_path) and not resume:
+        raise SystemExit(f"{ckpt_path} exists: pass --resume to continue that run, or delete it to start over")
+    else:
+        writer = Writer(out)
+
+    chunks = read_chunks(src, chunk)
+    for _ in range(state["chunks_done"]):
+        next(chunks, None)
+
+    t0 = time.perf_counter()
+    rows = engine_s = 0.0
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        pending = []
+
+        def finish(future_or_result):
+            nonlocal rows, engine_s
+            df, secs = future_or_result.result() if pool is not None else future_or_result
+            writer.write(df)
+            rows += len(df)
+            engine_s += secs
+            state.update(chunks_done=state["chunks_done"] + 1, rows_done=state["rows_done"] + len(df),
+                         out_size=writer.size)
+            save_checkpoint(ckpt_path, state)
+
+        for df in chunks:
+            if pool is None:
+                finish(run_chunk(engine, df))
+                continue
+            pending.append(pool.submit(run_chunk, engine, df))
+            while len(pending) >= 2 * workers:             # bounded in flight; written in input order
+                finish(pending.pop(0))
+        for future in pending:
+            finish(future)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    wall = time.perf_counter() - t0
+    os.remove(ckpt_path)
+    return {"rows": int(rows), "rows_total": state["rows_done"], "chunks": state["chunks_done"],
+            "wall_s": round(wall, 2), "rows_per_s": round(rows / wall, 1) if wall else 0.0,
+            "engine_s": round(engine_s, 2), "workers": workers,
+            "worker_utilisation": round(engine_s / (wall * workers), 2) if wall else 0.0}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="scenarios (.csv, .jsonl or .parquet)")
+    parser.add_argument("output", help="results (.csv, .jsonl or .parquet)")
+    parser.add_argument("--engine", default="fire_golden:reference_batch", help="batch engine module:function")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=2000, help="rows per chunk")
+    parser.add_argument("--resume", action="store_true", help="continue from <output>.ckpt")
+    args = parser.parse_args(argv)
+
+    stats = run(args.input, args.output, args.engine, args.workers, args.chunk, args.resume)
+    print(json.dumps(stats, indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
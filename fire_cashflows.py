@@ -0,0 +1,85 @@
+"""Dated lump-sum cash flows (goals and windfalls) on the monthly projection axis.
+
+Events are kept as a sparse, month-sorted set of arrays. Merging them into a
+projection is a single ``np.add.at`` scatter (O(events)), and the corpus that
+must still be held back for future goals is one reverse cumulative sum.
+"""
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Events
+# -----------------------------
+
+@dataclass(frozen=True)
+class CashFlowEvent:
+    """One lump sum at a given age, in today's ₹, growing at its own inflation rate.
+
+    ``amount`` > 0 is an inflow (bonus, inheritance, property sale);
+    ``amount`` < 0 is an outflow (education, home down-payment, wedding).
+    """
+    name: str
+    age: float
+    amount: float
+    inflation: float = 0.06
+
+
+class CashFlowSchedule:
+    """Month-sorted, array-backed view of a list of events for one person."""
+
+    def __init__(self, events: Iterable[CashFlowEvent], current_age: float):
+        events = [e for e in events if e.amount != 0 and e.age >= current_age]
+        months = np.array([int(round((e.age - current_age) * 12)) for e in events], dtype=np.int64)
+        order = np.argsort(months, kind="stable")
+        self.names: List[str] = [events[i].name for i in order]
+        self.months = months[order]
+        self.amounts = np.array([e.amount for e in events], dtype=float)[order]
+        self.inflation = np.array([e.inflation for e in events], dtype=float)[order]
+        self.current_age = current_age
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+    @property
+    def nominal(self) -> np.ndarray:
+        """Each event's amount in rupees of the month it happens."""
+        return self.amounts * (1 + self.inflation) ** (self.months / 12)
+
+    def to_month_array(self, n_months: int) -> np.ndarray:
+        """Net nominal flow landing at each month index 0..n_months-1 (scatter-add)."""
+        out = np.zeros(n_months, dtype=float)
+        keep = self.months < n_months
+        np.add.at(out, self.months[keep], self.nominal[keep])
+        return out
+
+    def reserve_array(self, n_months: int, post_ret_annual_return: float) -> np.ndarray:
+        """Corpus needed at each month to fund all *later* outflows.
+
+        Outflows strictly after month ``m`` are discounted back to ``m`` at the
+        post-FI return, so reaching FI at ``m`` still leaves the goals funded.
+        Inflows are not counted on (they only help once they arrive).
+        """
+        out = np.zeros(n_months, dtype=float)
+        keep = (self.months < n_months) & (self.amounts < 0)
+        np.add.at(out, self.months[keep], -self.nominal[keep])
+        disc = (1 + post_ret_annual_return) ** (-np.arange(n_months) / 12)
+        # suffix sum of discounted outflows; month m only sees k > m (k == m is already paid)
+        suffix = np.cumsum((out * disc)[::-1])[::-1]
+        return np.append(suffix[1:], 0.0) / disc
+
+
+def schedule_from_frame(df: Optional[pd.DataFrame], current_age: float) -> CashFlowSchedule:
+    """Build a schedule from the sidebar goals table (Goal, Age, Amount, Inflation %, Type)."""
+    events = []
+    if df is not None and not df.empty:
+        df = df.dropna(subset=["Age", "Amount"])
+        for goal, age, amount, infl, kind in zip(df["Goal"], df["Age"], df["Amount"],
+                                                 df["Inflation %"], df["Type"]):
+            sign = 1.0 if kind == "Inflow" else -1.0
+            infl = 6.0 if pd.isna(infl) else float(infl)
+            events.append(CashFlowEvent(name="" if pd.isna(goal) else str(goal), age=float(age),
+                                        amount=sign * abs(float(amount)), inflation=infl / 100.0))
+    return CashFlowSchedule(events, current_age)
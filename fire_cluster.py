@@ -0,0 +1,182 @@
+"""Multi-worker deployment: N ``streamlit run`` workers behind a sticky local proxy.
+
+One Streamlit process runs every session's script on one interpreter, so the
+GIL serialises all engine work. This launcher starts ``FIRE_WORKERS`` workers on
+``127.0.0.1:FIRE_WORKER_BASE_PORT+i`` and a small asyncio proxy on ``PORT``.
+The proxy pins each client connection to one worker: the ``fire_worker``
+cookie if present, otherwise the live worker with the fewest open connections
+(round-robin between ties; behind a platform proxy every client shares one
+address, so the address says nothing about load), and it sets the
+cookie on the first response so the browser's websocket (``/_stcore/stream``)
+reaches the worker that served the page. Bytes are piped as-is after the first
+request head, so websocket upgrades and keep-alive need no special handling.
+Workers share results through ``FIRE_CACHE_DB`` (SQLite, WAL mode) and are
+restarted if they exit.
+
+Environment (all optional, render.yaml ``envVars`` style):
+``PORT`` (8501), ``FIRE_WORKERS`` (2), ``FIRE_WORKER_BASE_PORT`` (8600),
+``FIRE_APP`` (fire_app.py), ``FIRE_CACHE_DB`` (/tmp/fire_results.sqlite).
+"""
+import asyncio
+import itertools
+import logging
+import os
+import re
+import signal
+import subprocess
+import sys
+from typing import List, Optional, Tuple
+
+log = logging.getLogger("fire.cluster")
+
+COOKIE = "fire_worker"
+HEAD_LIMIT = 64 * 1024
+_COOKIE_RE = re.compile(rb"^cookie:.*?\b" + COOKIE.encode() + rb"=(\d+)", re.I | re.M)
+
+# -----------------------------
+# Workers
+# -----------------------------
+
+class Worker:
+    def __init__(self, index: int, port: int, app: str, env: dict):
+        self.index, self.port, self.app, self.env = index, port, app, env
+        self.proc: Optional[subprocess.Popen] = None
+        self.restarts = 0
+        self.connections = 0        # open client connections (each session holds a websocket)
+
+    def start(self) -> None:
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", self.app, f"--server.port={self.port}",
+             "--server.address=127.0.0.1", "--server.headless=true"],
+            env=dict(self.env, FIRE_WORKER_ID=str(self.index)))
+        log.info("worker %d started on port %d (pid %d)", self.index, self.port, self.proc.pid)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def stop(self) -> None:
+        if self.alive:
+            self.proc.terminate()
+
+
+_next_worker = itertools.count()
+
+def pick_worker(head: bytes, workers: List[Worker]) -> Tuple[int, bool]:
+    """Worker index for a new connection, and whether the sticky cookie must be set.
+
+    Without a (live) cookie: the least-loaded live worker, round-robin between ties.
+    """
+    m = _COOKIE_RE.search(head)
+    if m and int(m.group(1)) < len(workers) and workers[int(m.group(1))].alive:
+        return int(m.group(1)), False
+    alive = [w for w in workers if w.alive] or list(workers)
+    start = next(_next_worker)
+    order = alive[start % len(alive):] + alive[:start % len(alive)]
+    return min(order, key=lambda w: w.connections).index, True
+
+
+# -----------------------------
+# Proxy
+# -----------------------------
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        try:
+            writer.close()
+        except RuntimeError:
+            pass
+
+async def _relay_response(up_reader, writer, cookie: Optional[bytes]) -> None:
+    """Copy upstream → client, adding ``cookie`` to the first response head."""
+    if cookie is not None:
+        try:
+            head = await up_reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        writer.write(head[:-2] + cookie + b"\r\n")
+    await _pipe(up_reader, writer)
+
+def make_handler(workers: List[Worker]):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        index, needs_cookie = pick_worker(head, workers)
+        for attempt in range(len(workers)):
+            worker = workers[(index + attempt) % len(workers)]
+            try:
+                up_reader, up_writer = await asyncio.open_connection("127.0.0.1", worker.port, limit=HEAD_LIMIT)
+                break
+            except OSError:
+                needs_cookie = True
+        else:
+            writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            writer.close()
+            return
+        cookie = (f"Set-Cookie: {COOKIE}={worker.index}; Path=/; HttpOnly; SameSite=Lax\r\n".encode()
+                  if needs_cookie else None)
+        up_writer.write(head)
+        worker.connections += 1
+        try:
+            await asyncio.gather(_pipe(reader, up_writer), _relay_response(up_reader, writer, cookie))
+        finally:
+            worker.connections -= 1
+    return handle
+
+
+async def supervise(workers: List[Worker], every: float = 2.0) -> None:
+    while True:
+        await asyncio.sleep(every)
+        for w in workers:
+            if not w.alive:
+                w.restarts += 1
+                log.warning("worker %d exited (code %s); restarting", w.index, w.proc.returncode)
+                w.start()
+
+async def serve(port: int, workers: List[Worker]) -> None:
+    server = await asyncio.start_server(make_handler(workers), "0.0.0.0", port, limit=HEAD_LIMIT)
+    log.info("proxy on :%d -> %d workers", port, len(workers))
+    async with server:
+        await asyncio.gather(server.serve_forever(), supervise(workers))
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    port = int(os.environ.get("PORT", "8501"))
+    n = max(1, int(os.environ.get("FIRE_WORKERS", "2")))
+    base = int(os.environ.get("FIRE_WORKER_BASE_PORT", "8600"))
+    app = os.environ.get("FIRE_APP", "fire_app.py")
+    env = dict(os.environ, FIRE_CACHE_DB=os.environ.get("FIRE_CACHE_DB", "/tmp/fire_results.sqlite"))
+    workers = [Worker(i, base + i, app, env) for i in range(n)]
+    for w in workers:
+        w.start()
+
+    def stop(*_):
+        for w in workers:
+            w.stop()
+        sys.exit(0)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        asyncio.run(serve(port, workers))
+    finally:
+        for w in workers:
+            w.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""Engine call counters.
+
+A standalone module so the engine can count its own calls without depending
+on the result cache (``fire_results``) or anything above it.
+"""
+from collections import Counter
+from functools import wraps
+from typing import Callable
+
+ENGINE_CALLS: "Counter[str]" = Counter()
+
+
+def counted(name: str) -> Callable:
+    """Count calls of an engine function in ``ENGINE_CALLS[name]``.
+
+    Display-only controls must leave these counts unchanged.
+    """
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            ENGINE_CALLS[name] += 1
+            return fn(*args, **kwargs)
+        return wrapper
+    return deco
@@ -0,0 +1,49 @@
+"""Coalescing for bursts of widget changes (slider drags, arrow-key nudges).
+
+The Advanced sliders live in a fragment, so each tick only reruns that small
+fragment. A tick waits ``quiet`` seconds and then touches the page; if a newer
+tick arrived meanwhile, Streamlit stops the stale run at that point, so only
+the last value in a burst is ever applied and sent through the engine.
+"""
+import logging
+import time
+from typing import Callable, Optional
+
+log = logging.getLogger("fire.debounce")
+
+
+class Debouncer:
+    """Per-session applied values plus counters for the reruns a burst saved."""
+
+    def __init__(self, quiet: float = 0.35):
+        self.quiet = quiet
+        self.applied: Optional[dict] = None
+        self.ticks = 0        # changes seen since the last apply
+        self.applies = 0
+        self.avoided = 0      # full reruns skipped because a burst was coalesced
+
+    def pending(self, values: dict) -> bool:
+        return self.applied is not None and values != self.applied
+
+    def apply(self, values: dict) -> None:
+        """Make ``values`` the ones the engine sees and log what the burst saved."""
+        if self.ticks > 1:
+            self.avoided += self.ticks - 1
+            log.info("applied after %d changes (%d reruns avoided, %d this session)",
+                     self.ticks, self.ticks - 1, self.avoided)
+        self.applied = dict(values)
+        self.ticks = 0
+        self.applies += 1
+
+    def settle(self, values: dict, yield_point: Callable[[], None]) -> bool:
+        """Wait out the quiet period for a changed ``values``; True once they should be applied.
+
+        ``yield_point`` must call into Streamlit: that is where a run made stale
+        by a newer change is stopped, so this only returns for the latest one.
+        """
+        if not self.pending(values):
+            return False
+        self.ticks += 1
+        time.sleep(self.quiet)
+        yield_point()
+        return True
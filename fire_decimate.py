@@ -0,0 +1,97 @@
+"""Level-of-detail for long trajectories before they are sent to the browser.
+
+Altair inlines the chart data into the Vega-Lite spec on every rerun, so each
+point costs JSON bytes. ``decimate_for_chart`` keeps at most a few hundred
+points per series using Largest-Triangle-Three-Buckets, and always keeps the
+rows on both sides of every crossing between two series so the crossing is
+drawn where it really happens. ``decimate_frame`` does the same for wide
+frames such as the Monte Carlo band (P10/P50/P90 must stay on shared rows) and
+the monthly coast frontier.
+
+The budget is about one point per ``PX_PER_POINT`` pixels of chart width.
+Streamlit does not report the browser width to the script, so the width comes
+from the layout the user picked: ``CHART_WIDTH_PX`` holds the typical plotted
+width of the compact (phone) and full chart.
+"""
+import json
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the points LTTB keeps (first and last are always kept)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        nlo, nhi = hi, min(int((i + 2) * every) + 1, n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def crossing_indices(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Rows on both sides of every sign change of ``a - b``."""
+    diff = np.sign(np.asarray(a, dtype=float) - np.asarray(b, dtype=float))
+    change = np.flatnonzero(diff[1:] != diff[:-1])
+    return np.unique(np.concatenate([change, change + 1]))
+
+
+CHART_WIDTH_PX = {True: 360, False: 1000}     # compact (phone) / full layout
+PX_PER_POINT = 6
+MIN_POINTS = 30
+
+
+def chart_width_px(compact: bool) -> int:
+    return CHART_WIDTH_PX[bool(compact)]
+
+
+def max_points_for(compact: bool, width_px: Optional[int] = None) -> int:
+    """Point budget per series: one point per ``PX_PER_POINT`` px of ``width_px`` (default: the layout's width)."""
+    return max(MIN_POINTS, (width_px or chart_width_px(compact)) // PX_PER_POINT)
+
+
+def decimate_for_chart(df: pd.DataFrame, max_points: int,
+                       series: Sequence[str] = ("Invested Corpus", "Required Corpus"),
+                       x: str = "Age") -> pd.DataFrame:
+    """Long-form (x, Series, Amount) chart data with at most ~``max_points`` points per series.
+
+    Each series is reduced independently with LTTB; rows either side of a crossing
+    between the first two series are added back to both.
+    """
+    xs = df[x].to_numpy(dtype=float)
+    crossings = np.empty(0, dtype=np.int64)
+    if len(series) >= 2:
+        crossings = crossing_indices(df[series[0]].to_numpy(), df[series[1]].to_numpy())
+    parts = []
+    for name in series:
+        ys = df[name].to_numpy(dtype=float)
+        rows = np.unique(np.concatenate([lttb_indices(xs, ys, max_points), crossings]))
+        parts.append(pd.DataFrame({x: xs[rows], "Series": name, "Amount": ys[rows]}))
+    return pd.concat(parts, ignore_index=True)
+
+
+def decimate_frame(df: pd.DataFrame, max_points: int, columns: Sequence[str], x: str = "Age",
+                   keep: Sequence[int] = ()) -> pd.DataFrame:
+    """At most ~``max_points`` rows of a wide frame: each column's LTTB picks (budget split
+    between the columns) plus the ``keep`` rows, so every column stays on shared rows."""
+    xs = df[x].to_numpy(dtype=float)
+    per_column = max(3, max_points // max(len(columns), 1))
+    picks = [lttb_indices(xs, df[c].to_numpy(dtype=float), per_column) for c in columns]
+    rows = np.unique(np.concatenate(picks + [np.asarray(keep, dtype=np.int64)]))
+    return df.iloc[rows].reset_index(drop=True)
+
+
+def payload_bytes(df: pd.DataFrame) -> int:
+    """Approximate bytes this frame adds to an inline Vega-Lite spec."""
+    return len(json.dumps(df.to_dict(orient="records"), default=float))
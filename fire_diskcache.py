@@ -0,0 +1,238 @@
+"""Persistent, content-addressed cache of analytics results on local disk.
+
+Monte Carlo fans and strategy tables are deterministic once seeded, so they
+are worth keeping across process restarts (and Render sleep/wake). An entry
+is addressed by a hash of the caller's input key and ``ENGINE_VERSION`` (a
+hash of the engine sources), so editing the engine never serves stale
+results. Each entry is a directory of ``.npy`` files, one per array or
+DataFrame column, loaded with ``mmap_mode="r"`` so a warm start maps the
+data instead of reading and copying it.
+
+Entries are written to a temporary directory and renamed into place, so a
+crash mid-write never leaves a half-written entry visible; an entry that
+fails to load anyway is deleted and treated as a miss. When the cache grows
+past ``max_bytes``, the least recently used entries are removed.
+
+Set ``FIRE_DISK_CACHE`` to the cache directory (unset or "" disables it) and
+``FIRE_DISK_CACHE_MB`` to its size limit (default 512).
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger("fire.diskcache")
+
+ENGINE_MODULES = ("fire_engine.py", "fire_montecarlo.py", "fire_quantiles.py", "fire_withdrawal.py",
+                  "fire_cashflows.py", "fire_income.py", "fire_tax.py")
+MANIFEST = "manifest.json"
+
+Cacheable = Union[np.ndarray, pd.DataFrame, Dict[str, np.ndarray]]
+
+
+def engine_version(modules=ENGINE_MODULES) -> str:
+    """Hash of the engine sources: any edit to them invalidates every cached entry."""
+    h = hashlib.blake2b(digest_size=8)
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in modules:
+        try:
+            with open(os.path.join(here, name), "rb") as f:
+                h.update(name.encode() + b"\0" + f.read())
+        except OSError:
+            h.update(name.encode() + b"\0missing")
+    return h.hexdigest()
+
+
+ENGINE_VERSION = engine_version()
+
+
+# -----------------------------
+# Encoding: arrays <-> .npy files
+# -----------------------------
+
+def _columns(value: Cacheable):
+    """``(kind, {name: array})`` for a cacheable value, or ``None`` if it is not cacheable."""
+    if isinstance(value, pd.DataFrame):
+        if not value.columns.map(lambda c: isinstance(c, str)).all():
+            return None
+        cols = {}
+        for c in value.columns:
+            arr = value[c].to_numpy()
+            if arr.dtype == object:
+                if not all(isinstance(x, str) for x in arr):
+                    return None
+                arr = arr.astype(str)
+            cols[c] = arr
+        return "frame", cols
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return "array", {"value": value}
+    if isinstance(value, dict) and all(isinstance(k, str) and isinstance(v, np.ndarray) and v.dtype != object
+                                       for k, v in value.items()):
+        return "arrays", dict(value)
+    return None
+
+def _rebuild(kind: str, arrays: Dict[str, np.ndarray]) -> Cacheable:
+    if kind == "frame":
+        return pd.DataFrame(arrays, copy=False)
+    if kind == "array":
+        return arrays["value"]
+    return arrays
+
+
+# -----------------------------
+# Cache
+# -----------------------------
+
+class DiskCache:
+    """Content-addressed ``key -> arrays`` store under ``root`` with LRU size bound."""
+
+    def __init__(self, root: str, max_bytes: int = 512 * 2**20, version: str = ENGINE_VERSION):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.version = version
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None     # bytes on disk, scanned lazily
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.blake2b(f"{self.version}\0{key}".encode(), digest_size=16).hexdigest()
+        return os.path.join(self.root, digest[:2], digest)
+
+    def get(self, key: str) -> Optional[Cacheable]:
+        path = self._path(key)
+        if not os.path.exists(os.path.join(path, MANIFEST)):     # never stored (or evicted): a plain miss
+            self.misses += 1
+            return None
+        try:
+            with open(os.path.join(path, MANIFEST)) as f:
+                manifest = json.load(f)
+            arrays = {}
+            for i, (name, size) in enumerate(manifest["columns"]):
+                file = os.path.join(path, f"{i}.npy")
+                if os.path.getsize(file) != size:
+                    raise ValueError(f"{file}: size {os.path.getsize(file)} != {size}")
+                arrays[name] = np.load(file, mmap_mode="r", allow_pickle=False)
+            value = _rebuild(manifest["kind"], arrays)
+        except (OSError, ValueError, KeyError, TypeError) as e:     # incl. a column file gone missing
+            log.warning("dropping corrupt cache entry %s: %s", path, e)
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(os.path.join(path, MANIFEST))      # recency for LRU eviction
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Cacheable) -> bool:
+        """Store ``value`` if it is an array, dict of arrays or DataFrame; returns whether it was stored."""
+        encoded = _columns(value)
+        if encoded is None:
+            return False
+        kind, arrays = encoded
+        final = self._path(key)
+        if os.path.exists(os.path.join(final, MANIFEST)):
+            return True
+        if os.path.exists(final):
+            self._remove(final)             # left without its manifest: rewrite it
+        tmp = os.path.join(self.root, f"tmp-{uuid.uuid4().hex}")
+        try:
+            os.makedirs(tmp)
+            columns = []
+            for i, (name, arr) in enumerate(arrays.items()):
+                file = os.path.join(tmp, f"{i}.npy")
+                with open(file, "wb") as f:
+                    np.save(f, np.ascontiguousarray(arr), allow_pickle=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                columns.append((name, os.path.getsize(file)))
+            with open(os.path.join(tmp, MANIFEST), "w") as f:
+                json.dump({"kind": kind, "key": key, "version": self.version, "columns": columns}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            os.rename(tmp, final)           # atomic: readers see the whole entry or nothing
+        except OSError as e:
+            self._remove(tmp)
+            if not os.path.exists(final):
+                log.warning("could not cache %s: %s", key, e)
+                return False
+            return True                     # another worker stored it first
+        size = sum(s for _, s in columns)
+        with self._lock:
+            if self._total is not None:
+                self._total += size
+        self._evict()
+        return True
+
+    def _entries(self):
+        """``(last_used, bytes, path)`` for every complete entry, oldest first."""
+        out = []
+        for shard in os.listdir(self.root):
+            shard_path = os.path.join(self.root, shard)
+            if shard.startswith("tmp-"):
+                # leftovers of a crashed write; younger ones may still be in flight
+                if time.time() - os.path.getmtime(shard_path) > 3600:
+                    self._remove(shard_path)
+                continue
+            if not os.path.isdir(shard_path):
+                continue
+            for name in os.listdir(shard_path):
+                path = os.path.join(shard_path, name)
+                try:
+                    used = os.path.getmtime(os.path.join(path, MANIFEST))
+                    size = sum(e.stat().st_size for e in os.scandir(path))
+                except OSError:
+                    continue
+                out.append((used, size, path))
+        return sorted(out)
+
+    def _evict(self) -> None:
+        with self._lock:
+            if self._total is not None and self._total <= self.max_bytes:
+                return
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                self.evicted += 1
+            self._total = total
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._entries())
+            return self._total
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def from_env() -> Optional[DiskCache]:
+    root = os.environ.get("FIRE_DISK_CACHE", "")
+    if not root:
+        return None
+    try:
+        return DiskCache(root, int(float(os.environ.get("FIRE_DISK_CACHE_MB", "512")) * 2**20))
+    except OSError as e:
+        log.warning("disk cache disabled: %s", e)
+        return None
+
+
+DISK = from_env()
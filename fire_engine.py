@@ -0,0 +1,274 @@
+"""Shared FIRE engine for every app variant.
+
+The four app scripts grew their own copies of ``fv``, ``years_until_fi`` and
+``coast_check`` that differ in small ways. They all call into this module now,
+and each variant's differences are recorded in ``VARIANTS``:
+
+- ``v1`` (``fire_app_eli.py``) reports the FI age in whole years
+  (``current_age + months // 12``) and keeps simulating until that whole-year
+  age passes ``max_age``; it steps the SIP up every year even when it is not
+  positive (a negative SIP, i.e. a monthly withdrawal, grows too).
+- ``v3``, ``v3_1`` and ``v3_2`` report fractional ages, stop once
+  ``current_age + months / 12`` passes ``max_age`` and only step up a positive
+  SIP. ``v3_2`` adds lump-sum flows, a goal reserve and a precomputed
+  SIP schedule.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fire_counters import counted
+
+# -----------------------------
+# Variant registry
+# -----------------------------
+
+@dataclass(frozen=True)
+class Variant:
+    name: str
+    script: str                     # layout script that renders this variant
+    title: str
+    fractional_age: bool = True     # False: FI age and loop bound in whole years (v1)
+    step_up_zero_sip: bool = False  # True: multiply the SIP each year even when it is <= 0 (v1)
+
+
+VARIANTS: Dict[str, Variant] = {
+    "v1": Variant("v1", "fire_app_eli.py", "Classic (two-column, whole-year FI age)",
+                  fractional_age=False, step_up_zero_sip=True),
+    "v3": Variant("v3", "fire_app_eli_v3.py", "Logo header, simplified inputs"),
+    "v3_1": Variant("v3_1", "fire_app_eli_v3_1.py", "Cards layout"),
+    "v3_2": Variant("v3_2", "fire_app_eli_v3_2.py", "Cards layout with goals, tax and analytics"),
+}
+DEFAULT_VARIANT = "v3_2"     # engine default for callers that pass no variant
+# What fire_app.py serves when FIRE_APP_VARIANT is unset: the deploy ran v1 before the
+# scripts shared one engine, and switching it would change existing users' FI ages
+DEPLOY_VARIANT = "v1"
+
+# The app's default scenario in engine terms (rates as fractions); batch runs fill
+# missing inputs from it and the fuzzer shrinks failing cases towards it
+SCENARIO_DEFAULTS = {"variant": DEFAULT_VARIANT, "current_age": 30, "target_age": 45, "monthly_expense": 80000.0,
+                     "current_corpus": 1000000.0, "monthly_sip": 30000.0, "inflation": 0.06, "sip_growth": 0.08,
+                     "pre_ret_return": 0.11, "swr": 0.04, "fire_type": "Barista FIRE", "lean_mult": 0.8,
+                     "barista_cover": 0.4, "fat_mult": 1.5}
+
+
+def get_variant(name: Optional[str] = None) -> Variant:
+    """Registry lookup; ``None`` or "" gives the deployed variant (``DEPLOY_VARIANT``)."""
+    name = name or DEPLOY_VARIANT
+    if name not in VARIANTS:
+        raise ValueError(f"Unknown app variant {name!r}; choose from {', '.join(VARIANTS)}")
+    return VARIANTS[name]
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+
+def rupee_indian(x: float) -> str:
+    """Format number with Indian grouping and ₹ symbol."""
+    if pd.isna(x): return "₹0"
+    x_int = int(round(x))
+    s = str(x_int)
+    if len(s) <= 3:
+        out = s
+    else:
+        last3 = s[-3:]
+        other = s[:-3]
+        groups = []
+        while len(other) > 2:
+            groups.insert(0, other[-2:])
+            other = other[:-2]
+        if other:
+            groups.insert(0, other)
+        out = ",".join(groups + [last3])
+    return f"₹{out}"
+
+def fv(rate: float, nper: int, pmt: float, pv: float, when: str = "end") -> float:
+    """Future value with periodic compounding."""
+    when_val = 1 if when == "begin" else 0
+    if rate == 0: return pv + pmt * nper
+    return pv * (1 + rate) ** nper + pmt * (1 + rate * when_val) * (((1 + rate) ** nper - 1) / rate)
+
+def best_unit(amounts: pd.Series):
+    """Choose axis unit (₹ L or ₹ Cr) and the scale divisor."""
+    maxv = float(np.nanmax(amounts)) if len(amounts) else 0.0
+    if maxv >= 1e7:     # >= 1 Crore
+        return "₹ Cr", 1e7
+    elif maxv >= 1e5:   # >= 1 Lakh
+        return "₹ L", 1e5
+    else:
+        return "₹", 1.0
+
+def deflator(inflation: float, n_months: int) -> np.ndarray:
+    """Today's-₹ factor for months 0..n_months-1 (all ones when ``inflation`` is 0)."""
+    return (1 + inflation) ** (-np.arange(n_months) / 12)
+
+def deflate(df: pd.DataFrame, factors: np.ndarray, current_age: float, columns) -> pd.DataFrame:
+    """``df`` with ``columns`` scaled by ``factors`` at each row's ``Age`` (nominal → today's ₹)."""
+    months = np.clip(np.rint((df["Age"].to_numpy(dtype=float) - current_age) * 12).astype(int), 0, len(factors) - 1)
+    f = factors[months]
+    return df.assign(**{c: df[c].to_numpy() * f for c in columns})
+
+def _age(current_age: int, months: int, variant: Variant) -> float:
+    return current_age + (months / 12 if variant.fractional_age else months // 12)
+
+
+# -----------------------------
+# Engine
+# -----------------------------
+
+def project_corpus(current_corpus: float, pre_ret_annual_return: float, n_months: int,
+                   monthly_sip: float = 0.0, sip_growth: float = 0.0,
+                   sip_schedule: np.ndarray = None, flows: np.ndarray = None) -> float:
+    """Corpus after ``n_months`` of end-of-month SIPs, stepped up every 12 months.
+
+    ``sip_schedule`` (from ``fire_income``) replaces ``monthly_sip``/``sip_growth``;
+    ``flows[m]`` lands at month ``m``.
+    """
+    monthly_rate = (1 + pre_ret_annual_return) ** (1/12) - 1
+    corpus = float(current_corpus) + (flows[0] if flows is not None else 0.0)
+    sip = monthly_sip
+    for m in range(max(0, n_months)):
+        corpus = fv(monthly_rate, 1, sip if sip_schedule is None else sip_schedule[m], corpus, when="end")
+        if flows is not None:
+            corpus += flows[m+1]
+        if (m+1) % 12 == 0:
+            sip *= (1 + sip_growth)
+    return corpus
+
+@dataclass
+class FISearch:
+    """Outcome of the month-by-month FI search."""
+    reached: bool
+    months: int                 # FI month, or the month the search stopped at
+    age: float                  # FI age as the variant reports it (``max_age`` if not reached)
+    corpus: float               # corpus at FI, or after the last simulated month
+    traj_df: pd.DataFrame
+
+
+def _fi_search(
+    current_age: int,
+    current_corpus: float,
+    monthly_sip: float,
+    pre_ret_annual_return: float,
+    sip_growth: float,
+    target_corpus_func: Callable[[float, float], float],
+    inflation: float,
+    base_monthly_expense: float,
+    max_age: int = 80,
+    flows: np.ndarray = None,
+    reserve: np.ndarray = None,
+    sip_schedule: np.ndarray = None,
+    variant: Variant = VARIANTS[DEFAULT_VARIANT],
+) -> FISearch:
+    """The FI search behind ``years_until_fi`` and ``fi_search``.
+
+    ``flows`` (lump sums landing in each month) and ``reserve`` (corpus held back for
+    later goals) come from ``fire_cashflows.CashFlowSchedule`` and are indexed by month.
+    ``sip_schedule`` (from ``fire_income``) replaces ``monthly_sip``/``sip_growth`` when given.
+    """
+    records = []
+    corpus = current_corpus
+    months = 0
+    monthly_rate = (1 + pre_ret_annual_return) ** (1/12) - 1
+
+    while _age(current_age, months, variant) <= max_age:
+        yrs = months/12
+        if flows is not None:
+            corpus += flows[months]
+        f_m_exp = base_monthly_expense * ((1 + inflation) ** yrs)
+        f_a_exp = f_m_exp * 12
+        req = target_corpus_func(yrs, f_a_exp)
+        if reserve is not None:
+            req += reserve[months]
+
+        if corpus >= req:
+            records.append({"Age": current_age + months/12, "Invested Corpus": corpus, "Required Corpus": req})
+            return FISearch(True, months, _age(current_age, months, variant), corpus, pd.DataFrame(records))
+
+        sip = monthly_sip if sip_schedule is None else sip_schedule[months]
+        corpus = fv(monthly_rate, 1, sip, corpus, when="end")
+        months += 1
+        if months % 12 == 0 and (monthly_sip > 0 or variant.step_up_zero_sip):
+            monthly_sip *= (1 + sip_growth)
+        if months % 6 == 0:
+            records.append({"Age": current_age + months/12, "Invested Corpus": corpus, "Required Corpus": req})
+
+    return FISearch(False, months, max_age, corpus, pd.DataFrame(records))
+
+@counted("years_until_fi")
+def years_until_fi(
+    current_age: int,
+    current_corpus: float,
+    monthly_sip: float,
+    pre_ret_annual_return: float,
+    sip_growth: float,
+    target_corpus_func: Callable[[float, float], float],
+    inflation: float,
+    base_monthly_expense: float,
+    max_age: int = 80,
+    flows: np.ndarray = None,
+    reserve: np.ndarray = None,
+    sip_schedule: np.ndarray = None,
+    variant: Variant = VARIANTS[DEFAULT_VARIANT],
+) -> Tuple[float, float, pd.DataFrame]:
+    """Simulate month-by-month until corpus >= target corpus. Returns (age_reached, corpus, df).
+
+    A plan that never gets there reports ``max_age`` and the corpus after the last
+    month; use ``fi_search`` when the caller needs to tell the two apart.
+    """
+    found = _fi_search(current_age, current_corpus, monthly_sip, pre_ret_annual_return, sip_growth,
+                       target_corpus_func, inflation, base_monthly_expense, max_age, flows, reserve,
+                       sip_schedule, variant)
+    return found.age, found.corpus, found.traj_df
+
+@counted("years_until_fi")          # the same search: one counter for both entry points
+def fi_search(*args, **kwargs) -> FISearch:
+    """``years_until_fi`` with an explicit ``reached`` flag (same arguments)."""
+    return _fi_search(*args, **kwargs)
+
+@counted("coast_check")
+def coast_check(
+    current_corpus: float,
+    pre_ret_annual_return: float,
+    current_age: int,
+    target_corpus_func: Callable[[float, float], float],
+    inflation: float,
+    base_monthly_expense: float,
+    max_age: int = 80,
+    flows: np.ndarray = None,
+    reserve: np.ndarray = None,
+) -> Tuple[Optional[float], float]:
+    """Coast-FIRE: first age at which the corpus, with no more contributions, covers the target."""
+    corpus = current_corpus
+    months = 0
+    monthly_rate = (1 + pre_ret_annual_return) ** (1/12) - 1
+    while current_age + months/12 <= max_age:
+        yrs = months/12
+        if flows is not None:
+            corpus += flows[months]
+        f_m_exp = base_monthly_expense * ((1 + inflation) ** yrs)
+        f_a_exp = f_m_exp * 12
+        req = target_corpus_func(yrs, f_a_exp)
+        if reserve is not None:
+            req += reserve[months]
+        if corpus >= req:
+            return current_age + months/12, corpus
+        corpus = fv(monthly_rate, 1, 0.0, corpus, when="end")
+        months += 1
+    return None, corpus
+
+def target_corpus(fire_type: str, swr: float, lean_mult: float = 1.0, barista_cover: float = 0.0,
+                  fat_mult: float = 1.0, gross_up: Callable[[float], float] = None) -> Callable[[float, float], float]:
+    """``target_corpus_func(years_from_now, future_annual_exp)`` for a FIRE style."""
+    def target_corpus_func(years_from_now: float, future_annual_exp: float) -> float:
+        if fire_type == "Lean FIRE":
+            expense = future_annual_exp * lean_mult
+        elif fire_type == "Barista FIRE":
+            expense = future_annual_exp * (1 - barista_cover)
+        else:
+            expense = future_annual_exp * fat_mult
+        return (expense if gross_up is None else gross_up(expense)) / swr
+    return target_corpus_func
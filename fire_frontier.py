@@ -0,0 +1,95 @@
+"""Coast-FIRE frontier: when can I stop investing and still reach FI by my target age?
+
+``coast_check`` answers this for today only. Running it from every month of
+the trajectory costs O(months²); the geometric growth makes that unnecessary.
+Discount every amount at month ``m`` by ``g**-m`` (``g`` = monthly growth
+factor). A corpus that only grows then stays constant, the contributing
+trajectory becomes a cumulative sum of discounted SIPs, and goal flows a
+cumulative sum of discounted flows. Stopping at month ``s`` reaches FI at month
+``m >= s`` exactly when the discounted contributions up to ``s`` cover
+``required[m] * g**-m`` minus the discounted flows up to ``m``.
+
+So the *coast number* (corpus needed at month ``s`` to stop and still be FI by
+the target) is a single reversed running minimum, O(months), and the FI age
+for every stopping month is a lookup over a table of range minima (log2 months
+vectorised passes). The required curve is the selected FIRE style's, so in
+Barista mode this is the Barista frontier.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class CoastFrontier:
+    ages: np.ndarray            # age at each month 0..n-1
+    corpus: np.ndarray          # corpus if you keep investing until that month
+    coast_number: np.ndarray    # corpus needed then to stop investing and be FI by target age (inf: not possible)
+    coast_fi_age: np.ndarray    # FI age if you stop investing then (nan: not by the last month)
+    target_age: int
+
+    @property
+    def stop_age(self) -> Optional[float]:
+        """Earliest age from which you can stop investing and still be FI by ``target_age``."""
+        ok = np.flatnonzero(self.corpus >= self.coast_number)
+        return float(self.ages[ok[0]]) if len(ok) else None
+
+    def frame(self, every: int = 6) -> pd.DataFrame:
+        """Coast number every ``every`` months up to the target age (chart/table rows)."""
+        rows = slice(0, None, every)
+        df = pd.DataFrame({"Age": self.ages[rows], "Coast Number": self.coast_number[rows],
+                           "Coast FI Age": self.coast_fi_age[rows]})
+        return df[np.isfinite(df["Coast Number"])].reset_index(drop=True)
+
+
+def _first_at_or_below(v: np.ndarray, threshold: np.ndarray) -> np.ndarray:
+    """For every ``s``: first ``m >= s`` with ``v[m] <= threshold[s]``, or -1."""
+    n = len(v)
+    levels = [v]                                      # levels[k][i] = min(v[i : i + 2**k])
+    while (1 << len(levels)) <= n:
+        h = 1 << (len(levels) - 1)
+        prev = levels[-1]
+        levels.append(np.minimum(prev, np.concatenate([prev[h:], np.full(h, np.inf)])))
+    pos = np.arange(n)
+    for k in range(len(levels) - 1, -1, -1):          # skip the longest prefix that stays above
+        inside = pos < n
+        block = np.full(n, -np.inf)
+        block[inside] = levels[k][pos[inside]]
+        pos = np.where(inside & (block > threshold), pos + (1 << k), pos)
+    return np.where(pos < n, pos, -1)
+
+def coast_frontier(current_corpus: float, pre_ret_annual_return: float, current_age: int, target_age: int,
+                   sip_schedule: np.ndarray, required: np.ndarray, flows: np.ndarray = None) -> CoastFrontier:
+    """Coast number and coast FI age for stopping at every month of ``required``.
+
+    ``required[m]`` is the required corpus at month ``m`` (goal reserve included),
+    ``sip_schedule`` and ``flows`` are the same month arrays the engine uses; the
+    month-by-month order (flows land, FI test, then growth plus SIP) matches
+    ``years_until_fi`` and ``coast_check``.
+    """
+    n = len(required)
+    rate = (1 + pre_ret_annual_return) ** (1/12) - 1
+    k = ((1 + rate) - 1) / rate if rate != 0 else 1.0     # fv's one-month SIP factor
+    disc = (1 + rate) ** -np.arange(n, dtype=float)
+    f = np.zeros(n) if flows is None else np.asarray(flows[:n], dtype=float)
+    sip = np.asarray(sip_schedule[:n], dtype=float)
+
+    flows_pv = np.concatenate([[0.0], np.cumsum(f[1:] * disc[1:])])                  # flows after month 0
+    invested_pv = current_corpus + f[0] + np.concatenate([[0.0], np.cumsum(k * sip[:-1] * disc[1:])])
+    gap_pv = np.asarray(required, dtype=float) * disc - flows_pv                      # what contributions must cover
+
+    last = min(max((target_age - current_age) * 12, 0), n - 1)
+    need_pv = np.full(n, np.inf)
+    need_pv[:last + 1] = np.minimum.accumulate(gap_pv[:last + 1][::-1])[::-1]        # best month in [s, target]
+    hit = _first_at_or_below(gap_pv, invested_pv)
+
+    ages = current_age + np.arange(n) / 12
+    return CoastFrontier(
+        ages=ages,
+        corpus=(invested_pv + flows_pv) / disc,
+        coast_number=(need_pv + flows_pv) / disc,
+        coast_fi_age=np.where(hit >= 0, current_age + hit / 12, np.nan),
+        target_age=target_age,
+    )
@@ -0,0 +1,186 @@
+"""Property-based fuzzing of the projection engine.
+
+Cases come from ``fire_golden.sample_cases`` with extra weight on the edges the
+optimisations are likely to break: zero return (``fv``'s ``rate == 0`` branch),
+zero SIP / corpus, SWR at both ends, Barista cover at 80% and a target age one
+year out. Each property runs on a whole batch through the same
+``"module:function"`` batch interface as ``fire_golden``; failing rows are
+shrunk field by field towards the app defaults (``fire_engine.SCENARIO_DEFAULTS``)
+until no simpler input still fails. With ``--fast`` the scalar and fast engines also run side by side::
+
+    python fire_fuzz.py --cases 2000
+    python fire_fuzz.py --fast my_kernel:batch
+"""
+import argparse
+import json
+import sys
+from typing import Callable, Dict
+
+import numpy as np
+
+from fire_engine import SCENARIO_DEFAULTS
+from fire_golden import INPUTS, MONTH_OUTPUTS, load_engine, sample_cases
+
+SIMPLE = SCENARIO_DEFAULTS      # the "simplest" value each field shrinks towards
+EDGES = {"pre_ret_return": [0.0, 0.0025, 0.20], "inflation": [0.0, 0.10], "sip_growth": [0.0, 0.30],
+         "swr": [0.025, 0.05], "barista_cover": [0.10, 0.80], "monthly_sip": [0.0], "current_corpus": [0.0],
+         "monthly_expense": [0.0, 1e6], "current_age": [18, 70]}
+SCALE = 1024.0      # power of two: scaling ₹ amounts is exact in binary floating point
+AMOUNTS = ("monthly_expense", "current_corpus", "monthly_sip")
+
+# -----------------------------
+# Case generation
+# -----------------------------
+
+def fuzz_cases(n: int, seed: int = 7, edge_share: float = 0.3) -> Dict[str, np.ndarray]:
+    """``sample_cases`` with a share of each field forced onto its edge values."""
+    cases = sample_cases(n, seed)
+    rng = np.random.default_rng(seed + 1)
+    for field, values in EDGES.items():
+        hit = rng.random(n) < edge_share / len(EDGES) * 3
+        cases[field] = np.where(hit, rng.choice(values, n), cases[field])
+    near = rng.random(n) < edge_share / 3          # target age right at min_value=current_age+1
+    cases["target_age"] = np.where(near, cases["current_age"] + 1, np.maximum(cases["target_age"], cases["current_age"] + 1))
+    return cases
+
+def _with(cases: dict, **changes) -> dict:
+    out = dict(cases)
+    out.update({k: np.broadcast_to(v, np.shape(cases["current_age"])).copy() for k, v in changes.items()})
+    return out
+
+
+# -----------------------------
+# Properties: each returns a boolean "fails" mask over the batch
+# -----------------------------
+
+def sip_monotone(engine: Callable, cases: dict) -> np.ndarray:
+    """More SIP never lowers the projected corpus or delays FI."""
+    base = engine(cases)
+    more = engine(_with(cases, monthly_sip=cases["monthly_sip"] * 1.5 + 1000.0))
+    return ((more["projected_corpus"] < base["projected_corpus"] * (1 - 1e-12))
+            | (more["age_reached"] > base["age_reached"]))
+
+def return_monotone(engine: Callable, cases: dict) -> np.ndarray:
+    """A higher pre-FI return never lowers the projected corpus or delays FI."""
+    base = engine(cases)
+    more = engine(_with(cases, pre_ret_return=cases["pre_ret_return"] + 0.0025))
+    return ((more["projected_corpus"] < base["projected_corpus"] * (1 - 1e-12))
+            | (more["age_reached"] > base["age_reached"]))
+
+def rate_continuity(engine: Callable, cases: dict, eps: float = 1e-7) -> np.ndarray:
+    """``rate -> 0`` joins the ``rate == 0`` branch: the gap is bounded by years × eps."""
+    zero = engine(_with(cases, pre_ret_return=0.0))
+    tiny = engine(_with(cases, pre_ret_return=eps))
+    years = (cases["target_age"] - cases["current_age"]).astype(float)
+    gap = np.abs(tiny["projected_corpus"] - zero["projected_corpus"])
+    return gap > (years * eps * 1.01 + 1e-9) * np.abs(zero["projected_corpus"]) + 1e-6
+
+def coast_not_before_fi(engine: Callable, cases: dict) -> np.ndarray:
+    """Contributions only help: coast FI (no more SIP) is never earlier than earliest FI."""
+    out = engine(cases)
+    return ~np.isnan(out["coast_age"]) & (out["age_reached"] > out["coast_age"] + 1e-9)
+
+def unit_scaling(engine: Callable, cases: dict) -> np.ndarray:
+    """Scaling every ₹ amount by 1024 scales ₹ outputs exactly and leaves ages/months alone."""
+    base = engine(cases)
+    scaled = engine(_with(cases, **{k: cases[k] * SCALE for k in AMOUNTS}))
+    bad = np.zeros(len(cases["current_age"]), dtype=bool)
+    for k in ("required_corpus", "projected_corpus", "corpus_when_reached"):
+        bad |= scaled[k] != base[k] * SCALE
+    for k in ("age_reached",) + MONTH_OUTPUTS:
+        bad |= ~((scaled[k] == base[k]) | (np.isnan(scaled[k]) & np.isnan(base[k])))
+    return bad
+
+PROPERTIES = {f.__name__: f for f in (sip_monotone, return_monotone, rate_continuity,
+                                      coast_not_before_fi, unit_scaling)}
+
+def matches(scalar: Callable, fast: Callable, rtol: float = 1e-9) -> Callable:
+    """Side-by-side property: the fast engine agrees with the scalar one."""
+    def fast_matches_scalar(_engine, cases):
+        a, b = scalar(cases), fast(cases)
+        bad = np.zeros(len(cases["current_age"]), dtype=bool)
+        for k in a:
+            x, y = np.asarray(a[k], dtype=float), np.asarray(b[k], dtype=float)
+            same_nan = np.isnan(x) & np.isnan(y)
+            bad |= ~same_nan & ~(np.abs(x - y) <= rtol * np.abs(x))
+        return bad
+    return fast_matches_scalar
+
+
+# -----------------------------
+# Shrinking
+# -----------------------------
+
+def _row(cases: dict, i: int) -> dict:
+    return {k: cases[k][i] for k in INPUTS}
+
+def _batch(row: dict) -> dict:
+    return {k: np.array([v]) for k, v in row.items()}
+
+def _valid(row: dict) -> bool:
+    return 18 <= row["current_age"] < row["target_age"] <= 80
+
+def _simpler(field: str, value):
+    """Candidate replacements for ``value``, simplest first."""
+    yield SIMPLE[field]
+    if field in EDGES:
+        yield from EDGES[field]
+    if isinstance(value, (float, np.floating)) and value not in (0.0, SIMPLE[field]):
+        for digits in (0, 1, 2) if field in AMOUNTS else (2, 3, 4):
+            yield float(np.round(value, -4 + digits if field in AMOUNTS else digits))
+    if field == "target_age":
+        yield int(SIMPLE["current_age"]) + 1
+
+def shrink(prop: Callable, engine: Callable, row: dict, max_rounds: int = 20) -> dict:
+    """Greedily replace fields with simpler values while ``prop`` still fails."""
+    def fails(r):
+        return _valid(r) and bool(prop(engine, _batch(r))[0])
+    for _ in range(max_rounds):
+        changed = False
+        for field in INPUTS:
+            for candidate in _simpler(field, row[field]):
+                if candidate == row[field]:
+                    continue
+                trial = dict(row, **{field: candidate})
+                if fails(trial):
+                    row, changed = trial, True
+                    break
+        if not changed:
+            break
+    return row
+
+
+def run(engine: Callable, cases: dict, properties: Dict[str, Callable], max_examples: int = 3) -> dict:
+    report = {}
+    for name, prop in properties.items():
+        bad = np.flatnonzero(prop(engine, cases))
+        shrunk = [shrink(prop, engine, _row(cases, i)) for i in bad[:max_examples]]
+        report[name] = {"failures": int(len(bad)),
+                        "examples": [{k: (v.item() if hasattr(v, "item") else v) for k, v in r.items()}
+                                     for r in shrunk]}
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cases", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--engine", default="fire_golden:reference_batch", help="scalar engine")
+    parser.add_argument("--fast", help="fast engine to run side by side with --engine")
+    parser.add_argument("--only", nargs="*", choices=sorted(PROPERTIES), help="run just these properties")
+    args = parser.parse_args(argv)
+
+    scalar = load_engine(args.engine)
+    props = {k: PROPERTIES[k] for k in (args.only or PROPERTIES)}
+    cases = fuzz_cases(args.cases, args.seed)
+    report = {"scalar": run(scalar, cases, props)}
+    if args.fast:
+        fast = load_engine(args.fast)
+        report["fast"] = run(fast, cases, props)
+        report["side_by_side"] = run(fast, cases, {"fast_matches_scalar": matches(scalar, fast)})
+    print(json.dumps(report, indent=2, default=str))
+    return 0 if all(p["failures"] == 0 for r in report.values() for p in r.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""Golden-result corpus and differential harness for engine rewrites.
+
+``generate`` samples input combinations across the full sidebar bounds (snapped
+to the slider steps) and records reference outputs from today's scalar loops in
+``fire_engine``. ``diff`` runs a candidate engine over the corpus in parallel
+and reports the max absolute / relative deviation per output, plus every case
+whose FI month or coast month moved.
+
+A candidate is a ``"module:function"`` that takes a dict of input arrays (one
+row per case, see ``INPUTS``) and returns a dict of output arrays (``OUTPUTS``),
+so vectorised engines can take a whole chunk at once::
+
+    python fire_golden.py generate -n 30000
+    python fire_golden.py diff fire_golden.npz --engine my_kernel:batch
+"""
+import argparse
+import importlib
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict
+
+import numpy as np
+
+from fire_engine import VARIANTS, coast_check, project_corpus, target_corpus, years_until_fi
+
+INPUTS = ("variant", "current_age", "target_age", "monthly_expense", "current_corpus", "monthly_sip",
+          "inflation", "sip_growth", "pre_ret_return", "swr", "fire_type", "lean_mult", "barista_cover",
+          "fat_mult")
+OUTPUTS = ("required_corpus", "projected_corpus", "age_reached", "corpus_when_reached", "coast_age",
+           "fi_month", "coast_month")
+MONTH_OUTPUTS = ("fi_month", "coast_month")
+FIRE_TYPES = ("Lean FIRE", "Barista FIRE", "Fat FIRE")
+
+# -----------------------------
+# Corpus
+# -----------------------------
+
+def _steps(rng, n, lo, hi, step):
+    return np.round(rng.integers(0, int(round((hi - lo) / step)) + 1, n) * step + lo, 10)
+
+def _log_amounts(rng, n, lo, hi, zero_share):
+    out = np.round(np.exp(rng.uniform(np.log(lo), np.log(hi), n)), -2)
+    out[rng.random(n) < zero_share] = 0.0
+    return out
+
+def sample_cases(n: int, seed: int = 2024) -> Dict[str, np.ndarray]:
+    """``n`` input rows within the sidebar bounds, rates as fractions like the app uses."""
+    rng = np.random.default_rng(seed)
+    current_age = rng.integers(18, 71, n)
+    return {
+        "variant": rng.choice(list(VARIANTS), n),
+        "current_age": current_age,
+        "target_age": np.minimum(current_age + 1 + (rng.random(n) * (80 - current_age)).astype(int), 80),
+        "monthly_expense": _log_amounts(rng, n, 5e3, 1e6, 0.01),
+        "current_corpus": _log_amounts(rng, n, 1e4, 1e8, 0.10),
+        "monthly_sip": _log_amounts(rng, n, 1e3, 5e5, 0.15),
+        "inflation": _steps(rng, n, 0.0, 10.0, 0.25) / 100.0,
+        "sip_growth": _steps(rng, n, 0.0, 30.0, 0.25) / 100.0,
+        "pre_ret_return": _steps(rng, n, 0.0, 20.0, 0.25) / 100.0,
+        "swr": _steps(rng, n, 2.5, 5.0, 0.1) / 100.0,
+        "fire_type": rng.choice(FIRE_TYPES, n),
+        "lean_mult": _steps(rng, n, 0.5, 1.0, 0.05),
+        "barista_cover": _steps(rng, n, 10, 80, 5) / 100.0,
+        "fat_mult": _steps(rng, n, 1.0, 2.5, 0.1),
+    }
+
+def reference_case(case: dict) -> dict:
+    """Outputs of the scalar engine for one row, the way the app scripts call it."""
+    variant = VARIANTS[str(case["variant"])]
+    current_age, target_age = int(case["current_age"]), int(case["target_age"])
+    sip = max(0.0, float(case["monthly_sip"]))
+    growth = float(case["sip_growth"]) if sip > 0 else 0.0
+    inflation, expense = float(case["inflation"]), float(case["monthly_expense"])
+    target = target_corpus(str(case["fire_type"]), float(case["swr"]), float(case["lean_mult"]),
+                           float(case["barista_cover"]), float(case["fat_mult"]))
+    years_to_target = target_age - current_age
+    required = target(years_to_target, expense * ((1 + inflation) ** years_to_target) * 12)
+    projected = project_corpus(float(case["current_corpus"]), float(case["pre_ret_return"]),
+                               years_to_target * 12, sip, growth)
+    age, corpus_at, traj = years_until_fi(current_age, float(case["current_corpus"]), sip,
+                                          float(case["pre_ret_return"]), growth, target, inflation, expense,
+                                          max_age=80, variant=variant)
+    coast_age, _ = coast_check(float(case["current_corpus"]), float(case["pre_ret_return"]), current_age,
+                               target, inflation, expense)
+    last_age = float(traj["Age"].iloc[-1]) if len(traj) else float(current_age)
+    return {
+        "required_corpus": required, "projected_corpus": projected, "age_reached": float(age),
+        "corpus_when_reached": corpus_at, "coast_age": np.nan if coast_age is None else coast_age,
+        "fi_month": int(round((last_age - current_age) * 12)),
+        "coast_month": -1 if coast_age is None else int(round((coast_age - current_age) * 12)),
+    }
+
+def reference_batch(cases: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Candidate-compatible wrapper around ``reference_case`` (the baseline engine)."""
+    n = len(cases["current_age"])
+    rows = [reference_case({k: v[i] for k, v in cases.items()}) for i in range(n)]
+    return {k: np.array([r[k] for r in rows], dtype=np.int64 if k in MONTH_OUTPUTS else float)
+            for k in OUTPUTS}
+
+
+# -----------------------------
+# Parallel evaluation
+# -----------------------------
+
+def load_engine(spec: str) -> Callable:
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name or "batch")
+
+def _run_chunk(args):
+    spec, cases = args
+    t0 = time.perf_counter()
+    out = load_engine(spec)(cases)
+    return {k: np.asarray(out[k]) for k in OUTPUTS}, time.perf_counter() - t0
+
+def evaluate(spec: str, cases: Dict[str, np.ndarray], workers: int = 4, chunk: int = 1000):
+    """Run engine ``spec`` over ``cases`` in ``chunk``-row pieces on ``workers`` processes."""
+    n = len(cases["current_age"])
+    pieces = [(spec, {k: v[i:i + chunk] for k, v in cases.items()}) for i in range(0, n, chunk)]
+    t0 = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_run_chunk, pieces))
+    else:
+        parts = [_run_chunk(p) for p in pieces]
+    out = {k: np.concatenate([p[0][k] for p in parts]) for k in OUTPUTS}
+    return out, {"wall_s": time.perf_counter() - t0, "engine_s": sum(p[1] for p in parts)}
+
+def compare(ref: Dict[str, np.ndarray], got: Dict[str, np.ndarray], rtol: float = 1e-9) -> dict:
+    """Max abs/rel deviation per output and the cases whose FI/coast month moved."""
+    report = {"outputs": {}, "month_mismatches": {}}
+    for k in OUTPUTS:
+        a, b = np.asarray(ref[k], dtype=float), np.asarray(got[k], dtype=float)
+        both_nan = np.isnan(a) & np.isnan(b)
+        diff = np.where(both_nan, 0.0, np.abs(a - b))
+        diff = np.where(np.isnan(diff), np.inf, diff)      # NaN on one side only
+        rel = diff / np.maximum(np.abs(np.nan_to_num(a)), 1e-300)
+        report["outputs"][k] = {"max_abs": float(diff.max(initial=0.0)), "max_rel": float(rel.max(initial=0.0)),
+                                "over_rtol": int((rel > rtol).sum()), "worst_case": int(rel.argmax()) if len(rel) else -1}
+    for k in MONTH_OUTPUTS:
+        moved = np.flatnonzero(np.asarray(ref[k]) != np.asarray(got[k]))
+        report["month_mismatches"][k] = {"count": int(len(moved)), "cases": moved[:20].tolist()}
+    report["ok"] = (all(v["over_rtol"] == 0 for v in report["outputs"].values())
+                    and all(v["count"] == 0 for v in report["month_mismatches"].values()))
+    return report
+
+
+# -----------------------------
+# Corpus files
+# -----------------------------
+
+def save_corpus(path: str, cases: Dict[str, np.ndarray], ref: Dict[str, np.ndarray], seed: int) -> None:
+    np.savez_compressed(path, seed=seed, **cases, **{f"ref_{k}": v for k, v in ref.items()})
+
+def load_corpus(path: str):
+    with np.load(path, allow_pickle=False) as z:
+        cases = {k: z[k] for k in INPUTS}
+        ref = {k: z[f"ref_{k}"] for k in OUTPUTS}
+    return cases, ref
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    g = sub.add_parser("generate", help="sample inputs and record reference outputs")
+    g.add_argument("-n", type=int, default=30000)
+    g.add_argument("--seed", type=int, default=2024)
+    g.add_argument("--out", default="fire_golden.npz")
+    g.add_argument("--workers", type=int, default=4)
+    d = sub.add_parser("diff", help="run a candidate engine against a corpus")
+    d.add_argument("corpus", nargs="?", default="fire_golden.npz")
+    d.add_argument("--engine", default="fire_golden:reference_batch")
+    d.add_argument("--workers", type=int, default=4)
+    d.add_argument("--chunk", type=int, default=1000)
+    d.add_argument("--rtol", type=float, default=1e-9)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "generate":
+        cases = sample_cases(args.n, args.seed)
+        ref, timing = evaluate("fire_golden:reference_batch", cases, args.workers)
+        save_corpus(args.out, cases, ref, args.seed)
+        print(f"wrote {args.n:,} cases to {args.out} in {timing['wall_s']:.1f}s")
+        return 0
+
+    cases, ref = load_corpus(args.corpus)
+    got, timing = evaluate(args.engine, cases, args.workers, args.chunk)
+    report = compare(ref, got, args.rtol)
+    report["timing"] = timing
+    report["cases"] = len(cases["current_age"])
+    print(json.dumps(report, indent=2))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
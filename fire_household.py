@@ -0,0 +1,120 @@
+"""Household mode: two (or more) earners planning towards one shared corpus.
+
+Each member keeps their own age, salary path, SIP and retirement age. Their
+income and SIP are built with the single-person builders in ``fire_income`` on
+a common month axis (month 0 = today), stacked into a ``(members, months)``
+matrix and merged with one array sum. The merged SIP schedule then goes
+through the engine's FI search (``fi_search``) once, so the household FI date comes from the same
+engine as a single plan, with no per-member month loops.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fire_engine import VARIANTS, fi_search
+from fire_income import CareerBreak, IncomePath, sip_from_income, stepped_sip
+
+# -----------------------------
+# Members
+# -----------------------------
+
+@dataclass(frozen=True)
+class Member:
+    """One earner. Income and SIP stop at ``retire_age`` (on this member's own age axis)."""
+    name: str
+    current_age: int
+    monthly_income: float
+    yearly_hike: float = 0.0
+    monthly_sip: float = 0.0
+    sip_growth: float = 0.0
+    sip_pct: Optional[float] = None          # SIP as % of income instead of a fixed amount
+    current_corpus: float = 0.0
+    retire_age: Optional[float] = None
+    breaks: Tuple[CareerBreak, ...] = ()
+
+    def _working(self, n_months: int) -> np.ndarray:
+        if self.retire_age is None:
+            return np.ones(n_months, dtype=bool)
+        return np.arange(n_months) < int(round((self.retire_age - self.current_age) * 12))
+
+    def income(self, n_months: int) -> np.ndarray:
+        path = IncomePath(monthly_income=self.monthly_income, yearly_hike=self.yearly_hike, breaks=self.breaks)
+        return path.own_income(self.current_age, n_months) * self._working(n_months)
+
+    def sip(self, n_months: int) -> np.ndarray:
+        if self.sip_pct is not None:
+            return sip_from_income(self.income(n_months), self.sip_pct)
+        share = IncomePath(self.monthly_income, self.yearly_hike, self.breaks).break_share(self.current_age, n_months)
+        growth = self.sip_growth if self.monthly_sip > 0 else 0.0
+        return stepped_sip(max(0.0, self.monthly_sip), growth, n_months, share) * self._working(n_months)
+
+
+@dataclass(frozen=True)
+class Household:
+    """Members in display order; the first member's age is the plan's age axis."""
+    members: Tuple[Member, ...]
+
+    @property
+    def anchor_age(self) -> int:
+        return self.members[0].current_age
+
+    @property
+    def current_corpus(self) -> float:
+        return float(sum(m.current_corpus for m in self.members))
+
+    def income_matrix(self, n_months: int) -> np.ndarray:
+        return np.vstack([m.income(n_months) for m in self.members])
+
+    def sip_matrix(self, n_months: int) -> np.ndarray:
+        return np.vstack([m.sip(n_months) for m in self.members])
+
+    def sip_schedule(self, n_months: int) -> np.ndarray:
+        """Household SIP per month: the members' schedules added together."""
+        return self.sip_matrix(n_months).sum(axis=0)
+
+    def ages_at(self, month: int) -> Dict[str, float]:
+        return {m.name: m.current_age + month / 12 for m in self.members}
+
+
+# -----------------------------
+# Household FI
+# -----------------------------
+
+@dataclass
+class HouseholdFI:
+    reached: bool
+    fi_month: int                   # months from today (last month searched if not reached)
+    ages_at_fi: Dict[str, float]
+    corpus_when_reached: float
+    traj_df: pd.DataFrame           # 6-monthly, "Age" on the first member's axis
+    contributions: pd.DataFrame     # 6-monthly SIP per member (long format: Age, Member, Monthly SIP)
+
+
+def household_fi(household: Household, pre_ret_annual_return: float, inflation: float, monthly_expense: float,
+                 target_corpus_func: Callable[[float, float], float], max_age: int = 80,
+                 flows: np.ndarray = None, reserve: np.ndarray = None) -> HouseholdFI:
+    """Earliest month the shared corpus covers the household's required corpus.
+
+    ``max_age``, ``flows`` and ``reserve`` are on the first member's axis, as in
+    the single-person engine.
+    """
+    anchor = household.anchor_age
+    n_months = (max_age - anchor) * 12 + 1
+    sips = household.sip_matrix(n_months)
+    found = fi_search(
+        current_age=anchor, current_corpus=household.current_corpus, monthly_sip=0.0,
+        pre_ret_annual_return=pre_ret_annual_return, sip_growth=0.0, target_corpus_func=target_corpus_func,
+        inflation=inflation, base_monthly_expense=monthly_expense, max_age=max_age,
+        flows=flows, reserve=reserve, sip_schedule=sips.sum(axis=0), variant=VARIANTS["v3_2"],
+    )
+    fi_month = min(found.months, n_months - 1)
+    every = np.arange(0, min(fi_month, n_months - 1) + 1, 6)
+    contributions = pd.DataFrame({
+        "Age": np.tile(anchor + every / 12, len(household.members)),
+        "Member": np.repeat([m.name for m in household.members], len(every)),
+        "Monthly SIP": sips[:, every].reshape(-1),
+    })
+    return HouseholdFI(found.reached, fi_month, household.ages_at(fi_month), found.corpus, found.traj_df,
+                       contributions)
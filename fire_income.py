@@ -0,0 +1,86 @@
+"""Month-by-month income path (hikes, career breaks, spouse retirement) and SIP schedules.
+
+Everything is produced as a NumPy array over the projection's month axis, built
+once per input change and then indexed by the projection / FI search loops.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+# -----------------------------
+# Income path
+# -----------------------------
+
+@dataclass(frozen=True)
+class CareerBreak:
+    """A sabbatical or career break. Hikes are frozen while it lasts."""
+    start_age: float
+    years: float
+    income_share: float = 0.0    # fraction of salary still earned (0 = unpaid)
+
+
+@dataclass(frozen=True)
+class IncomePath:
+    """Household take-home income over time, in nominal ₹ per month."""
+    monthly_income: float
+    yearly_hike: float
+    breaks: Tuple[CareerBreak, ...] = ()
+    spouse_monthly_income: float = 0.0
+    spouse_yearly_hike: float = 0.0
+    spouse_retire_age: Optional[float] = None   # on *your* age axis
+
+    def break_share(self, current_age: float, n_months: int) -> np.ndarray:
+        """Fraction of salary earned in each month (1.0 outside breaks)."""
+        share = np.ones(n_months, dtype=float)
+        for b in self.breaks:
+            lo = max(0, int(round((b.start_age - current_age) * 12)))
+            hi = min(n_months, int(round((b.start_age + b.years - current_age) * 12)))
+            if hi > lo:
+                share[lo:hi] = np.minimum(share[lo:hi], b.income_share)
+        return share
+
+    def own_income(self, current_age: float, n_months: int) -> np.ndarray:
+        """Your salary per month: hike on every working work-anniversary, paused in breaks."""
+        share = self.break_share(current_age, n_months)
+        months = np.arange(n_months)
+        anniversary = (months % 12 == 0) & (months > 0) & (share >= 1.0)
+        hikes = np.cumsum(anniversary)
+        return self.monthly_income * (1 + self.yearly_hike) ** hikes * share
+
+    def spouse_income(self, current_age: float, n_months: int) -> np.ndarray:
+        if self.spouse_monthly_income <= 0:
+            return np.zeros(n_months, dtype=float)
+        months = np.arange(n_months)
+        income = self.spouse_monthly_income * (1 + self.spouse_yearly_hike) ** (months // 12)
+        if self.spouse_retire_age is not None:
+            income[months >= int(round((self.spouse_retire_age - current_age) * 12))] = 0.0
+        return income
+
+    def monthly_array(self, current_age: float, n_months: int) -> np.ndarray:
+        """Household income for month indices 0..n_months-1."""
+        return self.own_income(current_age, n_months) + self.spouse_income(current_age, n_months)
+
+
+# -----------------------------
+# SIP schedules
+# -----------------------------
+
+def sip_from_income(income: np.ndarray, sip_pct: float) -> np.ndarray:
+    """SIP as a fixed percentage of each month's income."""
+    return income * (sip_pct / 100.0)
+
+
+def stepped_sip(monthly_sip: float, sip_growth: float, n_months: int,
+                share: Optional[np.ndarray] = None) -> np.ndarray:
+    """Fixed SIP stepped up every 12 months; ``share`` scales it down during breaks.
+
+    The yearly factors are chained with ``cumprod`` so values match the repeated
+    ``sip *= (1 + sip_growth)`` of the month loops bit-for-bit.
+    """
+    years = n_months // 12 + 1
+    factors = np.full(years, 1 + sip_growth, dtype=float)
+    factors[0] = monthly_sip
+    per_year = np.cumprod(factors)
+    sip = np.repeat(per_year, 12)[:n_months]
+    return sip if share is None else sip * share
@@ -0,0 +1,100 @@
+"""Background jobs for heavy analytics, so the script thread can render the cards first.
+
+Jobs run on a small process-wide thread pool (NumPy releases the GIL in its
+inner loops). Each session owns named *slots* ("fan", "strategies", ...): when a
+slot is resubmitted with a different input key, the job already in it is
+cancelled — dropped if still queued, or told to stop through the
+``threading.Event`` it was given. Finished results are kept by key, so
+returning to an earlier input set is instant; with a ``DiskCache`` they are
+also written to disk and survive restarts.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Tuple
+
+from fire_diskcache import DISK, DiskCache
+
+log = logging.getLogger("fire.jobs")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when its cancel event is set."""
+
+
+def check_cancel(cancel: threading.Event = None) -> None:
+    """Call between chunks of work; raises ``JobCancelled`` once the job is stale."""
+    if cancel is not None and cancel.is_set():
+        raise JobCancelled()
+
+
+class JobRunner:
+    """Slot-based job submission with cancellation and a small result cache."""
+
+    def __init__(self, max_workers: int = 2, max_results: int = 64, disk: DiskCache = None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fire-job")
+        self._lock = threading.Lock()
+        self._slots: Dict[Tuple[str, str], Tuple[str, Future, threading.Event]] = {}
+        self._results: "OrderedDict[str, object]" = OrderedDict()
+        self.max_results = max_results
+        self.disk = disk
+        self.cancelled = 0
+
+    def submit(self, session: str, slot: str, key: str, fn: Callable, *args, **kwargs) -> Future:
+        """Run ``fn(*args, cancel=event, **kwargs)`` for ``key`` in this session's ``slot``."""
+        stored = None
+        if self.disk is not None:
+            with self._lock:
+                known = key in self._results
+            stored = None if known else self.disk.get(key)
+        with self._lock:
+            if stored is not None:
+                self._keep(key, stored)
+            if key in self._results:
+                self._results.move_to_end(key)
+                done = Future()
+                done.set_result(self._results[key])
+                return done
+            current = self._slots.get((session, slot))
+            if current is not None:
+                cur_key, cur_future, cur_cancel = current
+                if cur_key == key:
+                    return cur_future
+                cur_cancel.set()
+                cur_future.cancel()
+                self.cancelled += 1
+                log.info("cancelled stale %s job for session %s", slot, session[:8])
+            cancel = threading.Event()
+            future = self._pool.submit(self._run, key, fn, args, kwargs, cancel)
+            self._slots[(session, slot)] = (key, future, cancel)
+            return future
+
+    def _run(self, key, fn, args, kwargs, cancel):
+        try:
+            result = fn(*args, cancel=cancel, **kwargs)
+        except JobCancelled:
+            return None
+        with self._lock:
+            self._keep(key, result)
+        if self.disk is not None:
+            self.disk.put(key, result)
+        return result
+
+    def _keep(self, key, result) -> None:
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+
+    def cancel_session(self, session: str) -> None:
+        """Stop everything a session has in flight (e.g. when it disconnects)."""
+        with self._lock:
+            for (sid, slot), (_, future, cancel) in list(self._slots.items()):
+                if sid == session:
+                    cancel.set()
+                    future.cancel()
+                    del self._slots[(sid, slot)]
+
+
+RUNNER = JobRunner(disk=DISK)
@@ -0,0 +1,177 @@
+"""Load test: N concurrent simulated sessions replaying realistic slider sequences.
+
+Each session is a ``streamlit.testing.v1.AppTest`` on its own thread, all in one
+process, so they share the process-wide caches (``STORE``, ``RUNNER``,
+``st.cache_data``) and the GIL exactly like sessions served by one
+``streamlit run``. Every interaction is a full script rerun; its wall time is
+the rerun latency. The report has throughput, latency percentiles and RSS
+growth, and can be saved and compared against a report from another commit::
+
+    python fire_loadtest.py --sessions 8 --steps 25 --save before.json
+    python fire_loadtest.py --sessions 8 --steps 25 --compare before.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fire_app_eli_v3_2.py")
+
+# -----------------------------
+# Simulated user behaviour
+# -----------------------------
+
+def _slider(at, label):
+    return next(w for w in at.slider if w.label.startswith(label))
+
+def _number(at, label):
+    return next(w for w in at.number_input if w.label.startswith(label))
+
+def _drag(label, lo, hi, step):
+    """A slider drag: a run of ticks in one direction, like a mouse drag or arrow keys."""
+    def action(at, rng):
+        ticks = rng.randint(2, 6) * rng.choice((-1, 1))
+        value = _slider(at, label).value
+        for _ in range(abs(ticks)):
+            value = min(hi, max(lo, round(value + step * (1 if ticks > 0 else -1), 4)))
+            yield lambda v=value: _slider(at, label).set_value(v)   # fresh widget: the tree changes each run
+    return action
+
+def _type(label, choices):
+    def action(at, rng):
+        yield lambda v=rng.choice(choices): _number(at, label).set_value(v)
+    return action
+
+def _pick_fire_type(at, rng):
+    yield lambda v=rng.choice(["Lean FIRE", "Barista FIRE", "Fat FIRE"]): at.sidebar.selectbox[0].set_value(v)
+
+def _toggle_compact(at, rng):
+    yield lambda: at.toggle(key="compact").set_value(not at.toggle(key="compact").value)
+
+ACTIONS = [
+    (5, _drag("Inflation on expenses", 0.0, 10.0, 0.25)),
+    (5, _drag("Expected return before FI", 0.0, 20.0, 0.25)),
+    (3, _drag("Safe Withdrawal Rate", 2.5, 5.0, 0.1)),
+    (3, _drag("Yearly salary hike", 0.0, 20.0, 0.25)),
+    (4, _type("Monthly SIP", [10000.0, 20000.0, 30000.0, 45000.0, 60000.0])),
+    (3, _type("Monthly expenses", [50000.0, 65000.0, 80000.0, 100000.0])),
+    (2, _type("Current invested corpus", [500000.0, 1000000.0, 2500000.0])),
+    (2, _pick_fire_type),
+    (2, _toggle_compact),
+]
+
+
+# -----------------------------
+# Sessions
+# -----------------------------
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def session(idx: int, steps: int, seed: int, latencies: List[float], errors: List[str], timeout: float) -> None:
+    rng = random.Random(seed * 1000 + idx)
+    at = AppTest.from_file(SCRIPT, default_timeout=timeout)
+    t0 = time.perf_counter()
+    at.run()
+    latencies.append(time.perf_counter() - t0)
+    weights, actions = zip(*ACTIONS)
+    done = 0
+    while done < steps:
+        action = rng.choices(actions, weights)[0]
+        for change in action(at, rng):
+            change()
+            t0 = time.perf_counter()
+            at.run()
+            latencies.append(time.perf_counter() - t0)
+            if at.exception:
+                errors.append(at.exception[0].message)
+            done += 1
+            if done >= steps:
+                break
+
+def run_load(sessions: int, steps: int, seed: int = 1, timeout: float = 60.0) -> dict:
+    latencies: List[float] = []
+    errors: List[str] = []
+    rss_start = rss_bytes()
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(i, steps, seed, latencies, errors, timeout), daemon=True)
+               for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    lat = np.array(latencies) * 1000
+    return {
+        "commit": _commit(), "sessions": sessions, "steps": steps, "seed": seed,
+        "reruns": int(len(lat)), "errors": len(errors), "first_errors": errors[:3],
+        "wall_s": round(wall, 2), "throughput_rps": round(len(lat) / wall, 2) if wall else 0.0,
+        "latency_ms": {p: round(float(np.percentile(lat, q)), 1) if len(lat) else None
+                       for p, q in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))},
+        "rss_mb": {"start": round(rss_start / 2**20, 1), "end": round(rss_bytes() / 2**20, 1)},
+    }
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(SCRIPT), timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+# -----------------------------
+# Reports
+# -----------------------------
+
+def compare(old: dict, new: dict) -> Dict[str, str]:
+    """Side-by-side of the headline numbers, with the relative change."""
+    rows = {"throughput_rps": (old["throughput_rps"], new["throughput_rps"])}
+    rows.update({f"latency_{k}_ms": (old["latency_ms"][k], new["latency_ms"][k]) for k in new["latency_ms"]})
+    rows["rss_growth_mb"] = (old["rss_mb"]["end"] - old["rss_mb"]["start"],
+                             new["rss_mb"]["end"] - new["rss_mb"]["start"])
+    out = {}
+    for name, (a, b) in rows.items():
+        change = f"{(b - a) / a:+.1%}" if a else "n/a"
+        out[name] = f"{a:.1f} -> {b:.1f} ({change})"
+    return out
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=20, help="interactions (reruns) per session")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-rerun timeout (s)")
+    parser.add_argument("--save", help="write the report to this JSON file")
+    parser.add_argument("--compare", help="compare against a saved report")
+    args = parser.parse_args(argv)
+
+    report = run_load(args.sessions, args.steps, args.seed, args.timeout)
+    print(json.dumps(report, indent=2))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print(f"\nvs {old.get('commit') or args.compare} ({old['sessions']} sessions × {old['steps']} steps):")
+        for name, line in compare(old, report).items():
+            print(f"  {name:<18} {line}")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Simulated monthly return paths for Monte Carlo analytics.
+
+Paths are seeded, so the same inputs always give the same path set and the
+result can be cached and shared between views.
+"""
+import threading
+from functools import lru_cache
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from fire_jobs import check_cancel
+from fire_quantiles import StreamingQuantiles
+
+
+def _growth(rng: np.random.Generator, n_paths: int, n_months: int,
+            annual_return: float, annual_vol: float) -> np.ndarray:
+    sigma = annual_vol / np.sqrt(12)
+    mu = np.log1p(annual_return) / 12 - 0.5 * sigma ** 2
+    return np.exp(mu + sigma * rng.standard_normal((n_paths, n_months)))
+
+
+def monthly_growth_paths(n_paths: int, n_months: int, annual_return: float,
+                         annual_vol: float, seed: int = 42) -> np.ndarray:
+    """Gross monthly growth factors ``(paths, months)`` from a lognormal model.
+
+    The drift is set so the expected annual growth is ``1 + annual_return``;
+    ``annual_vol`` is the annualised volatility of log returns.
+    """
+    return _growth(np.random.default_rng(seed), n_paths, n_months, annual_return, annual_vol)
+
+
+@lru_cache(maxsize=4)
+def cached_growth_paths(n_paths: int, n_months: int, annual_return: float,
+                        annual_vol: float, seed: int = 42) -> np.ndarray:
+    """Process-wide, read-only copy of ``monthly_growth_paths`` shared by all views."""
+    paths = monthly_growth_paths(n_paths, n_months, annual_return, annual_vol, seed)
+    paths.flags.writeable = False
+    return paths
+
+
+def growth_chunks(n_paths: int, n_months: int, annual_return: float, annual_vol: float,
+                  seed: int = 42, chunk: int = 500) -> Iterator[np.ndarray]:
+    """Same model as ``monthly_growth_paths``, generated ``chunk`` paths at a time.
+
+    Each chunk draws from its own child of ``SeedSequence(seed)``, so results only
+    depend on ``seed`` and ``chunk``, never on how the chunks are consumed.
+    """
+    n_chunks = -(-n_paths // chunk)
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        size = min(chunk, n_paths - i * chunk)
+        yield _growth(np.random.default_rng(child), size, n_months, annual_return, annual_vol)
+
+
+def corpus_quantiles(current_corpus: float, sip: np.ndarray, n_months: int, annual_return: float,
+                     annual_vol: float, n_paths: int, required: Optional[np.ndarray] = None,
+                     flows: Optional[np.ndarray] = None, seed: int = 42, chunk: int = 500,
+                     cancel: Optional[threading.Event] = None) -> StreamingQuantiles:
+    """Accumulation-phase corpus for ``n_paths`` random paths, streamed into a percentile sketch.
+
+    Follows the deterministic projection: flows land at month ``m``, then the
+    corpus grows for a month and the SIP is added. Only one ``(chunk, months)``
+    block exists at a time. If ``required`` is given, the sketch also counts the
+    paths that have reached it by each month.
+    """
+    sketch = StreamingQuantiles(n_months)
+    sip = np.asarray(sip[:n_months], dtype=float)
+    flows = np.zeros(n_months + 1) if flows is None else np.asarray(flows, dtype=float)
+    for growth in growth_chunks(n_paths, n_months - 1, annual_return, annual_vol, seed, chunk):
+        check_cancel(cancel)
+        block = np.empty((growth.shape[0], n_months))
+        corpus = np.full(growth.shape[0], float(current_corpus) + flows[0])
+        block[:, 0] = corpus
+        for m in range(n_months - 1):
+            corpus = corpus * growth[:, m] + sip[m] + flows[m + 1]
+            block[:, m + 1] = corpus
+        sketch.add(block, None if required is None else block >= required[:n_months])
+    return sketch
+
+
+def fan_table(current_age: float, current_corpus: float, sip: np.ndarray, n_months: int,
+              annual_return: float, annual_vol: float, n_paths: int, required: Optional[np.ndarray] = None,
+              flows: Optional[np.ndarray] = None, every: int = 6,
+              cancel: Optional[threading.Event] = None) -> pd.DataFrame:
+    """p10 / p50 / p90 corpus and chance of FI, every ``every`` months, for the fan chart."""
+    sketch = corpus_quantiles(current_corpus, sip, n_months, annual_return, annual_vol, n_paths,
+                              required=required, flows=flows, cancel=cancel)
+    rows = np.arange(0, n_months, every)
+    return pd.DataFrame({"Age": current_age + rows / 12, "P10": sketch.quantile(0.10)[rows],
+                         "P50": sketch.quantile(0.50)[rows], "P90": sketch.quantile(0.90)[rows],
+                         "Chance": sketch.probability_reached()[rows]})
@@ -0,0 +1,63 @@
+"""Streaming per-month percentiles for Monte Carlo fan charts.
+
+``StreamingQuantiles`` keeps one log-spaced histogram per month. Path chunks are
+folded in with a single ``np.bincount`` and then dropped, so memory stays at
+O(months x bins) no matter how many paths are simulated, and two sketches can
+be merged by adding their counts. With ``bins_per_decade=100`` each bin spans
+about 2.3% and percentiles are interpolated inside the bin.
+"""
+import numpy as np
+
+
+class StreamingQuantiles:
+    """Mergeable per-month histogram sketch over positive amounts (≤ 0 kept in a zero bin)."""
+
+    def __init__(self, n_months: int, lo: float = 1e3, hi: float = 1e13, bins_per_decade: int = 100):
+        self.n_months = n_months
+        self.log_lo = np.log10(lo)
+        self.bins_per_decade = bins_per_decade
+        self.n_bins = int(round((np.log10(hi) - self.log_lo) * bins_per_decade)) + 1   # +1: zero bin
+        self.counts = np.zeros((n_months, self.n_bins), dtype=np.int64)
+        self.hits = np.zeros(n_months, dtype=np.int64)   # paths at/above a threshold by each month
+        self.min = np.full(n_months, np.inf)              # exact extremes clamp the interpolation
+        self.max = np.full(n_months, -np.inf)
+        self.n = 0
+
+    def add(self, values: np.ndarray, reached: np.ndarray = None) -> None:
+        """Fold in a ``(paths, months)`` chunk; ``reached`` marks (path, month) cells that are FI."""
+        values = np.asarray(values, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pos = np.floor((np.log10(values) - self.log_lo) * self.bins_per_decade) + 1
+        idx = np.where(values > 0, np.clip(np.nan_to_num(pos, nan=1.0), 1, self.n_bins - 1), 0).astype(np.int64)
+        flat = idx + np.arange(self.n_months) * self.n_bins
+        self.counts += np.bincount(flat.ravel(), minlength=self.n_months * self.n_bins).reshape(self.counts.shape)
+        if reached is not None:
+            self.hits += np.maximum.accumulate(reached, axis=1).sum(axis=0)
+        self.min = np.minimum(self.min, values.min(axis=0))
+        self.max = np.maximum(self.max, values.max(axis=0))
+        self.n += values.shape[0]
+
+    def merge(self, other: "StreamingQuantiles") -> "StreamingQuantiles":
+        self.counts += other.counts
+        self.hits += other.hits
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.n += other.n
+        return self
+
+    def quantile(self, q: float) -> np.ndarray:
+        """Approximate ``q``-quantile (0..1) for every month."""
+        cdf = np.cumsum(self.counts, axis=1)
+        target = q * cdf[:, -1]
+        b = np.minimum((cdf < target[:, None]).sum(axis=1), self.n_bins - 1)
+        rows = np.arange(self.n_months)
+        below = np.where(b > 0, cdf[rows, b - 1], 0)
+        in_bin = np.maximum(self.counts[rows, b], 1)
+        frac = np.clip((target - below) / in_bin, 0.0, 1.0)
+        value = 10 ** (self.log_lo + (b - 1 + frac) / self.bins_per_decade)
+        value = np.clip(value, self.min, self.max)
+        return np.where(b == 0, np.minimum(self.min, 0.0), value)
+
+    def probability_reached(self) -> np.ndarray:
+        """Share of paths that have reached the threshold at or before each month."""
+        return self.hits / max(self.n, 1)
@@ -0,0 +1,177 @@
+"""Downloadable PDF plan: cards, trajectory chart and snapshot table.
+
+Pages are drawn with Pillow (already installed with Streamlit) at 150 dpi and
+saved as a multi-page PDF, so no extra PDF or charting library is needed.
+Rendering runs on ``REPORTS``, a small job pool of its own: at most
+``FIRE_REPORT_WORKERS`` reports (default 2) are drawn at once, a session's
+newer request cancels its older one, and finished PDFs are cached by input
+hash in memory and, with ``FIRE_DISK_CACHE``, on disk. The PDF is returned as
+a ``uint8`` array so the disk cache can store it like any other result.
+"""
+import io
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from fire_diskcache import DISK
+from fire_engine import best_unit, rupee_indian
+from fire_jobs import JobRunner, check_cancel
+
+PRIMARY_BLUE = "#034EA2"
+ACCENT_ORANGE = "#F79421"
+TEXT_DARK = "#1F2937"
+MUTED = "#6B7280"
+GRID = "#E5E7EB"
+
+DPI = 150
+PAGE = (1240, 1754)         # A4 at 150 dpi
+MARGIN = 90
+ROWS_PER_PAGE = 48
+
+
+@dataclass
+class PlanReport:
+    """Everything printed in the report; built from the app's current result."""
+    cards: List[Tuple[str, str]]
+    inputs: List[Tuple[str, str]]
+    ages: np.ndarray
+    invested: np.ndarray
+    required: np.ndarray
+    target_age: int
+    title: str = "Your FIRE plan"
+    notes: List[str] = field(default_factory=list)
+
+
+def money(x: float) -> str:
+    """``rupee_indian`` with "Rs" (the bundled PDF font has no ₹ glyph)."""
+    return rupee_indian(x).replace("₹", "Rs ")
+
+def _font(size: int):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:                      # Pillow < 10.1: fixed-size bitmap font only
+        return ImageFont.load_default()
+
+
+# -----------------------------
+# Drawing
+# -----------------------------
+
+def _page() -> Tuple[Image.Image, ImageDraw.ImageDraw]:
+    img = Image.new("RGB", PAGE, "white")
+    return img, ImageDraw.Draw(img)
+
+def _header(d: ImageDraw.ImageDraw, title: str, page_no: int) -> int:
+    d.rectangle([0, 0, PAGE[0], 120], fill=PRIMARY_BLUE)
+    d.text((MARGIN, 38), title, font=_font(40), fill="white")
+    d.text((PAGE[0] - MARGIN, 52), f"{date.today():%d %b %Y} · page {page_no}", font=_font(20), fill="white", anchor="ra")
+    return 160
+
+def _cards(d: ImageDraw.ImageDraw, cards: List[Tuple[str, str]], y: int) -> int:
+    n = len(cards)
+    gap = 20
+    w = (PAGE[0] - 2 * MARGIN - gap * (n - 1)) // n
+    for i, (label, value) in enumerate(cards):
+        x = MARGIN + i * (w + gap)
+        d.rounded_rectangle([x, y, x + w, y + 110], radius=14, outline=GRID, width=2, fill="white")
+        d.text((x + 18, y + 16), label, font=_font(20), fill=MUTED)
+        d.text((x + 18, y + 52), value, font=_font(30), fill=TEXT_DARK)
+    return y + 140
+
+def _inputs(d: ImageDraw.ImageDraw, inputs: List[Tuple[str, str]], y: int) -> int:
+    d.text((MARGIN, y), "Your inputs", font=_font(26), fill=PRIMARY_BLUE)
+    y += 44
+    half = -(-len(inputs) // 2)
+    col_w = (PAGE[0] - 2 * MARGIN) // 2
+    for i, (label, value) in enumerate(inputs):
+        x = MARGIN + (i // half) * col_w
+        row_y = y + (i % half) * 30
+        d.text((x, row_y), label, font=_font(19), fill=MUTED)
+        d.text((x + col_w - 30, row_y), value, font=_font(19), fill=TEXT_DARK, anchor="ra")
+    return y + half * 30 + 30
+
+def _chart(d: ImageDraw.ImageDraw, rep: PlanReport, box: Tuple[int, int, int, int]) -> None:
+    x0, y0, x1, y1 = box
+    d.text((x0, y0 - 80), "Corpus vs required corpus", font=_font(26), fill=PRIMARY_BLUE)
+    ages = np.asarray(rep.ages, dtype=float)
+    series = [np.asarray(rep.invested, dtype=float), np.asarray(rep.required, dtype=float)]
+    unit, div = best_unit(np.concatenate(series))
+    lo_age, hi_age = float(ages.min()), float(max(ages.max(), rep.target_age))
+    top = float(max(s.max() for s in series)) / div * 1.05 or 1.0
+    left = x0 + 90
+
+    def px(age, value):
+        return (left + (age - lo_age) / max(hi_age - lo_age, 1e-9) * (x1 - left),
+                y1 - value / top * (y1 - y0))
+
+    small = _font(17)
+    for i in range(6):
+        v = top * i / 5
+        y = y1 - (y1 - y0) * i / 5
+        d.line([left, y, x1, y], fill=GRID, width=1)
+        d.text((left - 10, y), f"{v:,.1f}", font=small, fill=MUTED, anchor="rm")
+    for age in range(int(np.ceil(lo_age)), int(hi_age) + 1, max(1, int((hi_age - lo_age) // 8) or 1)):
+        x, _ = px(age, 0)
+        d.text((x, y1 + 10), str(age), font=small, fill=MUTED, anchor="ma")
+    d.text(((left + x1) / 2, y1 + 40), "Age (years)", font=small, fill=MUTED, anchor="ma")
+    d.text((x0, y0 - 20), f"Amount ({unit.replace('₹', 'Rs')})", font=small, fill=MUTED, anchor="ls")
+    tx, _ = px(rep.target_age, 0)
+    d.line([tx, y0, tx, y1], fill=MUTED, width=1)
+    d.text((tx + 6, y0 + 4), f"target {rep.target_age}", font=small, fill=MUTED)
+    for values, color in zip(series, (PRIMARY_BLUE, ACCENT_ORANGE)):
+        d.line([px(a, v / div) for a, v in zip(ages, values)], fill=color, width=4, joint="curve")
+    for i, (name, color) in enumerate((("Invested corpus", PRIMARY_BLUE), ("Required corpus", ACCENT_ORANGE))):
+        lx = left + i * 260
+        d.line([lx, y1 + 90, lx + 40, y1 + 90], fill=color, width=5)
+        d.text((lx + 50, y1 + 90), name, font=small, fill=TEXT_DARK, anchor="lm")
+
+def _table(d: ImageDraw.ImageDraw, rows: List[Tuple[str, str, str]], y: int) -> None:
+    cols = (MARGIN, MARGIN + 300, PAGE[0] - MARGIN)
+    head = _font(20)
+    d.text((cols[0], y), "Age", font=head, fill=PRIMARY_BLUE)
+    d.text((cols[1] + 300, y), "Invested corpus", font=head, fill=PRIMARY_BLUE, anchor="ra")
+    d.text((cols[2], y), "Required corpus", font=head, fill=PRIMARY_BLUE, anchor="ra")
+    y += 36
+    body = _font(19)
+    for i, (age, inv, req) in enumerate(rows):
+        if i % 2 == 0:
+            d.rectangle([MARGIN - 10, y - 4, PAGE[0] - MARGIN + 10, y + 26], fill="#F3F4F6")
+        d.text((cols[0], y), age, font=body, fill=TEXT_DARK)
+        d.text((cols[1] + 300, y), inv, font=body, fill=TEXT_DARK, anchor="ra")
+        d.text((cols[2], y), req, font=body, fill=TEXT_DARK, anchor="ra")
+        y += 31
+
+def render_pdf(rep: PlanReport, cancel: Optional[threading.Event] = None) -> np.ndarray:
+    """The report as PDF bytes (``uint8`` array)."""
+    pages = []
+    img, d = _page()
+    y = _header(d, rep.title, 1)
+    y = _cards(d, rep.cards, y)
+    y = _inputs(d, rep.inputs, y)
+    if len(rep.ages) > 1:
+        _chart(d, rep, (MARGIN, y + 100, PAGE[0] - MARGIN, min(y + 700, PAGE[1] - 300)))
+    for i, note in enumerate(rep.notes):
+        d.text((MARGIN, PAGE[1] - 140 + i * 28), note, font=_font(17), fill=MUTED)
+    pages.append(img)
+
+    rows = [(f"{a:.1f}", money(inv), money(req)) for a, inv, req in zip(rep.ages, rep.invested, rep.required)]
+    for start in range(0, len(rows), ROWS_PER_PAGE):
+        check_cancel(cancel)
+        img, d = _page()
+        y = _header(d, "Snapshots (every ~6 months)", len(pages) + 1)
+        _table(d, rows[start:start + ROWS_PER_PAGE], y)
+        pages.append(img)
+
+    check_cancel(cancel)
+    buf = io.BytesIO()
+    pages[0].save(buf, format="PDF", resolution=DPI, save_all=True, append_images=pages[1:],
+                  title=rep.title, author="FIRE Calculator")
+    return np.frombuffer(buf.getvalue(), dtype=np.uint8)
+
+
+REPORTS = JobRunner(max_workers=max(1, int(os.environ.get("FIRE_REPORT_WORKERS", "2"))), max_results=16, disk=DISK)
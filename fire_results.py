@@ -0,0 +1,261 @@
+"""Compact projection results shared across sessions, plus per-session memory accounting.
+
+A ``ProjectionResult`` keeps headline numbers as plain floats and the
+trajectory as float32 arrays. Results live once per process in ``STORE``,
+keyed by a hash of the inputs, so sessions with identical inputs share one
+record and a session only holds the key. With ``FIRE_CACHE_DB`` set, the
+store is backed by a SQLite file (WAL mode) that every worker process of a
+multi-worker deployment reads and writes.
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Result record
+# -----------------------------
+
+class ProjectionResult:
+    """Everything the output area needs for one input set."""
+    __slots__ = ("key", "required_corpus", "projected_corpus", "age_reached", "reached",
+                 "corpus_when_reached", "coast_age", "ages", "invested", "required")
+
+    def __init__(self, key: str, required_corpus: float, projected_corpus: float, age_reached: float,
+                 corpus_when_reached: float, coast_age: Optional[float], traj_df: pd.DataFrame,
+                 reached: bool = True):
+        self.key = key
+        self.required_corpus = float(required_corpus)
+        self.projected_corpus = float(projected_corpus)
+        self.age_reached = float(age_reached)
+        self.reached = bool(reached)          # False: FI not by max_age (age_reached is then max_age)
+        self.corpus_when_reached = float(corpus_when_reached)
+        self.coast_age = None if coast_age is None else float(coast_age)
+        cols = traj_df if not traj_df.empty else {"Age": [], "Invested Corpus": [], "Required Corpus": []}
+        self.ages = np.asarray(cols["Age"], dtype=np.float32)
+        self.invested = np.asarray(cols["Invested Corpus"], dtype=np.float32)
+        self.required = np.asarray(cols["Required Corpus"], dtype=np.float32)
+
+    def frame(self) -> pd.DataFrame:
+        """Trajectory as a DataFrame for charts/tables (built on demand, not stored)."""
+        return pd.DataFrame({"Age": self.ages, "Invested Corpus": self.invested,
+                             "Required Corpus": self.required})
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Plain arrays for the disk cache (``coast_age`` None as NaN, ``reached`` as 0/1)."""
+        head = [self.required_corpus, self.projected_corpus, self.age_reached, self.corpus_when_reached,
+                np.nan if self.coast_age is None else self.coast_age, float(self.reached)]
+        return {"key": np.array(self.key), "head": np.array(head), "ages": self.ages,
+                "invested": self.invested, "required": self.required}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "ProjectionResult":
+        res = cls.__new__(cls)
+        res.key = str(np.asarray(arrays["key"]).reshape(-1)[0])
+        head = [float(x) for x in arrays["head"]]
+        if len(head) != 6:
+            raise ValueError("result arrays written by an older version (no reached flag)")
+        (res.required_corpus, res.projected_corpus, res.age_reached, res.corpus_when_reached,
+         coast_age, reached) = head
+        res.reached = bool(reached)
+        res.coast_age = None if np.isnan(coast_age) else coast_age
+        res.ages, res.invested, res.required = arrays["ages"], arrays["invested"], arrays["required"]
+        return res
+
+    def nbytes(self) -> int:
+        return (sys.getsizeof(self) + self.ages.nbytes + self.invested.nbytes + self.required.nbytes
+                + 5 * sys.getsizeof(0.0) + sys.getsizeof(self.key))
+
+
+def input_key(**inputs) -> str:
+    """Stable hash of the inputs (order-independent, floats by ``repr``)."""
+    canon = repr(sorted((k, _canon(v)) for k, v in inputs.items()))
+    return hashlib.blake2b(canon.encode(), digest_size=16).hexdigest()
+
+
+def _canon(v):
+    if isinstance(v, pd.DataFrame):
+        return tuple(map(tuple, v.astype(object).where(v.notna(), None).itertuples(index=False)))
+    if isinstance(v, np.ndarray):
+        return tuple(v.tolist())
+    if isinstance(v, (list, tuple)):
+        return tuple(_canon(x) for x in v)
+    if isinstance(v, float):
+        return repr(v)
+    return v
+
+
+# -----------------------------
+# Process-wide shared store
+# -----------------------------
+
+class ResultStore:
+    """Thread-safe LRU of ``ProjectionResult`` by input key, shared by all sessions.
+
+    An optional ``backend`` (e.g. ``SQLiteBackend``) is a second, cross-process
+    level: checked on a local miss and written on every put.
+    """
+
+    def __init__(self, max_entries: int = 256, backend=None):
+        self.max_entries = max_entries
+        self.backend = backend
+        self._items: "OrderedDict[str, ProjectionResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    def get(self, key: str) -> Optional[ProjectionResult]:
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> Optional[ProjectionResult]:
+        res = self._items.get(key)
+        if res is not None:
+            self._items.move_to_end(key)
+            return res
+        if self.backend is not None:
+            res = self.backend.get(key)
+            if res is not None:
+                self.shared_hits += 1
+                self._remember(res, key)
+        return res
+
+    def put(self, res: ProjectionResult, key: Optional[str] = None) -> ProjectionResult:
+        """Store ``res`` under ``key`` (default: its own input key)."""
+        with self._lock:
+            self._remember(res, key or res.key)
+            if self.backend is not None:
+                self.backend.put(res, key)
+        return res
+
+    def _remember(self, res: ProjectionResult, key: str) -> None:
+        self._items[key] = res
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def get_or_compute(self, key: str, compute: Callable[[], ProjectionResult]) -> ProjectionResult:
+        """Stored result for ``key``, else ``compute()`` (run outside the lock) stored and returned."""
+        with self._lock:
+            res = self._get(key)
+            if res is not None:
+                self.hits += 1
+                return res
+            self.misses += 1
+        return self.put(compute())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(r.nbytes() for r in self._items.values())
+
+
+class SQLiteBackend:
+    """Results shared between worker processes through one SQLite file in WAL mode.
+
+    WAL lets every worker read while one writes. Rows past ``max_rows`` are
+    trimmed oldest-first every ``trim_every`` puts. Values are pickled, so the
+    file must only be writable by the app itself.
+    """
+
+    def __init__(self, path: str, max_rows: int = 20000, trim_every: int = 200):
+        self.path = path
+        self.max_rows = max_rows
+        self.trim_every = trim_every
+        self._local = threading.local()
+        self._puts = 0
+        with self._conn() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB, created REAL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[ProjectionResult]:
+        try:
+            row = self._conn().execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        res = pickle.loads(row[0]) if row else None
+        return res if hasattr(res, "reached") else None      # rows pickled before the reached flag: recompute
+
+    def put(self, res: ProjectionResult, key: Optional[str] = None) -> None:
+        try:
+            with self._conn() as conn:
+                conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                             (key or res.key, pickle.dumps(res, protocol=pickle.HIGHEST_PROTOCOL), time.time()))
+                self._puts += 1
+                if self._puts % self.trim_every == 0:
+                    conn.execute("DELETE FROM results WHERE key IN (SELECT key FROM results "
+                                 "ORDER BY created DESC LIMIT -1 OFFSET ?)", (self.max_rows,))
+        except sqlite3.Error:
+            pass    # the shared level is best-effort; the local LRU still has the result
+
+
+# -----------------------------
+# Per-session memory accounting
+# -----------------------------
+
+def deep_sizeof(obj, _seen=None) -> int:
+    """Approximate bytes held by ``obj`` (NumPy/pandas aware, shared objects counted once)."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (0 if obj.flags.owndata else obj.nbytes)
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(obj, pd.DataFrame) else usage)
+    if isinstance(obj, ProjectionResult):
+        return obj.nbytes()
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(x, seen) for x in obj)
+    return size
+
+
+class SessionLedger:
+    """Last-known bytes held by each session; entries expire after ``ttl`` seconds idle."""
+
+    def __init__(self, ttl: float = 1800.0):
+        self.ttl = ttl
+        self._rows: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, session_id: str, state_bytes: int, result_key: Optional[str]) -> None:
+        now = time.time()
+        with self._lock:
+            self._rows[session_id] = {"bytes": state_bytes, "result_key": result_key, "seen": now}
+            for sid in [s for s, r in self._rows.items() if now - r["seen"] > self.ttl]:
+                del self._rows[sid]
+
+    def frame(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [{"Session": sid[:8], "Session state (bytes)": r["bytes"],
+                     "Result key": (r["result_key"] or "")[:12],
+                     "Idle (s)": round(time.time() - r["seen"], 1)} for sid, r in self._rows.items()]
+        return pd.DataFrame(rows, columns=["Session", "Session state (bytes)", "Result key", "Idle (s)"])
+
+
+STORE = ResultStore(backend=SQLiteBackend(os.environ["FIRE_CACHE_DB"]) if os.environ.get("FIRE_CACHE_DB") else None)
+LEDGER = SessionLedger()
@@ -0,0 +1,193 @@
+"""Shareable scenario links: the whole sidebar packed into one short query parameter.
+
+``encode`` packs the inputs in ``FIELDS`` order with ``struct`` (₹ amounts as
+float64, rates and multipliers as float32, ages and whole percentages as
+bytes, choices as their index, on/off switches as bits of one byte), then the
+goals table, behind a version byte, and base64url-encodes the result without
+padding. ``decode`` reverses it and rejects unknown versions or malformed
+codes with ``ValueError``. Float32 values are rounded back to the slider
+precision, so a decoded link reproduces the exact inputs (and result key).
+
+A link can also carry its computed result: ``remember_result`` stores the
+``ProjectionResult`` under the code, and ``prewarm`` puts it back into
+``STORE`` under its input key when the link is opened, so the cards render
+without running the projection loop. With ``FIRE_DISK_CACHE`` set the result
+goes to the disk cache and survives restarts; without it, it is kept in
+``STORE`` itself (and its SQLite level, if any) for as long as the LRU holds
+it::
+
+    python fire_share.py            # size and speed of encode/decode
+"""
+import argparse
+import base64
+import json
+import struct
+import sys
+import time
+from typing import Optional
+from urllib.parse import urlencode
+
+from fire_diskcache import DISK, DiskCache
+from fire_results import STORE, ProjectionResult, ResultStore
+
+VERSION = 1
+PARAM = "s"
+
+SIP_MODES = ("Fixed amount", "% of income")
+SIP_STEPS = (None, "Track salary hike", "Custom rate")
+FIRE_TYPES = ("Lean FIRE", "Barista FIRE", "Fat FIRE")
+GOAL_TYPES = ("Outflow", "Inflow")
+
+# (name, struct code, choices); "?" fields are packed together as bits
+FIELDS = (
+    ("current_age", "B", None), ("target_age", "B", None),
+    ("monthly_income", "d", None), ("monthly_expense", "d", None), ("current_corpus", "d", None),
+    ("sip_mode", "B", SIP_MODES), ("sip_pct", "B", None), ("monthly_sip", "d", None),
+    ("inflation", "f", None), ("income_growth", "f", None), ("pre_ret_return", "f", None),
+    ("post_ret_return", "f", None), ("swr", "f", None),
+    ("sip_step", "B", SIP_STEPS), ("sip_custom", "f", None),
+    ("tax_aware", "?", None), ("equity_pct", "B", None), ("epf_ppf_pct", "B", None), ("gain_pct", "B", None),
+    ("fire_type", "B", FIRE_TYPES), ("lean_mult", "f", None), ("barista_pct", "B", None), ("fat_mult", "f", None),
+    ("career_break", "?", None), ("break_age", "B", None), ("break_years", "f", None), ("break_pay", "B", None),
+    ("spouse_income", "d", None), ("spouse_hike", "f", None), ("spouse_retire_age", "B", None),
+)
+DEFAULTS = {
+    "current_age": 30, "target_age": 45, "monthly_income": 150000.0, "monthly_expense": 80000.0,
+    "current_corpus": 1000000.0, "sip_mode": "Fixed amount", "sip_pct": 30, "monthly_sip": 30000.0,
+    "inflation": 6.0, "income_growth": 8.0, "pre_ret_return": 11.0, "post_ret_return": 7.0, "swr": 4.0,
+    "sip_step": "Track salary hike", "sip_custom": 8.0,
+    "tax_aware": False, "tax_version": None, "equity_pct": 60, "epf_ppf_pct": 10, "gain_pct": 50,
+    "fire_type": "Barista FIRE", "lean_mult": 0.8, "barista_pct": 40, "fat_mult": 1.5,
+    "career_break": False, "break_age": None, "break_years": 1.0, "break_pay": 0,
+    "spouse_income": 0.0, "spouse_hike": 6.0, "spouse_retire_age": None,
+    "goals": (),          # (name, age, amount, inflation %, type) rows
+}
+FLOAT_DIGITS = 4          # slider steps are 0.05 or coarser
+OPTIONAL = ("break_age", "spouse_retire_age")    # None (the app's own default) is stored as 0
+
+_PACKED = [f for f in FIELDS if f[1] != "?"]
+_FLAGS = [f[0] for f in FIELDS if f[1] == "?"]
+_FIXED = struct.Struct("<B" + "".join(code for _, code, _ in _PACKED) + "B")    # version, fields, flags
+_GOAL = struct.Struct("<BdfB")                                                  # age, amount, inflation, type
+
+# -----------------------------
+# Encoding
+# -----------------------------
+
+def _text(s: Optional[str]) -> bytes:
+    raw = (s or "").encode()[:255]
+    return bytes([len(raw)]) + raw
+
+def encode(state: dict) -> str:
+    """URL-safe code for ``state`` (missing keys take ``DEFAULTS``)."""
+    state = {**DEFAULTS, **state}
+    values = [choices.index(state[name]) if choices else state[name] or 0 if name in OPTIONAL else state[name]
+              for name, _, choices in _PACKED]
+    flags = sum(1 << i for i, name in enumerate(_FLAGS) if state[name])
+    out = [_FIXED.pack(VERSION, *values, flags), _text(state["tax_version"]), bytes([len(state["goals"])])]
+    for name, age, amount, infl, kind in state["goals"][:255]:
+        out.append(_text(name) + _GOAL.pack(int(age), float(amount), float(infl), GOAL_TYPES.index(kind)))
+    return base64.urlsafe_b64encode(b"".join(out)).rstrip(b"=").decode()
+
+def decode(code: str) -> dict:
+    """Inverse of ``encode``; raises ``ValueError`` for anything that is not a valid code."""
+    try:
+        raw = base64.urlsafe_b64decode(code + "=" * (-len(code) % 4))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"not a share code: {e}") from None
+    if not raw or raw[0] != VERSION:
+        raise ValueError(f"unsupported share code version {raw[0] if raw else None}")
+    try:
+        version, *values, flags = _FIXED.unpack_from(raw)
+        pos = _FIXED.size
+        state = {}
+        for (name, code_, choices), v in zip(_PACKED, values):
+            state[name] = choices[v] if choices else round(v, FLOAT_DIGITS) if code_ == "f" else v
+            if name in OPTIONAL and v == 0:
+                state[name] = None
+        state.update({name: bool(flags >> i & 1) for i, name in enumerate(_FLAGS)})
+        n = raw[pos]
+        state["tax_version"] = raw[pos + 1:pos + 1 + n].decode() or None
+        pos += 1 + n
+        goals = []
+        for _ in range(raw[pos]):
+            n = raw[pos + 1]
+            name = raw[pos + 2:pos + 2 + n].decode()
+            age, amount, infl, kind = _GOAL.unpack_from(raw, pos + 2 + n)
+            goals.append((name, age, amount, round(infl, FLOAT_DIGITS), GOAL_TYPES[kind]))
+            pos += 1 + n + _GOAL.size
+        state["goals"] = tuple(goals)
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"malformed share code: {e}") from None
+    if not 18 <= state["current_age"] < state["target_age"] <= 80:
+        raise ValueError("share code has ages out of range")
+    return state
+
+def query_string(state: dict) -> str:
+    return urlencode({PARAM: encode(state)})
+
+
+# -----------------------------
+# Result prewarm
+# -----------------------------
+
+def remember_result(code: str, res: ProjectionResult, store: ResultStore = STORE,
+                    disk: Optional[DiskCache] = DISK) -> None:
+    """Keep ``res`` under the link's code: on disk (survives a restart) or, without one, in ``store``."""
+    if disk is not None:
+        disk.put(f"share:{code}", res.to_arrays())
+    else:
+        store.put(res, key=f"share:{code}")
+
+def prewarm(code: str, store: ResultStore = STORE, disk: Optional[DiskCache] = DISK) -> Optional[str]:
+    """Load the result stored for ``code`` into ``store``; returns its result key, if any."""
+    if disk is not None:
+        arrays = disk.get(f"share:{code}")
+        try:
+            res = None if arrays is None else ProjectionResult.from_arrays(arrays)
+        except ValueError:
+            res = None                       # stored by an older version: the app recomputes it
+    else:
+        res = store.get(f"share:{code}")
+    if res is None:
+        return None
+    if store.get(res.key) is None:
+        store.put(res)
+    return res.key
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+
+def benchmark(n: int = 20000) -> dict:
+    goals = (("Child education", 48, 2500000.0, 8.0, "Outflow"), ("Home", 38, 4000000.0, 6.0, "Outflow"))
+    report = {}
+    for label, state in (("defaults", {}), ("two goals", {"goals": goals, "tax_aware": True, "tax_version": "FY2025-26"})):
+        full = {**DEFAULTS, **state}
+        code = encode(state)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            encode(state)
+        t_enc = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for _ in range(n):
+            decode(code)
+        t_dec = time.perf_counter() - t0
+        assert decode(code) == {**full, "goals": tuple(full["goals"])}
+        as_json = base64.urlsafe_b64encode(json.dumps(full, separators=(",", ":")).encode()).rstrip(b"=")
+        report[label] = {"code_chars": len(code), "json_base64_chars": len(as_json),
+                         "plain_query_chars": len(urlencode({k: v for k, v in full.items() if k != "goals"})),
+                         "encode_us": round(t_enc / n * 1e6, 2), "decode_us": round(t_dec / n * 1e6, 2)}
+    return report
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", type=int, default=20000, help="encode/decode repetitions")
+    args = parser.parse_args(argv)
+    print(json.dumps(benchmark(args.n), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Indian tax rules for the withdrawal phase (slabs, LTCG, EPF/PPF).
+
+Rule tables are versioned by financial year. Each table is turned once into a
+piecewise-linear lookup (knots + slopes), so evaluating tax for any number of
+months / scenarios is a single ``np.searchsorted`` instead of Python branching.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+
+# -----------------------------
+# Versioned rule tables
+# -----------------------------
+
+@dataclass(frozen=True)
+class TaxRules:
+    """One financial year's rules (new regime, resident individual)."""
+    version: str
+    slab_floors: Tuple[float, ...]   # lower bound of each slab (annual ₹)
+    slab_rates: Tuple[float, ...]    # marginal rate of each slab
+    rebate_limit: float              # Sec 87A: no tax up to this income (with marginal relief)
+    cess: float                      # health & education cess on tax
+    ltcg_rate: float                 # listed equity / equity MF LTCG rate
+    ltcg_exemption: float            # annual LTCG exempt amount
+    debt_indexation: bool            # debt LTCG taxed at flat rate on indexed gains
+    debt_ltcg_rate: float = 0.20     # only used when debt_indexation is True
+    epf_ppf_tax_free: bool = True    # PPF (EEE) and EPF after 5 yrs of service
+
+
+RULES: Dict[str, TaxRules] = {
+    "FY2023-24": TaxRules(
+        version="FY2023-24",
+        slab_floors=(0, 300000, 600000, 900000, 1200000, 1500000),
+        slab_rates=(0.0, 0.05, 0.10, 0.15, 0.20, 0.30),
+        rebate_limit=700000,
+        cess=0.04,
+        ltcg_rate=0.10,
+        ltcg_exemption=100000,
+        debt_indexation=False,
+    ),
+    "FY2024-25": TaxRules(
+        version="FY2024-25",
+        slab_floors=(0, 300000, 700000, 1000000, 1200000, 1500000),
+        slab_rates=(0.0, 0.05, 0.10, 0.15, 0.20, 0.30),
+        rebate_limit=700000,
+        cess=0.04,
+        ltcg_rate=0.125,
+        ltcg_exemption=125000,
+        debt_indexation=False,
+    ),
+    "FY2025-26": TaxRules(
+        version="FY2025-26",
+        slab_floors=(0, 400000, 800000, 1200000, 1600000, 2000000, 2400000),
+        slab_rates=(0.0, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30),
+        rebate_limit=1200000,
+        cess=0.04,
+        ltcg_rate=0.125,
+        ltcg_exemption=125000,
+        debt_indexation=False,
+    ),
+}
+DEFAULT_RULES_VERSION = "FY2025-26"
+
+
+@dataclass(frozen=True)
+class WithdrawalMix:
+    """Where each rupee of withdrawal comes from, and how much of it is gain."""
+    equity: float = 0.6          # equity MFs / stocks (LTCG)
+    debt: float = 0.3            # debt MFs, FDs (slab, or indexed LTCG)
+    epf_ppf: float = 0.1         # EPF / PPF (tax-free if rules allow)
+    gain_fraction: float = 0.5   # share of an equity/debt withdrawal that is gain
+    holding_years: float = 5.0   # for debt indexation only
+
+
+# -----------------------------
+# Piecewise-linear lookup
+# -----------------------------
+
+@dataclass(frozen=True)
+class TaxTable:
+    """Annual tax as a piecewise-linear function of annual gross amount.
+
+    ``tax(x) = tax_at[i] + slope[i] * (x - knots[i])`` where ``i`` is the last
+    knot <= x. Knots start at 0 and the last slope extends to infinity.
+    """
+    knots: np.ndarray
+    tax_at: np.ndarray
+    slope: np.ndarray
+
+    def tax(self, gross):
+        """Annual tax for annual gross amount(s); works on scalars or arrays."""
+        x = np.maximum(np.asarray(gross, dtype=float), 0.0)
+        i = np.searchsorted(self.knots, x, side="right") - 1
+        return self.tax_at[i] + self.slope[i] * (x - self.knots[i])
+
+    def gross_up(self, net):
+        """Smallest annual gross whose post-tax amount covers ``net``.
+
+        Net income is flat across the marginal-relief segment (slope 1), so a
+        net of exactly the rebate limit maps to the limit itself, while any net
+        just above it jumps to the end of that segment.
+        """
+        n = np.maximum(np.asarray(net, dtype=float), 0.0)
+        net_at = self.knots - self.tax_at   # non-decreasing since slopes <= 1
+        # last knot whose net is strictly below n, so flat segments resolve to their start
+        i = np.maximum(np.searchsorted(net_at, n, side="left") - 1, 0)
+        return self.knots[i] + (n - net_at[i]) / (1.0 - self.slope[i])
+
+
+def _table_from_knots(knots: np.ndarray, tax_fn) -> TaxTable:
+    """Sample an exact piecewise-linear ``tax_fn`` at its knots."""
+    knots = np.unique(np.asarray(knots, dtype=float))
+    tax_at = np.array([tax_fn(k) for k in knots])
+    # slope of each segment; the open last segment uses a point one rupee past it
+    nxt = np.append(knots[1:], knots[-1] + 1.0)
+    nxt_tax = np.append(tax_at[1:], tax_fn(knots[-1] + 1.0))
+    slope = (nxt_tax - tax_at) / (nxt - knots)
+    return TaxTable(knots=knots, tax_at=tax_at, slope=slope)
+
+
+def _slab_tax_scalar(rules: TaxRules, income: float) -> float:
+    floors = rules.slab_floors
+    tax = 0.0
+    for j, rate in enumerate(rules.slab_rates):
+        hi = floors[j + 1] if j + 1 < len(floors) else np.inf
+        if income > floors[j]:
+            tax += (min(income, hi) - floors[j]) * rate
+    tax *= (1 + rules.cess)
+    if income <= rules.rebate_limit:
+        return 0.0
+    # marginal relief: tax never exceeds income above the rebate limit
+    return min(tax, income - rules.rebate_limit)
+
+
+@lru_cache(maxsize=None)
+def slab_table(rules: TaxRules) -> TaxTable:
+    """Slab tax (incl. cess, 87A rebate and marginal relief) as a lookup table."""
+    floors = np.asarray(rules.slab_floors, dtype=float)
+    knots = list(floors) + [rules.rebate_limit]
+    # end of marginal relief: where slab tax catches up with (income - limit)
+    for j, rate in enumerate(rules.slab_rates):
+        lo = floors[j]
+        hi = floors[j + 1] if j + 1 < len(floors) else np.inf
+        r = rate * (1 + rules.cess)
+        if r >= 1:
+            continue
+        base = sum((floors[k + 1] - floors[k]) * rules.slab_rates[k] for k in range(j)) * (1 + rules.cess)
+        x = (base - r * lo + rules.rebate_limit) / (1 - r)
+        if max(lo, rules.rebate_limit) < x < hi:
+            knots.append(x)
+    return _table_from_knots(np.array(knots), lambda v: _slab_tax_scalar(rules, v))
+
+
+@lru_cache(maxsize=None)
+def withdrawal_table(rules: TaxRules, mix: WithdrawalMix, inflation: float = 0.06) -> TaxTable:
+    """Tax on an annual gross withdrawal drawn per ``mix``.
+
+    Equity gains pay LTCG above the exemption; debt gains go to the slab (or a flat
+    rate on indexed gains when ``rules.debt_indexation``); EPF/PPF is tax-free when
+    the rules say so, otherwise it is taxed at slab in full.
+    """
+    total = mix.equity + mix.debt + mix.epf_ppf
+    eq, debt, epf = (mix.equity / total, mix.debt / total, mix.epf_ppf / total) if total > 0 else (0.0, 0.0, 0.0)
+    g = mix.gain_fraction
+    if rules.debt_indexation:
+        indexed_cost = (1 - g) * (1 + inflation) ** mix.holding_years
+        debt_gain = max(0.0, 1 - indexed_cost)
+        slab_share = 0.0 if rules.epf_ppf_tax_free else epf
+    else:
+        debt_gain = 0.0
+        slab_share = debt * g + (0.0 if rules.epf_ppf_tax_free else epf)
+    ltcg_share = eq * g
+    slabs = slab_table(rules)
+
+    def tax_fn(w: float) -> float:
+        ltcg = max(0.0, ltcg_share * w - rules.ltcg_exemption) * rules.ltcg_rate * (1 + rules.cess)
+        indexed = debt * debt_gain * w * rules.debt_ltcg_rate * (1 + rules.cess)
+        return ltcg + indexed + float(slabs.tax(slab_share * w))
+
+    knots = [0.0]
+    if ltcg_share > 0:
+        knots.append(rules.ltcg_exemption / ltcg_share)
+    if slab_share > 0:
+        knots.extend(slabs.knots / slab_share)
+    return _table_from_knots(np.array(knots), tax_fn)
+
+
+def get_rules(version: str = DEFAULT_RULES_VERSION) -> TaxRules:
+    """Look up a rule table by financial-year label."""
+    if version not in RULES:
+        raise ValueError(f"Unknown tax rules version {version!r}; choose from {sorted(RULES)}")
+    return RULES[version]
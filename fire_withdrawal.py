@@ -0,0 +1,192 @@
+"""Retirement withdrawal strategies evaluated on many return paths at once.
+
+Every strategy works on whole ``(paths,)`` vectors: it sees the corpus of every
+path for the current month and returns the withdrawal for every path. The
+comparison runner steps all strategies through one shared path set in a single
+pass over the months.
+"""
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from fire_jobs import check_cancel
+from fire_montecarlo import cached_growth_paths
+
+# -----------------------------
+# Strategy interface
+# -----------------------------
+
+class WithdrawalStrategy(ABC):
+    """Base class. Amounts are set once a year and paid in 12 equal monthly parts."""
+    name = "Strategy"
+
+    def start(self, corpus: np.ndarray, annual_expense: float, inflation: float, years: int) -> None:
+        """Called once before month 0 with the starting corpus of every path."""
+        self.inflation = inflation
+        self.years = years
+        self.annual = np.full_like(corpus, annual_expense)
+
+    @abstractmethod
+    def yearly(self, year: int, corpus: np.ndarray, last_year_growth: np.ndarray) -> np.ndarray:
+        """Annual withdrawal for every path at the start of ``year`` (year 0 = FI)."""
+
+    def monthly(self, month: int, corpus: np.ndarray, last_year_growth: np.ndarray) -> np.ndarray:
+        if month % 12 == 0:
+            self.annual = self.yearly(month // 12, corpus, last_year_growth)
+        return self.annual / 12
+
+
+class FixedSWR(WithdrawalStrategy):
+    """Classic SWR: year-one amount, then raised with inflation regardless of markets."""
+    name = "Fixed SWR (inflation-adjusted)"
+
+    def yearly(self, year, corpus, last_year_growth):
+        return self.annual if year == 0 else self.annual * (1 + self.inflation)
+
+
+class ConstantPercentage(WithdrawalStrategy):
+    """Withdraw a fixed percentage of whatever the corpus is each year."""
+    name = "Constant percentage"
+
+    def __init__(self, rate: float = 0.04):
+        self.rate = rate
+
+    def yearly(self, year, corpus, last_year_growth):
+        return np.maximum(corpus, 0.0) * self.rate
+
+
+class VariablePercentage(WithdrawalStrategy):
+    """VPW: amortise the corpus over the remaining years at an assumed return."""
+    name = "Variable percentage (VPW)"
+
+    def __init__(self, assumed_return: float = 0.05):
+        self.assumed_return = assumed_return
+
+    def yearly(self, year, corpus, last_year_growth):
+        n = max(self.years - year, 1)
+        r = self.assumed_return
+        rate = 1.0 / n if r == 0 else r / (1 - (1 + r) ** -n)
+        return np.maximum(corpus, 0.0) * rate
+
+
+class GuytonKlinger(WithdrawalStrategy):
+    """Guyton-Klinger guardrails on top of an inflation-adjusted base amount.
+
+    - Skip the inflation raise after a losing year if the current rate is above the initial one.
+    - Capital preservation: cut by ``adjust`` when the rate exceeds initial x (1 + ``band``).
+    - Prosperity: raise by ``adjust`` when the rate falls below initial x (1 - ``band``).
+    """
+    name = "Guyton-Klinger guardrails"
+
+    def __init__(self, band: float = 0.20, adjust: float = 0.10):
+        self.band = band
+        self.adjust = adjust
+
+    def start(self, corpus, annual_expense, inflation, years):
+        super().start(corpus, annual_expense, inflation, years)
+        self.initial_rate = annual_expense / np.maximum(corpus, 1e-9)
+
+    def yearly(self, year, corpus, last_year_growth):
+        if year == 0:
+            return self.annual
+        safe = np.maximum(corpus, 1e-9)
+        current_rate = self.annual / safe
+        freeze = (last_year_growth < 1.0) & (current_rate > self.initial_rate)
+        annual = np.where(freeze, self.annual, self.annual * (1 + self.inflation))
+        rate = annual / safe
+        annual = np.where(rate > self.initial_rate * (1 + self.band), annual * (1 - self.adjust), annual)
+        annual = np.where(rate < self.initial_rate * (1 - self.band), annual * (1 + self.adjust), annual)
+        return annual
+
+
+def default_strategies(swr: float, assumed_return: float) -> List[WithdrawalStrategy]:
+    return [FixedSWR(), ConstantPercentage(swr), VariablePercentage(assumed_return), GuytonKlinger()]
+
+
+# -----------------------------
+# Batch comparison
+# -----------------------------
+
+@dataclass
+class StrategyResult:
+    name: str
+    success_rate: float          # share of paths never depleted
+    median_terminal: float       # nominal ₹ at the end of the horizon
+    median_real_income: float    # median of average yearly withdrawal, in today's ₹ at FI
+    p10_real_income: float       # 10th percentile of the same
+    worst_year_cut: float        # median of the largest year-on-year real cut
+
+
+def compare_strategies(strategies: Sequence[WithdrawalStrategy], start_corpus: float,
+                       annual_expense: float, growth: np.ndarray, inflation: float,
+                       cancel: Optional[threading.Event] = None) -> List[StrategyResult]:
+    """Run every strategy over the same ``(paths, months)`` growth factors in one pass.
+
+    Withdrawals are taken at the start of each month, then the corpus grows.
+    A path that runs dry stays at zero and pays nothing further.
+    """
+    n_paths, n_months = growth.shape
+    years = -(-n_months // 12)
+    k = len(strategies)
+    corpus = np.full((k, n_paths), float(start_corpus))
+    alive = np.ones((k, n_paths), dtype=bool)
+    yearly_paid = np.zeros((k, n_paths, years))
+    last_year_growth = np.ones(n_paths)
+    year_growth = np.ones(n_paths)
+    for s in strategies:
+        s.start(corpus[0].copy(), annual_expense, inflation, years)
+
+    for m in range(n_months):
+        if m % 12 == 0:
+            check_cancel(cancel)
+        if m % 12 == 0 and m > 0:
+            last_year_growth, year_growth = year_growth, np.ones(n_paths)
+        for i, s in enumerate(strategies):
+            w = np.where(alive[i], np.minimum(s.monthly(m, corpus[i], last_year_growth), np.maximum(corpus[i], 0.0)), 0.0)
+            corpus[i] -= w
+            yearly_paid[i, :, m // 12] += w
+        corpus *= growth[:, m]
+        year_growth = year_growth * growth[:, m]
+        alive &= corpus > 1.0
+
+    real = yearly_paid * (1 + inflation) ** -np.arange(years)
+    results = []
+    for i, s in enumerate(strategies):
+        avg_real = real[i].mean(axis=1)
+        if years > 1:
+            cuts = 1 - real[i, :, 1:] / np.maximum(real[i, :, :-1], 1e-9)
+        else:
+            cuts = np.zeros((n_paths, 1))
+        results.append(StrategyResult(
+            name=s.name,
+            success_rate=float(alive[i].mean()),
+            median_terminal=float(np.median(corpus[i])),
+            median_real_income=float(np.median(avg_real)),
+            p10_real_income=float(np.percentile(avg_real, 10)),
+            worst_year_cut=float(np.median(np.clip(cuts.max(axis=1), 0.0, 1.0))),
+        ))
+    return results
+
+
+def results_frame(results: Sequence[StrategyResult]) -> pd.DataFrame:
+    """Comparison table for display."""
+    return pd.DataFrame([{
+        "Strategy": r.name,
+        "Success rate": r.success_rate,
+        "Median yearly income (today's ₹ at FI)": r.median_real_income,
+        "Bad-case (p10) yearly income": r.p10_real_income,
+        "Typical worst yearly cut": r.worst_year_cut,
+        "Median corpus left": r.median_terminal,
+    } for r in results])
+
+
+def strategy_table(swr: float, post_ret_return: float, start_corpus: float, n_paths: int, n_months: int,
+                   annual_vol: float, inflation: float, cancel: Optional[threading.Event] = None) -> pd.DataFrame:
+    """Default strategies on the shared cached path set, as a display table."""
+    growth = cached_growth_paths(n_paths, n_months, post_ret_return, annual_vol)
+    return results_frame(compare_strategies(default_strategies(swr, post_ret_return), start_corpus,
+                                            swr * start_corpus, growth, inflation, cancel=cancel))
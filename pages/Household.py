@@ -0,0 +1,95 @@
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+from fire_engine import SCENARIO_DEFAULTS, best_unit, rupee_indian, target_corpus
+from fire_household import Household, Member, household_fi
+
+FIRE_TYPES = ["Lean FIRE", "Barista FIRE", "Fat FIRE"]
+PRIMARY_BLUE = "#034EA2"
+ACCENT_ORANGE = "#F79421"
+
+# -----------------------------
+# Household (two earners)
+# -----------------------------
+st.set_page_config(page_title="Household — FIRE Calculator", page_icon=None, layout="wide")
+st.title("Household plan")
+st.caption("Two earners, one shared corpus: each keeps their own age, salary, SIP and retirement age.")
+
+def member_inputs(col, label: str, age: int, income: float, sip: float, retire: int) -> Member:
+    with col:
+        st.subheader(label)
+        name = st.text_input("Name", value=label, key=f"{label}_name")
+        current_age = st.number_input("Current age", 18, 75, age, 1, key=f"{label}_age")
+        monthly_income = st.number_input("Monthly income (₹)", 0.0, value=income, step=5000.0, format="%.0f",
+                                         key=f"{label}_income")
+        hike = st.slider("Yearly salary hike (%)", 0.0, 20.0, 8.0, 0.25, key=f"{label}_hike") / 100.0
+        as_pct = st.toggle("SIP as % of income", value=False, key=f"{label}_pct_mode")
+        if as_pct:
+            sip_pct = st.slider("SIP (% of income)", 0, 80, 25, 1, key=f"{label}_pct")
+            monthly_sip, sip_growth = 0.0, 0.0
+        else:
+            sip_pct = None
+            monthly_sip = st.number_input("Monthly SIP (₹)", 0.0, value=sip, step=1000.0, format="%.0f",
+                                          key=f"{label}_sip")
+            sip_growth = st.slider("SIP step-up per year (%)", 0.0, 30.0, 8.0, 0.5, key=f"{label}_step") / 100.0
+        corpus = st.number_input("Current corpus (₹)", 0.0, value=500000.0, step=50000.0, format="%.0f",
+                                 key=f"{label}_corpus")
+        retire_age = st.number_input("Stops working at age", current_age + 1, 80, max(retire, current_age + 1), 1,
+                                     key=f"{label}_retire")
+    return Member(name=name or label, current_age=int(current_age), monthly_income=monthly_income,
+                  yearly_hike=hike, monthly_sip=monthly_sip, sip_growth=sip_growth, sip_pct=sip_pct,
+                  current_corpus=corpus, retire_age=retire_age)
+
+c1, c2 = st.columns(2)
+household = Household((member_inputs(c1, "You", 30, 150000.0, 30000.0, 60),
+                       member_inputs(c2, "Partner", 28, 100000.0, 20000.0, 60)))
+
+st.subheader("Shared")
+s1, s2, s3, s4, s5 = st.columns(5)
+monthly_expense = s1.number_input("Household monthly expenses (₹)", 0.0, value=120000.0, step=5000.0, format="%.0f")
+inflation = s2.slider("Inflation (%)", 0.0, 15.0, 6.0, 0.25) / 100.0
+pre_ret_return = s3.slider("Return before FI (%)", 0.0, 20.0, 11.0, 0.25) / 100.0
+swr = s4.slider("SWR (%)", 2.0, 6.0, 4.0, 0.1) / 100.0
+fire_type = s5.selectbox("FIRE mode", FIRE_TYPES, index=FIRE_TYPES.index(SCENARIO_DEFAULTS["fire_type"]))
+lean_mult, barista_cover, fat_mult = 1.0, 0.0, 1.0
+if fire_type == "Lean FIRE":
+    lean_mult = st.slider("Lean lifestyle (x of baseline)", 0.5, 1.0, SCENARIO_DEFAULTS["lean_mult"], 0.05)
+elif fire_type == "Barista FIRE":
+    barista_cover = st.slider("Part-time income covers (%) of expenses", 10, 80,
+                              int(SCENARIO_DEFAULTS["barista_cover"] * 100), 5) / 100.0
+else:
+    fat_mult = st.slider("Fat lifestyle (x of baseline)", 1.0, 2.5, SCENARIO_DEFAULTS["fat_mult"], 0.1)
+
+plan = household_fi(household, pre_ret_return, inflation, monthly_expense,
+                    target_corpus(fire_type, swr, lean_mult, barista_cover, fat_mult))
+
+m = st.columns(1 + len(household.members))
+fi_period = pd.Timestamp.today().to_period("M") + plan.fi_month
+m[0].metric("Household FI", fi_period.strftime("%b %Y") if plan.reached else "Not by 80",
+            f"in {plan.fi_month / 12:.1f} years" if plan.reached else None, delta_color="off")
+for col, (name, age) in zip(m[1:], plan.ages_at_fi.items()):
+    col.metric(f"Age at FI ({name})", f"{age:.1f}" if plan.reached else "—")
+st.write(f"Shared corpus at FI: **{rupee_indian(plan.corpus_when_reached)}**")
+
+traj_df = plan.traj_df
+if not traj_df.empty:
+    unit, div = best_unit(pd.concat([traj_df["Invested Corpus"], traj_df["Required Corpus"]], ignore_index=True))
+    chart_df = traj_df.melt(id_vars="Age", value_vars=["Invested Corpus", "Required Corpus"],
+                            var_name="Series", value_name="Amount")
+    chart_df["AmountScaled"] = chart_df["Amount"] / div
+    corpus_chart = alt.Chart(chart_df).mark_line().encode(
+        x=alt.X("Age:Q", title=f"{household.members[0].name}'s age"),
+        y=alt.Y("AmountScaled:Q", title=f"Amount ({unit})"),
+        color=alt.Color("Series:N", scale=alt.Scale(range=[PRIMARY_BLUE, ACCENT_ORANGE]), legend=alt.Legend(title="")),
+        tooltip=[alt.Tooltip("Age:Q", format=".1f"), "Series", alt.Tooltip("Amount:Q", title="Amount (₹)", format=",.0f")],
+    ).properties(height=340)
+    sip_chart = alt.Chart(plan.contributions).mark_area(opacity=0.8).encode(
+        x=alt.X("Age:Q", title=f"{household.members[0].name}'s age"),
+        y=alt.Y("Monthly SIP:Q", stack=True, title="Monthly SIP (₹)"),
+        color=alt.Color("Member:N", scale=alt.Scale(range=[PRIMARY_BLUE, ACCENT_ORANGE]), legend=alt.Legend(title="")),
+        tooltip=["Member", alt.Tooltip("Age:Q", format=".1f"), alt.Tooltip("Monthly SIP:Q", format=",.0f")],
+    ).properties(height=220)
+    st.altair_chart(corpus_chart, use_container_width=True)
+    st.caption("Who is investing: each member's SIP stacks into the household's (it stops when they stop working).")
+    st.altair_chart(sip_chart, use_container_width=True)
@@ -0,0 +1,26 @@
+import streamlit as st
+
+from fire_counters import ENGINE_CALLS
+from fire_results import LEDGER, STORE
+
+# -----------------------------
+# Session memory accounting
+# -----------------------------
+st.set_page_config(page_title="Session memory — FIRE Calculator", page_icon=None, layout="wide")
+st.title("Session memory")
+st.caption("Bytes held per connected session (widget state + result key) and by the shared result store.")
+
+sessions = LEDGER.frame()
+m1, m2, m3 = st.columns(3)
+m1.metric("Active sessions", len(sessions))
+m2.metric("Session state, total", f"{int(sessions['Session state (bytes)'].sum()):,} B" if len(sessions) else "0 B")
+m3.metric("Shared results", f"{len(STORE)} × ≈{STORE.nbytes() // max(len(STORE), 1):,} B")
+
+st.write(f"Result store hits / misses: **{STORE.hits} / {STORE.misses}**")
+if ENGINE_CALLS:
+    st.caption("Engine calls since start: " + ", ".join(f"{k} {v:,}" for k, v in sorted(ENGINE_CALLS.items())))
+if len(sessions):
+    st.dataframe(sessions.sort_values("Session state (bytes)", ascending=False),
+                 use_container_width=True, hide_index=True)
+else:
+    st.info("No sessions recorded yet — open the calculator in another tab.")
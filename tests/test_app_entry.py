@@ -0,0 +1,14 @@
+import pytest
+
+from fire_engine import DEPLOY_VARIANT, VARIANTS, get_variant
+
+
+def test_unset_variant_serves_the_previously_deployed_layout():
+    assert DEPLOY_VARIANT == "v1"
+    assert get_variant(None) is get_variant("") is VARIANTS["v1"]
+    assert get_variant(None).script == "fire_app_eli.py"
+
+
+def test_unknown_variant_is_rejected():
+    with pytest.raises(ValueError, match="Unknown app variant"):
+        get_variant("v2")
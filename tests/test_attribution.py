@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from fire_attribution import shapley
+from fire_engine import SCENARIO_DEFAULTS
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fire_app_eli_v3_2.py")
+
+
+def test_shares_add_up_to_the_engine_change():
+    after = {**SCENARIO_DEFAULTS, "monthly_sip": 50000.0, "inflation": 0.07}
+    attribution = shapley(SCENARIO_DEFAULTS, after)
+    assert set(attribution.contributions) == {"SIP", "Inflation"}
+    assert attribution.total == pytest.approx(attribution.after - attribution.before)
+
+
+def chart_bytes(at) -> bytes:
+    return b"".join(d.data.data for c in at.get("vega_lite_chart") for d in c.proto.datasets)
+
+
+def test_app_only_credits_inputs_that_changed():
+    AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    next(b for b in at.button if b.label.startswith("Remember these inputs")).click().run()
+    next(n for n in at.number_input if n.label.startswith("Monthly SIP")).set_value(60000.0).run()
+    assert not at.exception
+    assert b"SIP" in chart_bytes(at)
+    assert b"Not modelled" not in chart_bytes(at)           # nothing outside the batch engine moved
+    assert "You also changed" not in " ".join(c.value for c in at.caption)
+
+    next(t for t in at.toggle if t.label.startswith("Account for tax")).set_value(True).run()
+    assert b"Not modelled by the attribution engine" in chart_bytes(at)
+    assert b"Income path" not in chart_bytes(at)
+    assert "You also changed the income path, goals or tax" in " ".join(c.value for c in at.caption)
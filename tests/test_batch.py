@@ -0,0 +1,37 @@
+import io
+
+import pandas as pd
+import pytest
+
+import fire_batch
+import fire_fuzz
+from fire_engine import SCENARIO_DEFAULTS
+
+
+def test_batch_and_fuzz_share_the_engine_defaults():
+    assert fire_batch.DEFAULTS is SCENARIO_DEFAULTS
+    assert fire_fuzz.SIMPLE is SCENARIO_DEFAULTS
+
+
+def test_missing_inputs_take_defaults_and_extra_columns_pass_through(tmp_path):
+    src, out = tmp_path / "in.csv", tmp_path / "out.csv"
+    pd.DataFrame({"client": ["a", "b"], "monthly_sip": [10000.0, 50000.0]}).to_csv(src, index=False)
+    log = io.StringIO()
+    stats = fire_batch.run(str(src), str(out), log=log)
+    result = pd.read_csv(out)
+    assert stats["rows"] == 2
+    assert list(result["client"]) == ["a", "b"]
+    assert "using defaults for variant, current_age" in log.getvalue()
+    assert result["age_reached"].iloc[0] > result["age_reached"].iloc[1]
+
+
+@pytest.mark.parametrize("columns, message", [
+    (["client", "inflaton"], "did you mean 'inflation'"),
+    (["client", "notes"], "none of the columns"),
+])
+def test_bad_headers_stop_before_any_output(tmp_path, columns, message):
+    src, out = tmp_path / "in.csv", tmp_path / "out.csv"
+    pd.DataFrame([[1] * len(columns)], columns=columns).to_csv(src, index=False)
+    with pytest.raises(SystemExit, match=message):
+        fire_batch.run(str(src), str(out), log=io.StringIO())
+    assert not out.exists()
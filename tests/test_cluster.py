@@ -0,0 +1,38 @@
+from fire_cluster import COOKIE, Worker, pick_worker
+
+
+class Up(Worker):
+    def __init__(self, index, alive=True, connections=0):
+        super().__init__(index, 8600 + index, "fire_app.py", {})
+        self._alive, self.connections = alive, connections
+
+    @property
+    def alive(self):
+        return self._alive
+
+
+HEAD = b"GET / HTTP/1.1\r\nHost: example\r\n\r\n"
+
+
+def test_new_sessions_from_one_address_spread_over_workers():
+    workers = [Up(0), Up(1), Up(2)]
+    picked = []
+    for _ in range(6):
+        index, needs_cookie = pick_worker(HEAD, workers)
+        assert needs_cookie
+        workers[index].connections += 1          # the session's websocket stays open
+        picked.append(index)
+    assert sorted(picked) == [0, 0, 1, 1, 2, 2]
+
+
+def test_least_loaded_live_worker_wins():
+    workers = [Up(0, connections=5), Up(1, alive=False), Up(2, connections=1)]
+    assert pick_worker(HEAD, workers) == (2, True)
+
+
+def test_cookie_keeps_a_session_on_its_worker():
+    workers = [Up(0), Up(1, connections=9)]
+    head = HEAD.replace(b"\r\n\r\n", f"\r\nCookie: {COOKIE}=1\r\n\r\n".encode())
+    assert pick_worker(head, workers) == (1, False)
+    workers[1]._alive = False
+    assert pick_worker(head, workers) == (0, True)
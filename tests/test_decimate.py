@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from fire_decimate import (chart_width_px, crossing_indices, decimate_for_chart, decimate_frame, max_points_for,
+                           payload_bytes)
+
+
+def long_trajectory(months: int = 720) -> pd.DataFrame:
+    """Monthly 60-year trajectory whose corpus crosses the required corpus once."""
+    m = np.arange(months)
+    return pd.DataFrame({"Age": 30 + m / 12,
+                         "Invested Corpus": 5e5 * 1.012 ** m,
+                         "Required Corpus": 3e7 * 1.005 ** m})
+
+
+def test_budget_follows_layout_width():
+    assert max_points_for(True) == chart_width_px(True) // 6
+    assert max_points_for(False) > max_points_for(True)
+    assert max_points_for(True, width_px=60) == 30          # never below MIN_POINTS
+
+
+def test_lttb_keeps_crossing_exact_and_saves_bytes():
+    df = long_trajectory()
+    cross = crossing_indices(df["Invested Corpus"].to_numpy(), df["Required Corpus"].to_numpy())
+    assert len(cross) == 2
+
+    chart = decimate_for_chart(df, max_points_for(True))
+    for name in ("Invested Corpus", "Required Corpus"):
+        kept = chart[chart["Series"] == name]
+        assert len(kept) < len(df) / 5
+        for row in cross:                                  # both sides of the crossing, unmoved
+            hit = kept[kept["Age"] == df["Age"].iloc[row]]
+            assert len(hit) == 1 and hit["Amount"].iloc[0] == df[name].iloc[row]
+
+    full = df.melt(id_vars="Age", value_vars=["Invested Corpus", "Required Corpus"],
+                   var_name="Series", value_name="Amount")
+    assert payload_bytes(full) - payload_bytes(chart) > 0
+
+
+def test_decimate_frame_keeps_shared_rows_and_extra_rows():
+    df = long_trajectory().rename(columns={"Invested Corpus": "P10", "Required Corpus": "P90"})
+    small = decimate_frame(df, 40, ["P10", "P90"], keep=[333])
+    assert len(small) < len(df)
+    assert small["Age"].is_monotonic_increasing
+    assert (df["Age"].iloc[333] == small["Age"]).any()
+    assert payload_bytes(df) > payload_bytes(small)
@@ -0,0 +1,35 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from fire_diskcache import MANIFEST, DiskCache
+
+
+def test_round_trip(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    df = pd.DataFrame({"Age": [30.0, 30.5], "P50": [1.0, 2.0]})
+    assert cache.put("k", df)
+    pd.testing.assert_frame_equal(cache.get("k"), df)
+    assert cache.get("missing") is None and cache.misses == 1
+
+
+def test_missing_column_file_drops_the_entry_so_it_can_be_rewritten(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    value = {"a": np.arange(5.0), "b": np.ones(3)}
+    cache.put("k", value)
+    os.remove(os.path.join(cache._path("k"), "1.npy"))
+
+    assert cache.get("k") is None
+    assert not os.path.exists(cache._path("k"))                    # dropped, not left to miss forever
+    assert cache.put("k", value)
+    assert np.array_equal(cache.get("k")["b"], value["b"])
+
+
+def test_entry_without_manifest_is_rewritten(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("k", np.arange(4.0))
+    os.remove(os.path.join(cache._path("k"), MANIFEST))
+    assert cache.get("k") is None
+    assert cache.put("k", np.arange(4.0))
+    assert np.array_equal(cache.get("k"), np.arange(4.0))
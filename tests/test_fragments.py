@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+from fire_counters import ENGINE_CALLS
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fire_app_eli_v3_2.py")
+ENGINE = ("years_until_fi", "coast_check", "build_sip_schedule")
+
+
+@pytest.mark.parametrize("key", ["compact", "show_table", "show_coast"])
+def test_display_toggles_do_not_rerun_the_engine(key):
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    assert not at.exception
+    before = {name: ENGINE_CALLS[name] for name in ENGINE}
+    assert before["years_until_fi"] > 0
+
+    toggle = at.toggle(key=key)
+    toggle.set_value(not toggle.value).run()
+    assert not at.exception
+    assert {name: ENGINE_CALLS[name] for name in ENGINE} == before
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from fire_engine import coast_check, fv
+from fire_frontier import coast_frontier
+
+AGE, TARGET, LAST_AGE = 30, 50, 80
+RETURN, INFLATION, EXPENSE, SWR = 0.10, 0.06, 50000.0, 0.04
+MONTHS = (LAST_AGE - AGE) * 12 + 1
+
+
+def target(yrs, annual):
+    return annual / SWR
+
+
+def goal_inputs():
+    """A stepped-up SIP, a house down payment at 38, a bonus at 42, and a reserve held for the house."""
+    m = np.arange(MONTHS)
+    sip = 60000.0 * 1.08 ** (m // 12)
+    flows = np.zeros(MONTHS)
+    flows[96] -= 3e6
+    flows[144] += 1e6
+    reserve = np.where(m < 96, 3e6 / (1 + RETURN) ** (np.maximum(96 - m, 0) / 12), 0.0)
+    required = np.array([target(i / 12, EXPENSE * (1 + INFLATION) ** (i / 12) * 12) for i in m]) + reserve
+    return sip, flows, reserve, required
+
+
+def corpus_before_flows(sip, flows, stop):
+    """Keep investing (flows land, then growth plus SIP) up to the start of month ``stop``."""
+    rate = (1 + RETURN) ** (1/12) - 1
+    corpus = 1e6
+    for m in range(stop):
+        corpus = fv(rate, 1, sip[m], corpus + flows[m], when="end")
+    return corpus
+
+
+def coast_from(stop, corpus, flows, reserve, max_age=TARGET):
+    """``coast_check`` as if you stopped investing at month ``stop`` with ``corpus`` (flows not yet landed)."""
+    # slack so (AGE + stop/12) + months/12 rounding past max_age does not drop the last month
+    return coast_check(corpus, RETURN, AGE + stop / 12, target, INFLATION,
+                       EXPENSE * (1 + INFLATION) ** (stop / 12), max_age + 1e-9, flows[stop:], reserve[stop:])[0]
+
+
+def test_frontier_matches_coast_check_from_every_month():
+    sip, flows, reserve, required = goal_inputs()
+    frontier = coast_frontier(1e6, RETURN, AGE, TARGET, sip, required, flows)
+    last = (TARGET - AGE) * 12
+
+    can_stop = []
+    for s in range(last + 1):
+        corpus = corpus_before_flows(sip, flows, s)
+        assert frontier.corpus[s] == pytest.approx(corpus + flows[s], rel=1e-9)
+        age = coast_from(s, corpus, flows, reserve, max_age=LAST_AGE)
+        if age is None:
+            assert np.isnan(frontier.coast_fi_age[s])
+        else:
+            assert frontier.coast_fi_age[s] == pytest.approx(age, abs=1e-9)
+        can_stop.append(coast_from(s, corpus, flows, reserve) is not None)
+
+        # the coast number is tight: just above it coasts to FI by the target, just below it does not
+        need = frontier.coast_number[s] - flows[s]
+        assert coast_from(s, need * (1 + 1e-9) + 1e-6, flows, reserve) is not None
+        assert coast_from(s, need * (1 - 1e-6), flows, reserve) is None
+
+    assert 0 < can_stop.index(True) < last                  # a real crossing, not the first or last month
+    assert frontier.stop_age == pytest.approx(AGE + can_stop.index(True) / 12)
+    assert np.isinf(frontier.coast_number[last + 1:]).all()
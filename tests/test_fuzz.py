@@ -0,0 +1,22 @@
+import pytest
+
+from fire_fuzz import PROPERTIES, fuzz_cases, matches, run
+from fire_golden import load_engine
+
+SEED = 7
+CASES = 100         # per property; the CLI's --cases runs the long version
+
+SCALAR = load_engine("fire_golden:reference_batch")
+FAST = load_engine("fire_kernel:batch")
+
+
+@pytest.mark.parametrize("name", sorted(PROPERTIES))
+@pytest.mark.parametrize("engine", [SCALAR, FAST], ids=["scalar", "fast"])
+def test_property_holds(engine, name):
+    report = run(engine, fuzz_cases(CASES, SEED), {name: PROPERTIES[name]})
+    assert report[name]["failures"] == 0, report[name]["examples"]
+
+
+def test_fast_engine_matches_scalar():
+    report = run(FAST, fuzz_cases(CASES, SEED), {"fast_matches_scalar": matches(SCALAR, FAST)})
+    assert report["fast_matches_scalar"]["failures"] == 0, report["fast_matches_scalar"]["examples"]
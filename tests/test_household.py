@@ -0,0 +1,34 @@
+import numpy as np
+
+from fire_engine import VARIANTS, fi_search, target_corpus, years_until_fi
+from fire_household import Household, Member, household_fi
+
+SINGLE = Household((Member("A", 30, 0.0, current_corpus=1e6),))
+
+
+def plan(expense):
+    return household_fi(SINGLE, 0.10, 0.06, expense, target_corpus("Fat FIRE", 0.04), max_age=80)
+
+
+def test_not_reached_when_only_the_post_growth_corpus_beats_last_months_requirement():
+    p = plan(21250.0)
+    last = p.traj_df.iloc[-1]
+    assert last["Invested Corpus"] >= last["Required Corpus"]     # what the old check looked at
+    assert not p.reached
+    assert p.fi_month == 600
+
+
+def test_reached_plan_reports_its_month():
+    p = plan(21000.0)
+    assert p.reached and p.fi_month == 597
+    assert p.ages_at_fi["A"] == 30 + 597 / 12
+
+
+def test_fi_search_agrees_with_years_until_fi():
+    kw = dict(current_age=30, current_corpus=5e5, monthly_sip=20000.0, pre_ret_annual_return=0.11, sip_growth=0.1,
+              target_corpus_func=target_corpus("Lean FIRE", 0.04, lean_mult=0.8), inflation=0.06,
+              base_monthly_expense=50000.0, max_age=60, variant=VARIANTS["v3_2"])
+    found = fi_search(**kw)
+    age, corpus, df = years_until_fi(**kw)
+    assert found.reached and (found.age, found.corpus) == (age, corpus)
+    assert np.array_equal(found.traj_df.to_numpy(), df.to_numpy())
@@ -0,0 +1,47 @@
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from fire_results import ProjectionResult, ResultStore
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fire_app_eli_v3_2.py")
+TRAJ = pd.DataFrame({"Age": [30.0], "Invested Corpus": [1.0], "Required Corpus": [2.0]})
+
+
+def test_store_survives_concurrent_get_and_evict():
+    store = ResultStore(max_entries=8)
+    errors = []
+
+    def work(offset):
+        try:
+            for i in range(1000):
+                key = str((i * 7 + offset) % 40)       # more keys than entries: constant eviction
+                store.get_or_compute(key, lambda: ProjectionResult(key, 1, 1, 1, 1, None, TRAJ))
+        except Exception as e:                          # pragma: no cover - the failure being tested
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(t,)) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len(store) == 8
+    assert store.hits + store.misses == 8 * 1000
+
+
+def test_reached_flag_survives_the_disk_arrays():
+    res = ProjectionResult("k", 1.0, 2.0, 80.0, 3.0, None, TRAJ, reached=False)
+    back = ProjectionResult.from_arrays(res.to_arrays())
+    assert back.reached is False and back.age_reached == 80.0
+
+
+def test_unreachable_plan_shows_not_by_80():
+    AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    next(n for n in at.number_input if n.label.startswith("Monthly expenses")).set_value(2000000.0).run()
+    assert not at.exception
+    card = next(m.value for m in at.markdown if "Earliest FI age" in m.value)
+    assert "Not by 80" in card
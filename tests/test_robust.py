@@ -0,0 +1,7 @@
+from fire_robust import check
+
+
+def test_robust_engine_within_bound_and_no_month_flips():
+    report = check(50, max_age=100)["robust"]
+    assert report["within_bound"], report
+    assert report["month_flips"] == {"fi_month": 0, "coast_month": 0}
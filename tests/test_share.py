@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+import pytest
+
+from fire_results import ProjectionResult, ResultStore
+from fire_share import PARAM, decode, encode, prewarm, remember_result
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fire_app_eli_v3_2.py")
+
+TRAJ = pd.DataFrame({"Age": [30.0, 30.5], "Invested Corpus": [1.0, 2.0], "Required Corpus": [3.0, 4.0]})
+
+
+def test_codes_round_trip():
+    state = {"monthly_sip": 45000.0, "fire_type": "Fat FIRE", "goals": (("Home", 38, 4000000.0, 6.0, "Outflow"),)}
+    assert {k: decode(encode(state))[k] for k in state} == state
+
+
+def test_prewarm_without_disk_cache_uses_the_store():
+    store = ResultStore(max_entries=8)
+    res = ProjectionResult("k1", 1.0, 2.0, 45.5, 3.0, None, TRAJ)
+    code = encode({})
+    remember_result(code, res, store=store, disk=None)
+
+    fresh = ResultStore(max_entries=8)
+    assert prewarm(code, store=fresh, disk=None) is None         # nothing remembered there
+
+    assert store.get("k1") is None                                # e.g. evicted since the link was made
+    assert prewarm(code, store=store, disk=None) == "k1"
+    assert store.get("k1") is res
+
+
+def test_zero_custom_step_up_survives_the_app_round_trip():
+    AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+    at = AppTest.from_file(APP, default_timeout=60).run()          # defaults: 8% custom rate
+    next(r for r in at.radio if r.label == "SIP step-up each year").set_value("Custom rate").run()
+    next(s for s in at.slider if s.label == "SIP growth (annual, %)").set_value(0.0).run()
+    next(b for b in at.button if b.label == "Create a link").click().run()
+    assert not at.exception
+    link = at.query_params[PARAM]
+    link = link[0] if isinstance(link, list) else link
+    assert decode(link)["sip_custom"] == 0.0
+
+    reopened = AppTest.from_file(APP, default_timeout=60)
+    reopened.query_params[PARAM] = link
+    reopened.run()
+    next(b for b in reopened.button if b.label == "Create a link").click().run()
+    again = reopened.query_params[PARAM]
+    assert (again[0] if isinstance(again, list) else again) == link    # same inputs, same result key
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from fire_tax import RULES, WithdrawalMix, _slab_tax_scalar, slab_table, withdrawal_table
+
+
+def probe_grid(rules):
+    """Every knot (rebate limit, relief ends, slab floors) and a rupee either side, plus a coarse sweep."""
+    knots = slab_table(rules).knots
+    near = np.concatenate([knots - 1.0, knots, knots + 1.0, [rules.rebate_limit]])
+    return np.unique(np.maximum(np.concatenate([near, np.linspace(0, 4e6, 401)]), 0.0))
+
+
+@pytest.mark.parametrize("version", sorted(RULES))
+def test_slab_table_matches_scalar_rules(version):
+    rules = RULES[version]
+    table = slab_table(rules)
+    i = int(np.searchsorted(table.knots, rules.rebate_limit))
+    assert table.knots[i] == rules.rebate_limit
+    assert table.slope[i] == pytest.approx(1.0) and table.slope[i + 1] < 1   # marginal relief ends at a knot
+    x = probe_grid(rules)
+    want = np.array([_slab_tax_scalar(rules, v) for v in x])
+    np.testing.assert_allclose(table.tax(x), want, rtol=0, atol=0.01)      # to the paisa
+
+
+@pytest.mark.parametrize("version", sorted(RULES))
+def test_gross_up_inverts_net_of_tax(version):
+    rules = RULES[version]
+    for table in (slab_table(rules), withdrawal_table(rules, WithdrawalMix(equity=0.2, debt=0.8, epf_ppf=0.0))):
+        net = probe_grid(rules)
+        gross = table.gross_up(net)
+        np.testing.assert_allclose(gross - table.tax(gross), net, rtol=0, atol=0.01)
+        assert (gross >= net).all()
+
+
+@pytest.mark.parametrize("version", sorted(RULES))
+def test_gross_up_at_rebate_limit_is_the_smallest_gross(version):
+    rules = RULES[version]
+    table = slab_table(rules)
+    limit = rules.rebate_limit
+    assert float(table.gross_up(limit)) == limit
+    relief_end = table.knots[np.searchsorted(table.knots, limit) + 1]
+    # a rupee more net needs the whole marginal-relief segment crossed first
+    assert float(table.gross_up(limit + 1)) > relief_end
+    assert float(table.gross_up(0.0)) == 0.0
@@ -0,0 +1,84 @@
+"""Golden outputs for every ``VARIANTS`` entry.
+
+The expected values were captured by running each script's own
+``years_until_fi`` as it was before the shared engine (the commit before
+"Share one engine across the app scripts") on the inputs below.
+"""
+from dataclasses import replace
+
+import pytest
+
+from fire_engine import VARIANTS, years_until_fi
+
+CASES = {
+    "steady": dict(current_age=30, current_corpus=5e5, monthly_sip=20000.0, pre_ret_annual_return=0.11,
+                   sip_growth=0.10, inflation=0.06, base_monthly_expense=50000.0, max_age=80),
+    # a zero SIP stays zero whether or not it is stepped up: every variant agrees
+    "zero_sip": dict(current_age=35, current_corpus=5e6, monthly_sip=0.0, pre_ret_annual_return=0.10,
+                     sip_growth=0.10, inflation=0.05, base_monthly_expense=40000.0, max_age=80),
+    # a monthly withdrawal (negative SIP): v1 grows it every year (step_up_zero_sip), the v3 family does not
+    "negative_sip": dict(current_age=40, current_corpus=1.5e7, monthly_sip=-20000.0, pre_ret_annual_return=0.09,
+                         sip_growth=0.10, inflation=0.05, base_monthly_expense=60000.0, max_age=80),
+    # never reached: v1 keeps going while the whole-year age (months // 12) is <= max_age
+    "not_reached": dict(current_age=40, current_corpus=1e5, monthly_sip=5000.0, pre_ret_annual_return=0.08,
+                        sip_growth=0.05, inflation=0.07, base_monthly_expense=80000.0, max_age=60),
+}
+
+STEADY = (46, [(30.5, 649433.78365775, 15368637.59088643),
+               (42.0, 10817178.548183002, 30036741.718400806),
+               (52.91666666666667, 57039114.4194011, 57018703.50113381)])
+ZERO_SIP = (38, [(35.5, 5244044.240850758, 12246447.376629194),
+                 (45.0, 12968712.300500039, 19467422.830967322),
+                 (53.83333333333333, 30097626.016144063, 30077821.56187839)])
+V1_NEGATIVE_SIP = (19, [(40.5, 15538276.67552662, 18369671.06494379),
+                        (45.0, 21284034.270018745, 22879852.772652574),
+                        (49.0, 27931765.120785862, 27923907.887613297)])
+V3_NEGATIVE_SIP = (15, [(40.5, 15538276.67552662, 18369671.06494379),
+                        (44.0, 20031603.581942532, 21790335.973954827),
+                        (47.333333333333336, 25774087.031588092, 25743091.37868816)])
+V1_NOT_REACHED = (42, [(40.5, 134409.7604142864, 24686213.597945314),
+                       (51.0, 1520692.0965294386, 50232425.418716654),
+                       (61.0, 5161679.1032900615, 98814783.8423754)])
+V3_NOT_REACHED = (40, [(40.5, 134409.7604142864, 24686213.597945314),
+                       (50.5, 1415501.6400223156, 48561518.58553828),
+                       (60.0, 4626597.306450163, 92350265.27324802)])
+
+# (age reached, corpus, (trajectory rows, [first, middle, last row]))
+GOLDEN = {
+    "v1": {"steady": (52, 57039114.4194011, STEADY),
+           "zero_sip": (53, 30097626.016144063, ZERO_SIP),
+           "negative_sip": (49, 27931765.120785862, V1_NEGATIVE_SIP),
+           "not_reached": (60, 5161679.1032900615, V1_NOT_REACHED)},
+    **{v: {"steady": (52.91666666666667, 57039114.4194011, STEADY),
+           "zero_sip": (53.83333333333333, 30097626.016144063, ZERO_SIP),
+           "negative_sip": (47.333333333333336, 25774087.031588092, V3_NEGATIVE_SIP),
+           "not_reached": (60, 4669631.461352446, V3_NOT_REACHED)} for v in ("v3", "v3_1", "v3_2")},
+}
+
+
+def test_every_variant_has_golden_values():
+    assert set(GOLDEN) == set(VARIANTS)
+
+
+@pytest.mark.parametrize("variant", sorted(VARIANTS))
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_variant_matches_pre_refactor_script(variant, case):
+    age, corpus, df = years_until_fi(target_corpus_func=lambda yrs, annual: annual / 0.04,
+                                     variant=VARIANTS[variant], **CASES[case])
+    want_age, want_corpus, (n_rows, rows) = GOLDEN[variant][case]
+    assert age == want_age
+    assert corpus == pytest.approx(want_corpus, rel=1e-12)
+    assert len(df) == n_rows
+    got = [tuple(df.iloc[i][["Age", "Invested Corpus", "Required Corpus"]]) for i in (0, len(df) // 2, -1)]
+    assert got == [pytest.approx(r, rel=1e-12) for r in rows]
+
+
+def test_step_up_zero_sip_alone_changes_the_outcome():
+    """The flag by itself (fractional ages kept) moves FI for a negative SIP and not for a zero one."""
+    plain = VARIANTS["v3"]
+    stepped = replace(plain, step_up_zero_sip=True)
+    target = lambda yrs, annual: annual / 0.04
+    for case, differs in (("negative_sip", True), ("zero_sip", False), ("steady", False)):
+        a = years_until_fi(target_corpus_func=target, variant=plain, **CASES[case])
+        b = years_until_fi(target_corpus_func=target, variant=stepped, **CASES[case])
+        assert (a[:2] != b[:2]) == differs, case
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from fire_withdrawal import WithdrawalStrategy, compare_strategies, default_strategies
+
+
+def test_strategy_without_yearly_fails_at_construction():
+    class Forgetful(WithdrawalStrategy):
+        name = "Forgetful"
+
+    with pytest.raises(TypeError, match="yearly"):
+        Forgetful()
+    with pytest.raises(TypeError):
+        WithdrawalStrategy()
+
+
+def test_default_strategies_run_on_flat_paths():
+    growth = np.full((4, 36), 1.005)
+    results = compare_strategies(default_strategies(0.04, 0.06), 1e7, 4e5, growth, 0.05)
+    assert [r.name for r in results] == [s.name for s in default_strategies(0.04, 0.06)]
+    assert all(r.median_real_income > 0 for r in results)
+    assert results[0].success_rate == 1.0                   # 4% of the corpus on 6% growth never runs dry